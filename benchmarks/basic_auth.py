@@ -0,0 +1,77 @@
+"""
+Requisições/s por núcleo com Basic Auth: `BasicAuthentication` do DRF x
+`CachedBasicAuthentication` (cache da verificação de senha).
+
+Cria um usuário temporário (dentro de uma transação desfeita no final) e chama, num
+único processo, uma view mínima autenticada pelo DRF — o custo medido é praticamente
+o da autenticação. Usa o hasher e o cache configurados (PBKDF2 e Redis/locmem).
+
+    python benchmarks/basic_auth.py --requests 200
+"""
+import argparse
+import base64
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import transaction  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from rest_framework.authentication import BasicAuthentication  # noqa: E402
+from rest_framework.permissions import IsAuthenticated  # noqa: E402
+from rest_framework.response import Response  # noqa: E402
+from rest_framework.views import APIView  # noqa: E402
+
+from users.authentication import CachedBasicAuthentication  # noqa: E402
+from users.models import BaseUser  # noqa: E402
+
+EMAIL = "benchmark-basic-auth@example.com"
+PASSWORD = "benchmark-senha-123"
+
+
+def make_view(authentication_class):
+    class PingView(APIView):
+        authentication_classes = [authentication_class]
+        permission_classes = [IsAuthenticated]
+
+        def get(self, request):
+            return Response({"user": str(request.user.pk)})
+
+    return PingView.as_view()
+
+
+def requests_per_second(view, count):
+    token = base64.b64encode(f"{EMAIL}:{PASSWORD}".encode()).decode()
+    factory = RequestFactory()
+    start = time.perf_counter()
+    for _ in range(count):
+        response = view(factory.get("/ping/", HTTP_AUTHORIZATION=f"Basic {token}"))
+        assert response.status_code == 200, response.status_code
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Requisições por medição.")
+    args = parser.parse_args()
+
+    with transaction.atomic():
+        BaseUser.objects.create_user(email=EMAIL, password=PASSWORD, user_type=BaseUser.UserType.COMPRADOR)
+        plain = requests_per_second(make_view(BasicAuthentication), args.requests)
+        cached = requests_per_second(make_view(CachedBasicAuthentication), args.requests)
+        transaction.set_rollback(True)
+
+    print(f"{'autenticação':<28}{'req/s (1 núcleo)':>18}")
+    print(f"{'BasicAuthentication':<28}{plain:>18,.0f}")
+    print(f"{'CachedBasicAuthentication':<28}{cached:>18,.0f}")
+    print(f"ganho: {cached / plain:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
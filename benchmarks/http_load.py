@@ -0,0 +1,85 @@
+"""
+Gerador de carga HTTP simples para comparar configurações de servidor.
+
+Dispara requisições GET concorrentes contra uma ou mais URLs durante um intervalo
+fixo e imprime requisições/s e latências (p50/p95/p99) de cada uma.
+
+Exemplo (runserver x Gunicorn, com o mesmo banco):
+
+    python manage.py runserver 0.0.0.0:8001 &
+    gunicorn --config docker/api/gunicorn.conf.py --bind 0.0.0.0:8002 &
+    python benchmarks/http_load.py \\
+        http://localhost:8001/api/projects/ http://localhost:8002/api/projects/ \\
+        --concurrency 64 --duration 30
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+async def worker(client, url, deadline, latencies, errors, headers):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get(url, headers=headers)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as exc:
+            errors.append(exc.__class__.__name__)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(url, concurrency, duration, headers):
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        # Aquecimento: abre conexões e popula caches antes de medir.
+        await asyncio.gather(*(client.get(url, headers=headers) for _ in range(min(concurrency, 8))))
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(
+            worker(client, url, deadline, latencies, errors, headers) for _ in range(concurrency)
+        ))
+    return latencies, errors
+
+
+def report(url, latencies, errors, duration):
+    ms = [value * 1000 for value in latencies]
+    print(f"\n{url}")
+    print(f"  requisições ok : {len(ms)}  (erros: {len(errors)})")
+    print(f"  throughput     : {len(ms) / duration:.1f} req/s")
+    if ms:
+        print(f"  latência média : {statistics.mean(ms):.1f} ms")
+        print(f"  p50 / p95 / p99: {percentile(ms, 50):.1f} / {percentile(ms, 95):.1f} / {percentile(ms, 99):.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("urls", nargs="+", help="URLs a comparar (executadas em sequência).")
+    parser.add_argument("--concurrency", type=int, default=32, help="Clientes simultâneos.")
+    parser.add_argument("--duration", type=float, default=15, help="Duração de cada rodada em segundos.")
+    parser.add_argument("--header", action="append", default=[], help="Cabeçalho extra, no formato 'Nome: valor'.")
+    args = parser.parse_args()
+
+    headers = dict(header.split(":", 1) for header in args.header)
+    headers = {name.strip(): value.strip() for name, value in headers.items()}
+
+    for url in args.urls:
+        latencies, errors = asyncio.run(run(url, args.concurrency, args.duration, headers))
+        report(url, latencies, errors, args.duration)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Micro-benchmark do renderer/parser JSON: DRF (json da stdlib) x orjson.
+
+Monta páginas reais das listagens (catálogo de projetos, transações do usuário e feed
+público) a partir do banco configurado e mede renderizações/s e MB/s de cada renderer,
+além do parse do mesmo conteúdo. Confere também que os bytes gerados são idênticos.
+
+Rode com dados no banco (ex.: `python manage.py generate_synthetic_data`):
+
+    python benchmarks/json_renderer.py --rows 100 --repeat 500
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test import RequestFactory  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from core.fast_serializers import FastListSerializer  # noqa: E402
+from core.parsers import ORJSONParser  # noqa: E402
+from core.renderers import ORJSONRenderer  # noqa: E402
+from marketplace.models import Transaction  # noqa: E402
+from marketplace.serializers import PublicTransactionSerializer, TransactionSerializer  # noqa: E402
+from projects.models import ProjectCatalogEntry  # noqa: E402
+from projects.serializers import ProjectCatalogSerializer  # noqa: E402
+
+PAYLOADS = [
+    ("catálogo de projetos", ProjectCatalogSerializer, ProjectCatalogEntry.objects.all),
+    ("minhas transações", TransactionSerializer, Transaction.objects.all),
+    ("feed público", PublicTransactionSerializer, Transaction.objects.all),
+]
+
+
+def page(serializer_class, queryset, rows):
+    """Mesmo formato da resposta paginada da API."""
+    fast = FastListSerializer.for_serializer(serializer_class)
+    results = fast.to_representation(fast.values(queryset[:rows]), {"request": RequestFactory().get("/")})
+    return {"count": len(results), "next": None, "previous": None, "results": results}
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="Linhas por página.")
+    parser.add_argument("--repeat", type=int, default=500, help="Repetições por medição.")
+    args = parser.parse_args()
+
+    drf_renderer, fast_renderer = JSONRenderer(), ORJSONRenderer()
+    drf_parser, fast_parser = JSONParser(), ORJSONParser()
+
+    print(f"{'payload':<24}{'KB':>8}{'render DRF/s':>15}{'render orjson/s':>18}{'parse DRF/s':>14}{'parse orjson/s':>17}")
+    for label, serializer_class, make_queryset in PAYLOADS:
+        data = page(serializer_class, make_queryset(), args.rows)
+        if not data["results"]:
+            print(f"{label:<24}{'sem dados':>8}")
+            continue
+
+        body = drf_renderer.render(data)
+        if fast_renderer.render(data) != body:
+            print(f"{label:<24} ERRO: saídas diferentes")
+            continue
+
+        render_drf = timed(lambda: drf_renderer.render(data), args.repeat)
+        render_fast = timed(lambda: fast_renderer.render(data), args.repeat)
+        parse_drf = timed(lambda: drf_parser.parse(io.BytesIO(body)), args.repeat)
+        parse_fast = timed(lambda: fast_parser.parse(io.BytesIO(body)), args.repeat)
+        print(
+            f"{label:<24}{len(body) / 1024:>8.1f}"
+            f"{args.repeat / render_drf:>15,.0f}{args.repeat / render_fast:>18,.0f}"
+            f"{args.repeat / parse_drf:>14,.0f}{args.repeat / parse_fast:>17,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
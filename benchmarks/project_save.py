@@ -0,0 +1,83 @@
+"""
+Custo do `Project.save(update_fields=...)` do caminho de compra (débito de créditos):
+validação antiga (`full_clean()` completo + leitura do ofertante) x validação atual
+(só os campos gravados, dono revalidado apenas se mudou).
+
+Cria um ofertante e um projeto temporários (transação desfeita no final) e, a cada
+repetição, recarrega o projeto do banco, como a requisição de compra faz, e debita
+um crédito. Mede consultas por save e tempo de CPU da validação + save.
+
+    python benchmarks/project_save.py --repeat 500
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.exceptions import ValidationError  # noqa: E402
+from django.db import connection, models, transaction  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from projects.models import Project  # noqa: E402
+from users.models import BaseUser  # noqa: E402
+
+UPDATE_FIELDS = ["carbon_credits_available", "updated_at"]
+
+
+def legacy_save(project):
+    """O `Project.save` anterior: `full_clean()` completo, com o ofertante relido em `clean()`."""
+    project.clean_fields()
+    if project.ofertante.user_type != "OFERTANTE":
+        raise ValidationError("O responsável pelo projeto deve ser um usuário do tipo 'Ofertante'.")
+    project.validate_unique()
+    project.validate_constraints()
+    models.Model.save(project, update_fields=UPDATE_FIELDS)
+
+
+def current_save(project):
+    project.save(update_fields=UPDATE_FIELDS)
+
+
+def measure(save, project_id, repeat):
+    projects = [Project.objects.get(pk=project_id) for _ in range(repeat)]
+    for project in projects:
+        project.carbon_credits_available -= 1
+    with CaptureQueriesContext(connection) as queries:
+        start = time.process_time()
+        for project in projects:
+            save(project)
+        elapsed = time.process_time() - start
+    return len(queries) / repeat, elapsed / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=500, help="Saves por medição.")
+    args = parser.parse_args()
+
+    with transaction.atomic():
+        ofertante = BaseUser.objects.create_user(
+            email="benchmark-project-save@example.com", password=None, user_type=BaseUser.UserType.OFERTANTE
+        )
+        project = Project.objects.create(
+            ofertante=ofertante, name="Benchmark", project_type=Project.ProjectType.OUTRO,
+            status=Project.Status.ACTIVE, carbon_credits_available=10 * args.repeat, price_per_credit=10,
+        )
+        legacy = measure(legacy_save, project.pk, args.repeat)
+        current = measure(current_save, project.pk, args.repeat)
+        transaction.set_rollback(True)
+
+    print(f"{'Project.save':<14}{'consultas/save':>16}{'CPU µs/save':>14}")
+    print(f"{'anterior':<14}{legacy[0]:>16.1f}{legacy[1]:>14,.0f}")
+    print(f"{'atual':<14}{current[0]:>16.1f}{current[1]:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
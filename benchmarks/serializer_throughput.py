@@ -0,0 +1,87 @@
+"""
+Vazão (linhas/s) da serialização das listagens: serializers do DRF x FastListSerializer.
+
+Para cada serializer de listagem, busca `--rows` linhas e mede consulta + serialização
++ renderização JSON, repetindo `--repeat` vezes. Também confere que os bytes gerados
+pelos dois caminhos são idênticos.
+
+Rode com dados no banco (ex.: `python manage.py generate_synthetic_data`):
+
+    python benchmarks/serializer_throughput.py --rows 100 --repeat 200
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test import RequestFactory  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from core.fast_serializers import FastListSerializer  # noqa: E402
+from marketplace.models import Transaction  # noqa: E402
+from marketplace.serializers import PublicTransactionSerializer, TransactionSerializer  # noqa: E402
+from projects.models import Project, ProjectCatalogEntry  # noqa: E402
+from projects.serializers import ProjectCatalogSerializer, ProjectListSerializer  # noqa: E402
+
+CASES = [
+    ("ProjectListSerializer", ProjectListSerializer,
+     lambda: Project.objects.select_related("ofertante__ofertante_profile")),
+    ("ProjectCatalogSerializer", ProjectCatalogSerializer, lambda: ProjectCatalogEntry.objects.all()),
+    ("TransactionSerializer", TransactionSerializer, lambda: Transaction.objects.select_related("project", "buyer")),
+    ("PublicTransactionSerializer", PublicTransactionSerializer, lambda: Transaction.objects.select_related("project")),
+]
+
+
+def drf_render(serializer_class, queryset, context):
+    return JSONRenderer().render(serializer_class(queryset, many=True, context=context).data)
+
+
+def fast_render(serializer_class, queryset, context):
+    fast = FastListSerializer.for_serializer(serializer_class)
+    return JSONRenderer().render(fast.to_representation(fast.values(queryset), context))
+
+
+def measure(render, serializer_class, queryset, context, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        render(serializer_class, queryset, context)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="Linhas por página serializada.")
+    parser.add_argument("--repeat", type=int, default=100, help="Repetições por caso.")
+    args = parser.parse_args()
+
+    context = {"request": RequestFactory().get("/")}
+    print(f"{'serializer':<30}{'linhas':>8}{'DRF (linhas/s)':>18}{'rápido (linhas/s)':>20}{'ganho':>8}")
+    for label, serializer_class, make_queryset in CASES:
+        queryset = make_queryset()[:args.rows]
+        rows = queryset.count()
+        if not rows:
+            print(f"{label:<30}{'sem dados':>8}")
+            continue
+
+        if drf_render(serializer_class, queryset, context) != fast_render(serializer_class, queryset, context):
+            print(f"{label:<30} ERRO: saídas diferentes")
+            continue
+
+        drf_time = measure(drf_render, serializer_class, queryset, context, args.repeat)
+        fast_time = measure(fast_render, serializer_class, queryset, context, args.repeat)
+        total = rows * args.repeat
+        print(
+            f"{label:<30}{rows:>8}{total / drf_time:>18,.0f}{total / fast_time:>20,.0f}"
+            f"{drf_time / fast_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
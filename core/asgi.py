@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# /static/ é atendido antes do Django (veja core/static_files.py).
+from core.static_files import ASGIStaticFiles  # noqa: E402
+
+application = ASGIStaticFiles(django_application)
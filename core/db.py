@@ -0,0 +1,131 @@
+"""
+Utilitários de banco de dados compartilhados entre os apps.
+"""
+import json
+import logging
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+
+def postgres_connection_stats(alias="default"):
+    """
+    Retorna a ocupação de conexões do Postgres por trás de `alias`.
+
+    `saturation` é a fração de `max_connections` em uso. Com PgBouncer, as conexões
+    contadas aqui são as do pool do lado do servidor. Retorna None para outros bancos.
+    """
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT
+                count(*) FILTER (WHERE state = 'active'),
+                count(*) FILTER (WHERE state LIKE 'idle%'),
+                count(*),
+                current_setting('max_connections')::int
+            FROM pg_stat_activity
+            WHERE datname = current_database()
+            """
+        )
+        active, idle, total, max_connections = cursor.fetchone()
+
+    return {
+        "active": active,
+        "idle": idle,
+        "total": total,
+        "max": max_connections,
+        "saturation": total / max_connections if max_connections else 0.0,
+    }
+
+
+def pgbouncer_pool_stats():
+    """
+    Lê `SHOW POOLS` no console administrativo do PgBouncer.
+
+    Retorna uma lista de dicionários (um por banco/usuário) ou None quando
+    PGBOUNCER_ADMIN_URL não está configurada ou o console não responde.
+    """
+    url = getattr(settings, "PGBOUNCER_ADMIN_URL", "")
+    if not url:
+        return None
+
+    try:
+        import psycopg2
+    except ImportError:
+        return None
+
+    try:
+        conn = psycopg2.connect(url)
+    except psycopg2.Error:
+        logger.warning("Não foi possível conectar ao console do PgBouncer.", exc_info=True)
+        return None
+
+    try:
+        # O console do PgBouncer não aceita transações.
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute("SHOW POOLS")
+            columns = [col.name for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+def estimated_count(queryset):
+    """
+    Linhas que o planejador do Postgres estima para o queryset (`EXPLAIN`, sem
+    executar a consulta). Sem filtros, a estimativa vem de `pg_class.reltuples`.
+    Retorna None para outros bancos.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    sql, params = queryset.order_by().query.get_compiler(queryset.db).as_sql()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    # O psycopg já decodifica colunas json; outros drivers devolvem texto.
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator que não faz `COUNT(*)` exato em listagens grandes.
+
+    Quando a estimativa do planejador passa de `count_limit`, ela é o total; abaixo
+    disso, a contagem é exata, mas para em `count_limit` linhas (`COUNT` sobre um
+    `LIMIT`). `known_count` (ex.: uma contagem exata em cache) dispensa as duas.
+    `count_is_estimate` indica se o total é aproximado.
+    """
+
+    def __init__(self, *args, count_limit=None, known_count=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_limit = count_limit or settings.PAGINATION_EXACT_COUNT_LIMIT
+        self.known_count = known_count
+        self.count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        if self.known_count is not None:
+            return self.known_count
+        estimate = estimated_count(self.object_list)
+        if estimate is not None and estimate >= self.count_limit:
+            self.count_is_estimate = True
+            return estimate
+        count = self.object_list.order_by()[:self.count_limit].count()
+        if count >= self.count_limit:
+            # Atingiu o limite com uma estimativa baixa (ou sem estimativa): total aproximado.
+            self.count_is_estimate = True
+            return max(count, estimate or 0)
+        return count
@@ -0,0 +1,113 @@
+"""
+Roteamento de leituras para réplicas do Postgres.
+
+As leituras só vão para uma réplica quando o `ReadReplicaMiddleware` habilita isso
+para a requisição atual (método seguro, view marcada com `use_read_replica = True` e
+cliente sem escrita recente). Em qualquer outro caso — comandos, shell, tarefas,
+blocos `transaction.atomic` ou depois de uma escrita na própria requisição — tudo
+continua indo para o `default`.
+"""
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+_replica_reads_enabled = ContextVar("replica_reads_enabled", default=False)
+
+_lag_cache = {}
+_lag_cache_lock = threading.Lock()
+
+
+def replica_reads_enabled():
+    return _replica_reads_enabled.get()
+
+
+def enable_replica_reads():
+    _replica_reads_enabled.set(True)
+
+
+def disable_replica_reads():
+    _replica_reads_enabled.set(False)
+
+
+@contextmanager
+def use_read_replica():
+    """Habilita leituras em réplica dentro do bloco (útil fora do ciclo de requisição)."""
+    token = _replica_reads_enabled.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads_enabled.reset(token)
+
+
+def replica_lag(alias):
+    """
+    Atraso de replicação da réplica em segundos (float('inf') se ela não responde).
+
+    O valor é guardado em memória por READ_REPLICA_LAG_CHECK_INTERVAL segundos para
+    não consultar a réplica a cada leitura.
+    """
+    now = time.monotonic()
+    interval = getattr(settings, "READ_REPLICA_LAG_CHECK_INTERVAL", 5)
+    cached = _lag_cache.get(alias)
+    if cached and now - cached[0] < interval:
+        return cached[1]
+
+    try:
+        with connections[alias].cursor() as cursor:
+            # Sem WAL pendente a réplica está em dia, mesmo que a última transação
+            # replicada seja antiga (primário ocioso).
+            cursor.execute(
+                """
+                SELECT CASE
+                    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                END
+                """
+            )
+            lag = float(cursor.fetchone()[0] or 0)
+    except DatabaseError:
+        logger.warning("Réplica %s indisponível; usando o primário.", alias, exc_info=True)
+        lag = float("inf")
+
+    with _lag_cache_lock:
+        _lag_cache[alias] = (now, lag)
+    return lag
+
+
+def healthy_replicas():
+    max_lag = getattr(settings, "READ_REPLICA_MAX_LAG", 5)
+    return [alias for alias in getattr(settings, "READ_REPLICAS", []) if replica_lag(alias) <= max_lag]
+
+
+class PrimaryReplicaRouter:
+    """Envia leituras habilitadas para uma réplica saudável; o resto fica no `default`."""
+
+    def db_for_read(self, model, **hints):
+        if not replica_reads_enabled():
+            return None
+        if connections["default"].in_atomic_block:
+            return None
+        replicas = healthy_replicas()
+        if not replicas:
+            return None
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        # Depois de uma escrita, o restante da requisição lê do primário.
+        disable_replica_reads()
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplicas têm os mesmos dados do primário.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
@@ -0,0 +1,216 @@
+"""
+Serialização rápida para listagens somente leitura.
+
+`FastListSerializer` "compila" um serializer do DRF uma única vez: para cada campo
+de leitura calcula o caminho no ORM (`source` → `a__b__c`) e o conversor de valor. As
+linhas vêm de `.values_list()` (tuplas, sem instanciar modelos) e cada uma vira um
+dict com as mesmas chaves, na mesma ordem e com os mesmos valores que o serializer
+original produziria. Como a saída é idêntica, o resultado passa pelo renderer da view
+normalmente.
+
+Campos suportados: campos simples, `PrimaryKeyRelatedField`, arquivos/imagens e
+serializers aninhados de relações obrigatórias (inclusive `source='*'`). Serializers
+com campos calculados (`SerializerMethodField`, listas aninhadas) não são compilados.
+
+Benchmark: `python benchmarks/serializer_throughput.py`.
+"""
+import abc
+import decimal
+from functools import lru_cache
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .signed_media import SignedFileField
+
+# Campos cujo `to_representation` devolve o próprio valor vindo do banco.
+IDENTITY_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.ChoiceField,
+    serializers.BooleanField,
+)
+
+
+def _identity(value):
+    return value
+
+
+class _ContextualConverter(abc.ABC):
+    """Conversor que depende do contexto da chamada; `bind` devolve a função de conversão."""
+
+    def __init__(self, field, **extra):
+        self.field = field
+        self.extra = extra
+
+    @abc.abstractmethod
+    def bind(self, context):
+        """Função `valor -> representação` para o contexto (request, fuso) desta chamada."""
+
+
+class _FileUrl(_ContextualConverter):
+    # A URL absoluta depende do request.
+    def bind(self, context):
+        request = context.get("request")
+        storage = self.extra["storage"]
+        if not getattr(self.field, "use_url", api_settings.UPLOADED_FILES_USE_URL):
+            return lambda name: name or None
+
+        def convert(name):
+            if not name:
+                return None
+            url = storage.url(name)
+            return request.build_absolute_uri(url) if request is not None else url
+
+        return convert
+
+
+class _SignedFileUrl(_ContextualConverter):
+    def bind(self, context):
+        request = context.get("request")
+        return lambda name: self.field.url_for(name, request) if name else None
+
+
+class _DateTime(_ContextualConverter):
+    # O fuso "atual" pode mudar entre requisições: é resolvido uma vez por chamada,
+    # e não a cada valor como em `DateTimeField.to_representation`.
+    def bind(self, context):
+        field = self.field
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        field_timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+        if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+            return field.to_representation
+
+        def convert(value):
+            if value.tzinfo is None:
+                return field.to_representation(value)
+            value = value.astimezone(field_timezone).isoformat()
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+        return convert
+
+
+class _Decimal(_ContextualConverter):
+    # Mesma quantização de `DecimalField.quantize`, com expoente e contexto calculados uma vez.
+    def bind(self, context):
+        field = self.field
+        coerce_to_string = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+        if field.decimal_places is None or field.localize or not coerce_to_string:
+            return field.to_representation
+
+        exponent = decimal.Decimal(".1") ** field.decimal_places
+        decimal_context = decimal.getcontext().copy()
+        if field.max_digits is not None:
+            decimal_context.prec = field.max_digits
+        rounding = field.rounding
+
+        def convert(value):
+            if not isinstance(value, decimal.Decimal):
+                return field.to_representation(value)
+            return "{:f}".format(value.quantize(exponent, rounding=rounding, context=decimal_context))
+
+        return convert
+
+
+class FastListSerializer:
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self.columns = []
+        self.spec = self._compile(serializer_class(), prefix=[], model=serializer_class.Meta.model)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def for_serializer(cls, serializer_class):
+        return cls(serializer_class)
+
+    def _compile(self, serializer, prefix, model):
+        spec = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            path = prefix + field.source_attrs
+            if isinstance(field, serializers.ListSerializer) or isinstance(field, serializers.SerializerMethodField):
+                raise ImproperlyConfigured(
+                    f"{self.serializer_class.__name__}.{name}: campo não suportado pela serialização rápida."
+                )
+            if isinstance(field, serializers.BaseSerializer):
+                nested_model = self._related_model(model, field.source_attrs)
+                spec.append((name, None, self._compile(field, path, nested_model)))
+                continue
+
+            index = len(self.columns)
+            self.columns.append("__".join(path))
+            spec.append((name, index, self._converter(field, model, field.source_attrs)))
+        return spec
+
+    @staticmethod
+    def _related_model(model, source_attrs):
+        for attr in source_attrs:
+            model = model._meta.get_field(attr).related_model
+        return model
+
+    def _converter(self, field, model, source_attrs):
+        if isinstance(field, SignedFileField):
+            return _SignedFileUrl(field)
+        if isinstance(field, serializers.FileField):
+            model_field = self._related_model(model, source_attrs[:-1])._meta.get_field(source_attrs[-1])
+            return _FileUrl(field, storage=model_field.storage)
+        if isinstance(field, serializers.DateTimeField):
+            return _DateTime(field)
+        if isinstance(field, serializers.DecimalField):
+            return _Decimal(field)
+        if isinstance(field, serializers.UUIDField) and field.uuid_format == "hex_verbose":
+            return str
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            # values_list devolve a chave primária; o DRF serializa `obj.pk` com o mesmo campo.
+            return field.pk_field.to_representation if field.pk_field is not None else _identity
+        if isinstance(field, IDENTITY_FIELDS):
+            return _identity
+        return field.to_representation
+
+    def values(self, queryset):
+        """Queryset de tuplas com as colunas necessárias, mantendo filtros e ordenação."""
+        return queryset.values_list(*self.columns)
+
+    def _bind(self, spec, context):
+        return [
+            (name, index, self._bind(converter, context) if index is None
+             else converter.bind(context) if isinstance(converter, _ContextualConverter) else converter)
+            for name, index, converter in spec
+        ]
+
+    def to_representation(self, rows, context=None):
+        spec = self._bind(self.spec, context or {})
+
+        def build(row, spec):
+            item = {}
+            for name, index, converter in spec:
+                if index is None:
+                    item[name] = build(row, converter)
+                else:
+                    value = row[index]
+                    item[name] = None if value is None else converter(value)
+            return item
+
+        return [build(row, spec) for row in rows]
+
+
+class FastListMixin:
+    """
+    `list()` de ViewSets somente leitura usando `FastListSerializer` com o serializer
+    da view. O resultado (inclusive a paginação) é o mesmo do `ListModelMixin`.
+    """
+
+    def fast_list_response(self, queryset):
+        fast = FastListSerializer.for_serializer(self.get_serializer_class())
+        context = self.get_serializer_context()
+        rows = fast.values(queryset)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast.to_representation(page, context))
+        return Response(fast.to_representation(rows, context))
+
+    def list(self, request, *args, **kwargs):
+        return self.fast_list_response(self.filter_queryset(self.get_queryset()))
@@ -0,0 +1,135 @@
+import re
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .db_routers import disable_replica_reads, enable_replica_reads
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependência opcional
+    brotli = None
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+PRIMARY_PIN_KEY_PREFIX = "read-primary:"
+
+
+def primary_pin_key(user_id):
+    return f"{PRIMARY_PIN_KEY_PREFIX}{user_id}"
+
+
+def request_user_id(request):
+    """
+    Id do usuário antes da autenticação do DRF, sem consultar o banco: o claim do JWT
+    (com a assinatura conferida) ou o id guardado na sessão. None para anônimos e
+    Basic Auth, que exigiria conferir a senha.
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is not None:
+        try:
+            return str(authentication.get_validated_token(raw_token)[jwt_settings.USER_ID_CLAIM])
+        except (InvalidToken, KeyError):
+            return None
+    session = getattr(request, "session", None)
+    return session.get(SESSION_KEY) if session is not None else None
+
+
+class ReadReplicaMiddleware(MiddlewareMixin):
+    """
+    Decide, por requisição, se as leituras podem ir para uma réplica.
+
+    - Só métodos seguros em views com `use_read_replica = True` usam réplica.
+    - Depois de uma escrita bem-sucedida (2xx), o cliente fica no primário por
+      READ_YOUR_WRITES_SECONDS, para que ele leia os próprios dados (ex.: logo após
+      uma compra ou a validação de um projeto). Vale pelo cookie `read_primary` e, para
+      usuários autenticados, por uma marca no cache com o id do usuário, que segue o
+      usuário em outros dispositivos e em clientes que não guardam cookies.
+
+    Herda de MiddlewareMixin para funcionar tanto com views síncronas quanto assíncronas.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not settings.READ_REPLICAS or request.method not in SAFE_METHODS:
+            return None
+        view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+        if not (getattr(view_class, "use_read_replica", False) or getattr(view_func, "use_read_replica", False)):
+            return None
+        if request.COOKIES.get(settings.READ_YOUR_WRITES_COOKIE):
+            return None
+        user_id = request_user_id(request)
+        if user_id is not None and cache.get(primary_pin_key(user_id)):
+            return None
+        enable_replica_reads()
+        return None
+
+    def process_response(self, request, response):
+        disable_replica_reads()
+        if request.method in SAFE_METHODS or not settings.READ_REPLICAS or not 200 <= response.status_code < 300:
+            return response
+        response.set_cookie(
+            settings.READ_YOUR_WRITES_COOKIE,
+            "1",
+            max_age=settings.READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+            samesite="Lax",
+        )
+        # O DRF repassa o usuário autenticado (JWT, sessão ou Basic) para `request.user`.
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            cache.set(primary_pin_key(user.pk), True, timeout=settings.READ_YOUR_WRITES_SECONDS)
+        return response
+
+
+ACCEPTS_BROTLI = re.compile(r"\bbr\b")
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Comprime respostas (Brotli quando o cliente aceita, o pacote está instalado e o tipo
+    está em RESPONSE_BROTLI_TYPES; senão gzip) a partir de RESPONSE_COMPRESSION_MIN_SIZE
+    bytes e só para os tipos em RESPONSE_COMPRESSION_TYPES. HTML sempre sai em gzip,
+    com o enchimento aleatório do GZipMiddleware contra o BREACH.
+
+    Respostas em streaming (SSE, arquivos) nunca são comprimidas: o feed ao vivo
+    precisa chegar evento a evento, e arquivos estáticos já saem pré-comprimidos pelo
+    WhiteNoise.
+    """
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+        if len(response.content) < settings.RESPONSE_COMPRESSION_MIN_SIZE:
+            return response
+        content_type = response.get("Content-Type", "").split(";")[0].strip()
+        if not content_type.startswith(settings.RESPONSE_COMPRESSION_TYPES):
+            return response
+
+        accept_encoding = request.META.get("HTTP_ACCEPT_ENCODING", "")
+        if (
+            brotli is None
+            or not ACCEPTS_BROTLI.search(accept_encoding)
+            or not content_type.startswith(settings.RESPONSE_BROTLI_TYPES)
+        ):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        compressed = brotli.compress(response.content, quality=settings.RESPONSE_BROTLI_QUALITY)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        # Mesma regra do GZipMiddleware: o corpo mudou, então a ETag passa a ser fraca.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+        return response
@@ -0,0 +1,27 @@
+"""
+Parser JSON baseado em orjson, com o mesmo comportamento do `JSONParser` do DRF
+(inclusive rejeitar `NaN`/`Infinity`). Sem o orjson instalado, usa o parser do DRF.
+"""
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from .renderers import ORJSONRenderer, orjson
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None or not self.strict:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            content = stream.read()
+            if encoding.lower().replace("-", "") != "utf8":
+                content = content.decode(encoding)
+            return orjson.loads(content)
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
@@ -0,0 +1,44 @@
+"""
+Renderer JSON baseado em orjson, opcional (USE_ORJSON; o padrão é o renderer do DRF).
+
+Decimais continuam saindo como string (quem formata é o serializer) e datas/horas
+passam pelo `JSONEncoder` do DRF (`OPT_PASSTHROUGH_DATETIME`), para manter o mesmo
+formato (`...Z` em UTC). Sem o orjson instalado, ou quando a resposta precisa de
+indentação (ex.: `Accept: application/json; indent=4`), o renderer do DRF é usado.
+
+A saída não é idêntica à do DRF em dois casos: NaN/Infinity viram `null` (o DRF, com
+STRICT_JSON, recusa a resposta) e floats com expoente saem no formato do orjson
+(`1e-7`, `1e16`; DRF: `1e-07`, `1e+16`).
+
+Benchmark: `python benchmarks/json_renderer.py`.
+"""
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependência opcional
+    orjson = None
+
+ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+_default = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # Ex.: inteiros maiores que 64 bits; o json da stdlib aceita.
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Mesmo escape de U+2028/U+2029 feito pelo DRF (JSON como subconjunto de JavaScript).
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
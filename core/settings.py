@@ -39,6 +39,8 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
+    # Em desenvolvimento, o runserver também serve estáticos pelo WhiteNoise.
+    'whitenoise.runserver_nostatic',
     'django.contrib.staticfiles',
     # Apps de terceiros
     'rest_framework',
@@ -57,6 +59,9 @@ AUTH_USER_MODEL = 'users.BaseUser'
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Serve /static/ (pré-comprimido, cache longo) antes do resto da pilha.
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -64,14 +69,23 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ReadReplicaMiddleware',
 ]
 
+# Modo do servidor (docker/api/gunicorn.conf.py). Sob ASGI, o WhiteNoiseMiddleware
+# (só síncrono) faria toda requisição passar por uma thread; os estáticos são
+# servidos por core.static_files.ASGIStaticFiles, fora da pilha (core/asgi.py).
+SERVER_MODE = env('SERVER_MODE', default='wsgi').lower()
+if SERVER_MODE == 'asgi':
+    MIDDLEWARE.remove('whitenoise.middleware.WhiteNoiseMiddleware')
+
 ROOT_URLCONF = 'core.urls' # Adapte para o seu projeto
 
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
+        # Templates do projeto (ex.: changelists do admin em core/admin_tools.py).
+        'DIRS': [BASE_DIR / 'core' / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -95,6 +109,31 @@ if 'DATABASE_URL' in os.environ and env('DATABASE_URL'):
     DATABASES = {
         'default': env.db_url('DATABASE_URL')
     }
+
+    # Conexões persistentes: cada thread de worker reaproveita sua conexão por até
+    # DB_CONN_MAX_AGE segundos, e o Django testa a conexão antes de reutilizá-la.
+    # Dimensione `max_connections` do Postgres para workers x threads.
+    DATABASES['default']['CONN_MAX_AGE'] = env.int('DB_CONN_MAX_AGE', default=60)
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+    # DB_POOL_MODE=pgbouncer: DATABASE_URL aponta para um PgBouncer em modo `transaction`.
+    # Cada `transaction.atomic` (ex.: a compra de créditos) continua preso a uma única
+    # conexão do servidor; só precisamos evitar recursos que dependem da sessão.
+    # Configure o fuso do usuário do banco como UTC (ALTER ROLE ... SET timezone = 'UTC')
+    # para o Django não precisar emitir `SET TIME ZONE` por conexão.
+    DB_POOL_MODE = env('DB_POOL_MODE', default='direct')
+    if DB_POOL_MODE == 'pgbouncer':
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+    # Réplicas de leitura (opcional): lista separada por vírgulas de URLs.
+    # Veja core/db_routers.py para as regras de roteamento.
+    for index, replica_url in enumerate(env.list('DATABASE_REPLICA_URLS', default=[])):
+        replica = env.db_url_config(replica_url)
+        replica['CONN_MAX_AGE'] = DATABASES['default']['CONN_MAX_AGE']
+        replica['CONN_HEALTH_CHECKS'] = True
+        replica['DISABLE_SERVER_SIDE_CURSORS'] = DATABASES['default'].get('DISABLE_SERVER_SIDE_CURSORS', False)
+        replica['TEST'] = {'MIRROR': 'default'}
+        DATABASES[f'replica_{index}'] = replica
 else:
     # Fallback para SQLite se DATABASE_URL não estiver definida
     DATABASES = {
@@ -104,6 +143,15 @@ else:
         }
     }
 
+DATABASE_ROUTERS = ['core.db_routers.PrimaryReplicaRouter']
+READ_REPLICAS = [alias for alias in DATABASES if alias.startswith('replica_')]
+# Réplicas com atraso maior que este (segundos) são ignoradas até se recuperarem.
+READ_REPLICA_MAX_LAG = env.float('READ_REPLICA_MAX_LAG', default=5.0)
+READ_REPLICA_LAG_CHECK_INTERVAL = 5
+# Janela em que um cliente que acabou de escrever continua lendo do primário.
+READ_YOUR_WRITES_SECONDS = env.int('READ_YOUR_WRITES_SECONDS', default=10)
+READ_YOUR_WRITES_COOKIE = 'read_primary'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -124,14 +172,36 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.0/howto/static-files/
 
 STATIC_URL = "static/"
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+# `collectstatic` gera nomes com hash e versões .gz/.br; o WhiteNoise serve os
+# arquivos com hash com cache de longo prazo (immutable).
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# JSON via orjson (core/renderers.py e core/parsers.py), opcional. Mais rápido, mas a
+# saída não é idêntica à do DRF em dois casos: NaN/Infinity viram `null` (o DRF
+# recusa a resposta) e floats com expoente saem como `1e-7`/`1e16` (DRF: `1e-07`/`1e+16`).
+USE_ORJSON = env.bool('USE_ORJSON', default=False)
+
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer' if USE_ORJSON else 'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.ORJSONParser' if USE_ORJSON else 'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'projects.pagination.StandardResultsSetPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
@@ -145,9 +215,26 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.BasicAuthentication',
+        'users.authentication.CachedBasicAuthentication',
     ],
+    # Token buckets (core/throttling.py): 'N/período' = rajada de N, recarga de N por período.
+    'DEFAULT_THROTTLE_RATES': {
+        'login': env('THROTTLE_LOGIN_RATE', default='10/min'),
+        'login_account': env('THROTTLE_LOGIN_ACCOUNT_RATE', default='5/min'),
+        'register': env('THROTTLE_REGISTER_RATE', default='5/hour'),
+        'purchase': env('THROTTLE_PURCHASE_RATE', default='30/min'),
+    },
+    # Proxies confiáveis na frente da API (1 com o nginx do docker-compose). O IP dos
+    # throttles é o N-ésimo de trás para frente no X-Forwarded-For; com 0, o header é
+    # ignorado e vale o REMOTE_ADDR, então um cliente não escolhe o próprio bucket.
+    'NUM_PROXIES': env.int('NUM_PROXIES', default=0),
 }
+# Buckets sem Redis (desenvolvimento/testes): cache local do processo.
+THROTTLE_LOCAL_CACHE = 'default'
+
+# Cache da verificação de senha do Basic Auth (users/authentication.py).
+BASIC_AUTH_CACHE = 'default'
+BASIC_AUTH_CACHE_TTL = 5 * 60
 
 
 
@@ -156,7 +243,11 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
+    # Denylist no cache (Redis) em vez do app token_blacklist: ver users/tokens.py.
+    "TOKEN_REFRESH_SERIALIZER": "users.serializers.TokenRefreshSerializer",
+    "TOKEN_BLACKLIST_SERIALIZER": "users.serializers.TokenBlacklistSerializer",
 }
+JWT_DENYLIST_CACHE = 'default'
 
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Olho no verde API',
@@ -175,3 +266,109 @@ CORS_ALLOW_CREDENTIALS = True
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+
+# Entrega de mídia (core.views.serve_media). O Django só valida o caminho; os bytes
+# saem pelo proxy:
+# - 'nginx': cabeçalho X-Accel-Redirect para MEDIA_ACCEL_REDIRECT_PREFIX (location `internal`);
+# - 'sendfile': cabeçalho X-Sendfile com o caminho absoluto (Apache/lighttpd);
+# - '' (padrão, desenvolvimento): o próprio Django envia o arquivo.
+MEDIA_OFFLOAD = env('MEDIA_OFFLOAD', default='')
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+# Só estes prefixos são públicos em MEDIA_URL (cache de MEDIA_CACHE_MAX_AGE segundos).
+# O restante (documentos de projetos e de usuários) exige URL assinada.
+PUBLIC_MEDIA_PREFIXES = ('projects/images/',)
+MEDIA_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+
+# Projetos deletados (soft delete) são expurgados após este prazo (purge_deleted_projects).
+PROJECT_RETENTION_DAYS = env.int('PROJECT_RETENTION_DAYS', default=180)
+
+# Paginação com total estimado (projects.pagination.EstimatedCountPagination): abaixo
+# deste total a contagem é exata; acima, vale a estimativa do planejador do Postgres.
+PAGINATION_EXACT_COUNT_LIMIT = env.int('PAGINATION_EXACT_COUNT_LIMIT', default=10000)
+# Listagens cuja contagem exata sem filtros é renovada por `refresh_list_counts`.
+LIST_COUNT_VIEWS = (
+    'marketplace.views.PublicTransactionViewSet',
+)
+LIST_COUNT_CACHE_TTL = 15 * 60
+
+# Changelists do admin (core/admin_tools.py): acima deste total a contagem é
+# estimada (Postgres, sem filtros) ou limitada a este valor (com filtros).
+ADMIN_COUNT_LIMIT = env.int('ADMIN_COUNT_LIMIT', default=10000)
+
+# Importação de projetos em lote (projects/bulk_import.py).
+PROJECT_IMPORT_MAX_ROWS = 1000
+PROJECT_IMPORT_MAX_IMAGE_SIZE = 5 * 1024 * 1024
+
+# Importação de compradores em lote (users/bulk_import.py). Cada senha informada é um
+# hash PBKDF2 (de propósito lento) dentro da requisição: o limite de linhas com senha
+# mantém a importação bem abaixo do GUNICORN_TIMEOUT. Lotes maiores vão sem `password`
+# (senha inutilizável).
+COMPRADOR_IMPORT_MAX_ROWS = 1000
+COMPRADOR_IMPORT_MAX_PASSWORDS = 50
+
+# URLs assinadas de documentos (core.signed_media): válidas por SIGNED_MEDIA_TTL
+# segundos, estáveis dentro de janelas de SIGNED_MEDIA_BUCKET para aproveitar o cache.
+SIGNED_MEDIA_URL = '/signed-media/'
+SIGNED_MEDIA_TTL = env.int('SIGNED_MEDIA_TTL', default=60 * 60)
+SIGNED_MEDIA_BUCKET = 15 * 60
+
+# Compressão das respostas (core.middleware.CompressionMiddleware).
+RESPONSE_COMPRESSION_MIN_SIZE = 1024
+RESPONSE_COMPRESSION_TYPES = (
+    'application/json',
+    'application/vnd.oai.openapi',
+    'application/javascript',
+    'text/html',
+    'text/plain',
+    'text/css',
+)
+# Tipos que podem sair em Brotli. HTML (páginas do admin, com token CSRF) fica no
+# gzip do Django, que acrescenta bytes aleatórios contra o BREACH; o Brotli não tem
+# esse enchimento.
+RESPONSE_BROTLI_TYPES = (
+    'application/json',
+    'application/vnd.oai.openapi',
+    'application/javascript',
+    'text/css',
+)
+RESPONSE_BROTLI_QUALITY = 4
+
+
+# Métricas (formato Prometheus) em /metrics/. O endpoint só é habilitado quando
+# METRICS_TOKEN está definido, e exige `Authorization: Bearer <token>`.
+METRICS_TOKEN = env('METRICS_TOKEN', default='')
+
+# URL de administração do PgBouncer (banco `pgbouncer`), usada para expor a
+# saturação do pool. Opcional.
+PGBOUNCER_ADMIN_URL = env('PGBOUNCER_ADMIN_URL', default='')
+
+
+# Redis (pub/sub do feed ao vivo e, quando configurado, cache).
+REDIS_URL = env('REDIS_URL', default='')
+LIVE_FEED_CHANNEL = 'marketplace:live'
+LIVE_FEED_KEEPALIVE_SECONDS = 15
+
+# Cache: Redis quando REDIS_URL está definida; senão, memória local do processo
+# (desenvolvimento/testes). A denylist de refresh tokens vive aqui, então em
+# produção com vários workers o Redis é obrigatório.
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+            'OPTIONS': {'CLIENT_CLASS': 'django_redis.client.DefaultClient'},
+        }
+    }
+else:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+# Outbox transacional (comando relay_outbox)
+OUTBOX_REDIS_STREAM = 'marketplace:events'
+OUTBOX_REDIS_STREAM_MAXLEN = 1_000_000
+OUTBOX_CELERY_BROKER_URL = env('CELERY_BROKER_URL', default=REDIS_URL)
+OUTBOX_CELERY_TASK = 'marketplace.handle_domain_event'
+
+# Transações: partições mensais (comando manage_transaction_partitions) e janela do
+# feed público, que mantém a listagem dentro das partições recentes.
+PUBLIC_TRANSACTION_FEED_DAYS = env.int('PUBLIC_TRANSACTION_FEED_DAYS', default=90)
+TRANSACTION_PARTITIONS_AHEAD = 3
@@ -0,0 +1,66 @@
+"""
+URLs assinadas e com prazo para arquivos privados de MEDIA_ROOT (documentos).
+
+Formato: `{SIGNED_MEDIA_URL}<expires>/<assinatura>/<caminho>`, onde a assinatura é um
+HMAC-SHA256 de `caminho:expires` com a SECRET_KEY. A verificação não consulta o banco:
+basta recalcular o HMAC e comparar o prazo.
+
+O prazo é arredondado para o fim da janela de SIGNED_MEDIA_BUCKET segundos, então a
+mesma URL é gerada durante toda a janela e o cliente reaproveita o arquivo em cache.
+A validade fica entre SIGNED_MEDIA_TTL e SIGNED_MEDIA_TTL + SIGNED_MEDIA_BUCKET.
+"""
+import base64
+import time
+from urllib.parse import quote
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare, salted_hmac
+from rest_framework import serializers
+
+SALT = "core.signed_media"
+
+
+def _signature(path, expires, secret):
+    digest = salted_hmac(SALT, f"{path}:{expires}", secret=secret, algorithm="sha256").digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def window_start(now=None):
+    """Início da janela atual: a partir dele, as URLs geradas são as mesmas."""
+    now = int(time.time() if now is None else now)
+    return now // settings.SIGNED_MEDIA_BUCKET * settings.SIGNED_MEDIA_BUCKET
+
+
+def expires_at(now=None):
+    """Fim da validade para URLs geradas agora (constante dentro da janela)."""
+    return window_start(now) + settings.SIGNED_MEDIA_BUCKET + settings.SIGNED_MEDIA_TTL
+
+
+def signed_url(path, now=None):
+    """URL relativa e assinada para `path` (nome do arquivo no storage)."""
+    expires = expires_at(now)
+    signature = _signature(path, expires, settings.SECRET_KEY)
+    return f"{settings.SIGNED_MEDIA_URL}{expires}/{signature}/{quote(path)}"
+
+
+def verify(path, expires, signature, now=None):
+    """Confere assinatura e prazo. Aceita as chaves de SECRET_KEY_FALLBACKS (rotação)."""
+    if int(time.time() if now is None else now) >= expires:
+        return False
+    return any(
+        constant_time_compare(signature, _signature(path, expires, secret))
+        for secret in [settings.SECRET_KEY, *settings.SECRET_KEY_FALLBACKS]
+    )
+
+
+class SignedFileField(serializers.FileField):
+    """`FileField` cuja representação é uma URL assinada (ver `signed_url`)."""
+
+    def url_for(self, name, request):
+        url = signed_url(name)
+        return request.build_absolute_uri(url) if request is not None else url
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        return self.url_for(value.name, self.context.get("request"))
@@ -0,0 +1,58 @@
+"""
+Estáticos sob ASGI, fora da pilha de middlewares.
+
+O WhiteNoiseMiddleware (whitenoise 6.x) é só síncrono: numa pilha ASGI, ele obriga o
+Django a trocar o event loop por uma thread em toda requisição, inclusive nas views
+assíncronas. Com SERVER_MODE=asgi ele sai do MIDDLEWARE, e `ASGIStaticFiles` atende
+/static/ antes do Django, com a mesma configuração do middleware (STATIC_ROOT,
+prefixo, arquivos com hash imutáveis, versões .gz/.br). Só a leitura dos arquivos
+estáticos vai para uma thread.
+"""
+from asgiref.sync import sync_to_async
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+BLOCK_SIZE = 64 * 1024
+
+
+def request_headers(scope):
+    """Cabeçalhos do escopo ASGI no formato de `request.META`, que o WhiteNoise espera."""
+    headers = {}
+    for name, value in scope["headers"]:
+        key = "HTTP_" + name.decode("latin-1").upper().replace("-", "_")
+        headers[key] = value.decode("latin-1")
+    return headers
+
+
+class ASGIStaticFiles:
+    def __init__(self, application):
+        self.application = application
+        self.whitenoise = WhiteNoiseMiddleware()
+
+    def find_file(self, path):
+        if self.whitenoise.autorefresh:
+            return self.whitenoise.find_file(path)
+        return self.whitenoise.files.get(path)
+
+    async def __call__(self, scope, receive, send):
+        static_file = self.find_file(scope["path"]) if scope["type"] == "http" else None
+        if static_file is None:
+            return await self.application(scope, receive, send)
+        await self.serve(static_file, scope, send)
+
+    async def serve(self, static_file, scope, send):
+        response = static_file.get_response(scope["method"], request_headers(scope))
+        await send({
+            "type": "http.response.start",
+            "status": int(response.status),
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in response.headers],
+        })
+        if response.file is None:
+            await send({"type": "http.response.body", "body": b""})
+            return
+        read = sync_to_async(response.file.read, thread_sensitive=False)
+        try:
+            while chunk := await read(BLOCK_SIZE):
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            response.file.close()
@@ -0,0 +1,394 @@
+import io
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import OperationalError, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from marketplace.models import Transaction
+from marketplace.serializers import PublicTransactionSerializer, TransactionSerializer
+from marketplace.views import PublicTransactionViewSet
+from projects.models import Project, ProjectCatalogEntry
+from projects.serializers import ProjectCatalogSerializer, ProjectListSerializer
+from users.models import BaseUser, CompradorDocuments, OfertanteProfile
+from users.serializers import CompradorDocumentsSerializer
+from . import signed_media
+from .db_routers import (
+    PrimaryReplicaRouter, disable_replica_reads, healthy_replicas, replica_reads_enabled, use_read_replica,
+)
+from .fast_serializers import FastListSerializer
+from .middleware import ReadReplicaMiddleware, primary_pin_key
+from .parsers import ORJSONParser
+from .renderers import ORJSONRenderer
+from .static_files import ASGIStaticFiles
+
+
+class HealthCheckTests(TestCase):
+    def test_liveness(self):
+        res = self.client.get(reverse("healthz"))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json(), {"status": "ok"})
+
+    def test_readiness_checks_databases(self):
+        res = self.client.get(reverse("readyz"))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["databases"], {"default": "ok"})
+
+    def test_readiness_ignores_failing_replicas(self):
+        replica = mock.MagicMock()
+        replica.cursor.side_effect = ConnectionError("réplica fora do ar")
+        fake_connections = {"default": connections["default"], "replica_0": replica}
+        with mock.patch("core.views.connections", fake_connections):
+            res = self.client.get(reverse("readyz"))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["databases"], {"default": "ok", "replica_0": "erro: ConnectionError"})
+
+        with mock.patch("core.views.connections", {"default": replica, "replica_0": connections["default"]}):
+            self.assertEqual(self.client.get(reverse("readyz")).status_code, 503)
+
+
+class MetricsTests(TestCase):
+    def test_disabled_without_token(self):
+        with self.settings(METRICS_TOKEN=""):
+            res = self.client.get(reverse("metrics"))
+        self.assertEqual(res.status_code, 404)
+
+    def test_requires_bearer_token(self):
+        with self.settings(METRICS_TOKEN="segredo"):
+            denied = self.client.get(reverse("metrics"))
+            allowed = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer segredo")
+        self.assertEqual(denied.status_code, 401)
+        self.assertEqual(allowed.status_code, 200)
+        self.assertTrue(allowed["Content-Type"].startswith("text/plain"))
+
+    def test_unreachable_replica_keeps_primary_metrics(self):
+        def stats(alias):
+            if alias == "replica_0":
+                raise OperationalError("réplica fora do ar")
+            return {"active": 2, "idle": 3, "total": 5, "max": 100, "saturation": 0.05}
+
+        with (
+            self.settings(METRICS_TOKEN="segredo"),
+            mock.patch("core.views.connections", ["default", "replica_0"]),
+            mock.patch("core.views.postgres_connection_stats", side_effect=stats),
+        ):
+            res = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer segredo")
+        self.assertEqual(res.status_code, 200)
+        body = res.content.decode()
+        self.assertIn('db_up{alias="default"} 1', body)
+        self.assertIn('db_up{alias="replica_0"} 0', body)
+        self.assertIn('db_server_connections_max{alias="default"} 100', body)
+        self.assertNotIn('db_server_connections_max{alias="replica_0"}', body)
+
+
+class PrimaryReplicaRouterTests(TestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    def test_reads_stay_on_primary_by_default(self):
+        self.assertIsNone(self.router.db_for_read(Project))
+
+    def test_enabled_reads_go_to_healthy_replica(self):
+        with mock.patch("core.db_routers.healthy_replicas", return_value=["replica_0"]):
+            with use_read_replica():
+                # TestCase envolve cada teste numa transação; simula uma requisição fora dela.
+                with mock.patch.object(connections["default"], "in_atomic_block", False):
+                    self.assertEqual(self.router.db_for_read(Project), "replica_0")
+
+    def test_write_pins_rest_of_request_to_primary(self):
+        with mock.patch("core.db_routers.healthy_replicas", return_value=["replica_0"]):
+            with use_read_replica():
+                with mock.patch.object(connections["default"], "in_atomic_block", False):
+                    self.assertEqual(self.router.db_for_write(Project), "default")
+                    self.assertIsNone(self.router.db_for_read(Project))
+
+    def test_lagging_replicas_fall_back_to_primary(self):
+        with self.settings(READ_REPLICAS=["replica_0"], READ_REPLICA_MAX_LAG=5):
+            with mock.patch("core.db_routers.replica_lag", return_value=30.0):
+                self.assertEqual(healthy_replicas(), [])
+
+
+@override_settings(READ_REPLICAS=["replica_0"])
+class ReadReplicaMiddlewareTests(TestCase):
+    def setUp(self):
+        self.user = BaseUser.objects.create_user(
+            email="comprador@example.com", password="Test#123", user_type=BaseUser.UserType.COMPRADOR,
+        )
+        self.addCleanup(cache.delete, primary_pin_key(self.user.pk))
+        self.addCleanup(disable_replica_reads)
+
+    def respond(self, status_code, method="post", user=None):
+        request = getattr(RequestFactory(), method)("/")
+        request.user = user or AnonymousUser()
+        return ReadReplicaMiddleware(lambda request: HttpResponse(status=status_code))(request)
+
+    def reads_from_replica(self, **headers):
+        request = RequestFactory().get("/", **headers)
+        view = PublicTransactionViewSet.as_view({"get": "list"})
+        ReadReplicaMiddleware(lambda request: None).process_view(request, view, (), {})
+        return replica_reads_enabled()
+
+    def test_successful_write_pins_client_and_user(self):
+        res = self.respond(201, user=self.user)
+        self.assertIn("read_primary", res.cookies)
+        self.assertTrue(cache.get(primary_pin_key(self.user.pk)))
+
+    def test_failed_write_does_not_pin(self):
+        res = self.client.post(reverse("user_register"), {})
+        self.assertEqual(res.status_code, 400)
+        self.assertNotIn("read_primary", res.cookies)
+        self.assertNotIn("read_primary", self.respond(403, user=self.user).cookies)
+        self.assertIsNone(cache.get(primary_pin_key(self.user.pk)))
+
+    def test_no_cookie_without_replicas(self):
+        with self.settings(READ_REPLICAS=[]):
+            self.assertNotIn("read_primary", self.respond(201, user=self.user).cookies)
+
+    def test_pinned_user_reads_from_primary_without_cookie(self):
+        authorization = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(self.user)}"}
+        self.assertTrue(self.reads_from_replica(**authorization))
+        disable_replica_reads()
+
+        self.respond(200, method="patch", user=self.user)
+        self.assertFalse(self.reads_from_replica(**authorization))
+        self.assertTrue(self.reads_from_replica())
+
+
+class FastListSerializerTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_settings = self.settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        ofertante = BaseUser.objects.create_user(
+            email="ofertante@example.com", password="Test#123", user_type=BaseUser.UserType.OFERTANTE,
+        )
+        buyer = BaseUser.objects.create_user(
+            email="comprador@example.com", password="Test#123", user_type=BaseUser.UserType.COMPRADOR,
+        )
+        OfertanteProfile.objects.create(
+            user=ofertante, contact_name="Ana", contact_position="Diretora", phone="11999999999",
+            organization_type=OfertanteProfile.OrganizationType.ONG, organization_name="Verde Vivo",
+        )
+        with_image = Project(
+            ofertante=ofertante, name="Com imagem", project_type=Project.ProjectType.AGRICULTURA,
+            status=Project.Status.ACTIVE, carbon_credits_available=10, price_per_credit="12.50",
+        )
+        with_image.image.save("capa.png", ContentFile(b"png"), save=False)
+        with_image.save()
+        project = Project.objects.create(
+            ofertante=ofertante, name="Sem imagem", project_type=Project.ProjectType.OUTRO,
+            status=Project.Status.ACTIVE, carbon_credits_available=5, price_per_credit=3, location="Manaus/AM",
+        )
+        for quantity in (1, 2):
+            Transaction.objects.create(
+                buyer=buyer, project=project, quantity=quantity,
+                price_per_credit_at_purchase=project.price_per_credit, total_price=project.price_per_credit * quantity,
+            )
+        self.request = RequestFactory().get("/api/projects/")
+
+    def assertSameBytes(self, serializer_class, queryset):
+        context = {"request": self.request}
+        expected = JSONRenderer().render(serializer_class(queryset, many=True, context=context).data)
+        fast = FastListSerializer.for_serializer(serializer_class)
+        actual = JSONRenderer().render(fast.to_representation(fast.values(queryset), context))
+        self.assertEqual(actual, expected)
+
+    def test_output_is_byte_identical(self):
+        self.assertSameBytes(ProjectListSerializer, Project.objects.all())
+        self.assertSameBytes(ProjectCatalogSerializer, ProjectCatalogEntry.objects.all())
+        self.assertSameBytes(TransactionSerializer, Transaction.objects.all())
+        self.assertSameBytes(PublicTransactionSerializer, Transaction.objects.all())
+
+
+class ORJSONRendererTests(TestCase):
+    def test_matches_drf_renderer(self):
+        data = {
+            "id": uuid.uuid4(),
+            "price": Decimal("12.50"),
+            "formatted_price": "12.50",
+            "timestamp": datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            "name": "Reflorestamento São João \u2028",
+            "label": gettext_lazy("Pendente"),
+            "items": [1, 2.5, None, True],
+            "counts": {1: "um"},
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indented_requests_fall_back_to_drf(self):
+        data = {"a": [1, 2]}
+        media_type = "application/json; indent=4"
+        self.assertEqual(ORJSONRenderer().render(data, media_type), JSONRenderer().render(data, media_type))
+
+    def test_drf_renderer_is_the_default(self):
+        self.assertEqual(api_settings.DEFAULT_RENDERER_CLASSES[0], JSONRenderer)
+        with self.assertRaises(ValueError):
+            api_settings.DEFAULT_RENDERER_CLASSES[0]().render({"valor": float("nan")})
+
+    def test_non_finite_floats_become_null(self):
+        # Diferença documentada em relação ao DRF; por isso o orjson é opcional (USE_ORJSON).
+        self.assertEqual(ORJSONRenderer().render({"valor": float("nan")}), b'{"valor":null}')
+
+    def test_parser(self):
+        parser = ORJSONParser()
+        self.assertEqual(parser.parse(io.BytesIO('{"quantidade": 4, "nome": "São"}'.encode())), {"quantidade": 4, "nome": "São"})
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(b'{"quantidade": NaN}'))
+
+
+class CompressionMiddlewareTests(TestCase):
+    def setUp(self):
+        ofertante = BaseUser.objects.create_user(
+            email="ofertante@example.com", password="Test#123", user_type=BaseUser.UserType.OFERTANTE,
+        )
+        for index in range(30):
+            Project.objects.create(
+                ofertante=ofertante, name=f"Projeto {index}", project_type=Project.ProjectType.OUTRO,
+                status=Project.Status.ACTIVE, carbon_credits_available=10, price_per_credit=1,
+            )
+
+    def test_large_json_is_compressed(self):
+        gzip_res = self.client.get(reverse("project-list"), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(gzip_res["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", gzip_res["Vary"])
+        br_res = self.client.get(reverse("project-list"), HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(br_res["Content-Encoding"], "br")
+        self.assertTrue(br_res["ETag"].startswith("W/"))
+
+    def test_html_is_never_brotli(self):
+        admin = BaseUser.objects.create_superuser(email="admin@example.com", password="Test#123")
+        self.client.force_login(admin)
+        with self.settings(STORAGES={
+            "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+            "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+        }):
+            res = self.client.get(reverse("admin:index"), HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertTrue(res["Content-Type"].startswith("text/html"))
+        self.assertEqual(res["Content-Encoding"], "gzip")
+
+    def test_small_responses_are_not_compressed(self):
+        res = self.client.get(reverse("healthz"), HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertFalse(res.has_header("Content-Encoding"))
+
+
+@override_settings(STATIC_ROOT="/tmp/guarani-test-static")
+class ASGIStaticFilesTests(TestCase):
+    def setUp(self):
+        os.makedirs("/tmp/guarani-test-static", exist_ok=True)
+        with open("/tmp/guarani-test-static/app.css", "w") as f:
+            f.write("body { color: green; }")
+
+    async def call(self, path, app=None):
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": path, "headers": [(b"accept-encoding", b"gzip")]}
+        await ASGIStaticFiles(app)(scope, None, send)
+        return messages
+
+    async def test_serves_static_files_without_django(self):
+        messages = await self.call("/static/app.css")
+        self.assertEqual(messages[0]["status"], 200)
+        self.assertIn((b"content-type", b"text/css; charset=\"utf-8\""), messages[0]["headers"])
+        self.assertEqual(b"".join(m["body"] for m in messages[1:]), b"body { color: green; }")
+
+    async def test_other_paths_go_to_django(self):
+        app = mock.AsyncMock()
+        await self.call("/api/projects/", app)
+        app.assert_awaited_once()
+
+
+class MediaServingTests(TestCase):
+    @override_settings(MEDIA_OFFLOAD="nginx")
+    def test_nginx_offload_returns_empty_body(self):
+        res = self.client.get("/media/projects/images/capa%20verde.png")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res["X-Accel-Redirect"], "/protected-media/projects/images/capa%20verde.png")
+        self.assertEqual(res["Content-Type"], "image/png")
+        self.assertEqual(res.content, b"")
+
+    @override_settings(MEDIA_OFFLOAD="nginx")
+    def test_rejects_paths_outside_media_root(self):
+        res = self.client.get("/media/../core/settings.py")
+        self.assertEqual(res.status_code, 404)
+
+    @override_settings(MEDIA_OFFLOAD="nginx")
+    def test_documents_are_not_public(self):
+        res = self.client.get("/media/ofertante_documents/2024/01/01/contrato.pdf")
+        self.assertEqual(res.status_code, 404)
+
+
+class SignedMediaTests(TestCase):
+    path = "compradores/documents/relatório.pdf"
+
+    @classmethod
+    def setUpClass(cls):
+        media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_settings = override_settings(MEDIA_ROOT=media_root, MEDIA_OFFLOAD="")
+        media_settings.enable()
+        cls.addClassCleanup(media_settings.disable)
+        super().setUpClass()
+        os.makedirs(os.path.join(media_root, "compradores", "documents"))
+        with open(os.path.join(media_root, cls.path), "wb") as f:
+            f.write(bytes(range(256)) * 4)
+
+    def test_url_is_stable_within_bucket(self):
+        now = 1_700_000_000
+        url = signed_media.signed_url(self.path, now=now)
+        self.assertEqual(url, signed_media.signed_url(self.path, now=now + 1))
+        self.assertTrue(url.startswith("/signed-media/"))
+        self.assertTrue(url.endswith("/compradores/documents/relat%C3%B3rio.pdf"))
+
+    def test_serves_full_file_and_range(self):
+        url = signed_media.signed_url(self.path)
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res["Accept-Ranges"], "bytes")
+        self.assertIn("private", res["Cache-Control"])
+        self.assertEqual(len(b"".join(res.streaming_content)), 1024)
+
+        res = self.client.get(url, HTTP_RANGE="bytes=10-19")
+        self.assertEqual(res.status_code, 206)
+        self.assertEqual(res["Content-Range"], "bytes 10-19/1024")
+        self.assertEqual(b"".join(res.streaming_content), bytes(range(10, 20)))
+
+        res = self.client.get(url, HTTP_RANGE="bytes=-4")
+        self.assertEqual(b"".join(res.streaming_content), bytes(range(252, 256)))
+        self.assertEqual(self.client.get(url, HTTP_RANGE="bytes=2000-").status_code, 416)
+
+    def test_rejects_tampered_or_expired_urls(self):
+        url = signed_media.signed_url(self.path)
+        self.assertEqual(self.client.get(url.replace("relat", "xelat")).status_code, 403)
+        expired = signed_media.signed_url(self.path, now=1_000_000)
+        self.assertEqual(self.client.get(expired).status_code, 403)
+
+    @override_settings(MEDIA_OFFLOAD="nginx")
+    def test_offload_verifies_without_queries(self):
+        with self.assertNumQueries(0):
+            res = self.client.get(signed_media.signed_url(self.path))
+        self.assertEqual(res["X-Accel-Redirect"], "/protected-media/compradores/documents/relat%C3%B3rio.pdf")
+
+    def test_serializer_exposes_signed_url(self):
+        request = RequestFactory().get("/")
+        document = CompradorDocuments(file=self.path)
+        data = CompradorDocumentsSerializer(document, context={"request": request}).data
+        self.assertTrue(data["file"].startswith("http://testserver/signed-media/"))
@@ -0,0 +1,158 @@
+"""
+Rate limiting por token bucket, compartilhado entre workers via Redis.
+
+Cada bucket (rota + usuário/IP/conta) tem capacidade `N` e recarrega `N` fichas por
+período, com a taxa definida em `REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']` no formato
+do DRF (ex.: '10/min' = rajada de 10, recarga de 10 por minuto). A atualização é um
+script Lua (`EVALSHA`): ler, recarregar, consumir e gravar acontecem numa única ida
+ao Redis, de forma atômica, usando o relógio do próprio Redis. As chaves expiram
+quando o bucket estaria cheio de novo.
+
+Sem REDIS_URL, os buckets ficam no cache local do processo (desenvolvimento/testes).
+Se o Redis falhar, a requisição é admitida: o throttle não derruba a API.
+"""
+import hashlib
+import logging
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1]: bucket; ARGV: capacidade, fichas por segundo, custo.
+# Retorna {admitido (0/1), segundos até haver fichas (string)}.
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return {allowed, tostring(wait)}
+"""
+
+_script = None
+_local_lock = threading.Lock()
+
+
+def _get_script():
+    global _script
+    if _script is None:
+        import redis
+
+        _script = redis.Redis.from_url(settings.REDIS_URL).register_script(TOKEN_BUCKET_LUA)
+    return _script
+
+
+def _take_local(key, capacity, rate, cost):
+    """Mesmo algoritmo do script Lua, no cache local (um processo)."""
+    cache = caches[settings.THROTTLE_LOCAL_CACHE]
+    with _local_lock:
+        now = time.time()
+        tokens, ts = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+        allowed = tokens >= cost
+        wait = 0.0
+        if allowed:
+            tokens -= cost
+        else:
+            wait = (cost - tokens) / rate
+        cache.set(key, (tokens, now), timeout=math.ceil((capacity - tokens) / rate) + 1)
+    return allowed, wait
+
+
+def take_token(key, capacity, rate, cost=1):
+    """Consome `cost` fichas do bucket `key`. Retorna (admitido, segundos de espera)."""
+    if not settings.REDIS_URL:
+        return _take_local(key, capacity, rate, cost)
+    try:
+        allowed, wait = _get_script()(keys=[key], args=[capacity, rate, cost])
+    except Exception:
+        logger.warning("Falha ao consultar o rate limit no Redis; requisição admitida.", exc_info=True)
+        return True, 0.0
+    return bool(int(allowed)), float(wait)
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Base: o bucket é `throttle:<scope>:<identidade>`. Por padrão a identidade é o
+    usuário autenticado ou, sem login, o IP (`get_ident` do DRF com
+    `REST_FRAMEWORK['NUM_PROXIES']`: o X-Forwarded-For só é lido atrás de proxies
+    confiáveis).
+    """
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = f"user:{request.user.pk}"
+        else:
+            ident = f"ip:{self.get_ident(request)}"
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+        allowed, self._wait = take_token(key, self.num_requests, self.num_requests / self.duration)
+        return allowed
+
+    def wait(self):
+        return getattr(self, "_wait", None)
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """Bucket por IP, mesmo para usuários autenticados."""
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": f"ip:{self.get_ident(request)}"}
+
+
+class LoginRateThrottle(IPTokenBucketThrottle):
+    scope = "login"
+
+
+class LoginAccountRateThrottle(TokenBucketThrottle):
+    """
+    Tentativas de login por conta (e-mail informado), contra ataques vindos de vários IPs.
+
+    A chave não inclui o IP de propósito: com ele, um ataque distribuído teria um
+    bucket por IP. Em troca, quem conhece um e-mail pode esgotar o bucket da conta e
+    bloquear o login legítimo por até um período de THROTTLE_LOGIN_ACCOUNT_RATE (sem
+    lockout permanente: o bucket recarrega sozinho).
+    """
+    scope = "login_account"
+
+    def get_cache_key(self, request, view):
+        email = str(request.data.get("email") or "").strip().lower()
+        if not email:
+            return None
+        # O e-mail não vai em claro para as chaves do Redis.
+        digest = hashlib.sha256(email.encode()).hexdigest()[:32]
+        return self.cache_format % {"scope": self.scope, "ident": f"account:{digest}"}
+
+
+class RegistrationRateThrottle(IPTokenBucketThrottle):
+    scope = "register"
+
+
+class PurchaseRateThrottle(TokenBucketThrottle):
+    scope = "purchase"
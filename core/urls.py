@@ -1,6 +1,5 @@
 from django.contrib import admin
 from django.conf import settings
-from django.conf.urls.static import static
 from django.urls import path, include
 from django.views.generic.base import RedirectView
 from drf_spectacular.views import (
@@ -9,6 +8,8 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from .views import liveness, metrics, readiness, serve_media, serve_signed_media
+
 # URLs da API - Agrupadas para melhor organização
 api_urlpatterns = [
     # Redireciona a raiz da API para a documentação do Swagger
@@ -29,9 +30,16 @@ urlpatterns = [
     # Redireciona a raiz do projeto para a documentação do Swagger
     path("", RedirectView.as_view(url="/api/schema/swagger-ui/", permanent=False)),
     path("admin/", admin.site.urls),
+    # Health checks usados pelo orquestrador/load balancer
+    path("healthz/", liveness, name="healthz"),
+    path("readyz/", readiness, name="readyz"),
+    path("metrics/", metrics, name="metrics"),
     path("api/", include(api_urlpatterns)),
-]
-
-
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+    # Mídia: em produção os bytes saem pelo proxy (X-Accel-Redirect/X-Sendfile).
+    path(f"{settings.MEDIA_URL.strip('/')}/<path:path>", serve_media, name="media"),
+    path(
+        f"{settings.SIGNED_MEDIA_URL.strip('/')}/<int:expires>/<str:signature>/<path:path>",
+        serve_signed_media,
+        name="signed-media",
+    ),
+]
\ No newline at end of file
@@ -0,0 +1,244 @@
+import logging
+import mimetypes
+import os
+import re
+import time
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseForbidden,
+    HttpResponseNotModified,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control
+from django.utils.crypto import constant_time_compare
+from django.utils.http import http_date
+from django.views import static
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_GET, require_safe
+
+from . import signed_media
+from .db import pgbouncer_pool_stats, postgres_connection_stats
+
+logger = logging.getLogger(__name__)
+
+
+@never_cache
+@require_GET
+def liveness(request):
+    """Indica que o processo está de pé. Não acessa banco nem serviços externos."""
+    return JsonResponse({"status": "ok"})
+
+
+@never_cache
+@require_GET
+def readiness(request):
+    """
+    Indica se o processo pode receber tráfego. Só o banco `default` decide: réplicas
+    fora do ar aparecem em `databases`, mas o roteador já as ignora (core/db_routers.py)
+    e o processo continua atendendo pelo primário.
+    """
+    checks = {}
+    for alias in connections:
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute("SELECT 1")
+            checks[alias] = "ok"
+        except Exception as exc:
+            checks[alias] = f"erro: {exc.__class__.__name__}"
+
+    ready = checks[DEFAULT_DB_ALIAS] == "ok"
+    return JsonResponse(
+        {"status": "ok" if ready else "unavailable", "databases": checks},
+        status=200 if ready else 503,
+    )
+
+
+def _metric(lines, name, help_text, samples):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} gauge")
+    for labels, value in samples:
+        label_str = ",".join(f'{key}="{val}"' for key, val in labels.items())
+        lines.append(f"{name}{{{label_str}}} {value}")
+
+
+@never_cache
+@require_GET
+def metrics(request):
+    """
+    Expõe métricas de conexões com o banco no formato texto do Prometheus.
+
+    Um banco que não responde (ex.: uma réplica fora do ar) aparece com `db_up 0` e
+    não derruba as métricas dos demais. Desabilitado (404) quando METRICS_TOKEN não
+    está configurado.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        raise Http404
+    auth = request.headers.get("Authorization", "")
+    if not constant_time_compare(auth, f"Bearer {token}"):
+        return HttpResponse(status=401)
+
+    lines = []
+    db_samples = []
+    up_samples = []
+    for alias in connections:
+        try:
+            stats = postgres_connection_stats(alias)
+        except DatabaseError:
+            logger.warning("Métricas do banco '%s' indisponíveis.", alias, exc_info=True)
+            up_samples.append(({"alias": alias}, 0))
+            continue
+        if stats:
+            db_samples.append((alias, stats))
+            up_samples.append(({"alias": alias}, 1))
+
+    if up_samples:
+        _metric(lines, "db_up", "1 se o banco respondeu à coleta de métricas, 0 se falhou.", up_samples)
+    if db_samples:
+        _metric(lines, "db_server_connections", "Conexões abertas no Postgres por estado.", [
+            ({"alias": alias, "state": state}, stats[state])
+            for alias, stats in db_samples for state in ("active", "idle", "total")
+        ])
+        _metric(lines, "db_server_connections_max", "Valor de max_connections do Postgres.", [
+            ({"alias": alias}, stats["max"]) for alias, stats in db_samples
+        ])
+        _metric(lines, "db_pool_saturation_ratio", "Fração de max_connections em uso.", [
+            ({"alias": alias}, f"{stats['saturation']:.4f}") for alias, stats in db_samples
+        ])
+
+    pools = pgbouncer_pool_stats()
+    if pools:
+        for column, name, help_text in (
+            ("cl_active", "pgbouncer_clients_active", "Clientes com conexão de servidor atribuída."),
+            ("cl_waiting", "pgbouncer_clients_waiting", "Clientes aguardando uma conexão de servidor."),
+            ("sv_active", "pgbouncer_servers_active", "Conexões de servidor em uso."),
+            ("sv_idle", "pgbouncer_servers_idle", "Conexões de servidor livres."),
+            ("maxwait", "pgbouncer_max_wait_seconds", "Maior espera de um cliente na fila."),
+        ):
+            _metric(lines, name, help_text, [
+                ({"database": pool["database"], "user": pool["user"]}, pool.get(column, 0)) for pool in pools
+            ])
+
+    return HttpResponse("\n".join(lines) + "\n", content_type="text/plain; version=0.0.4")
+
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _read_range(path, start, length):
+    with open(path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(STREAM_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _file_response(request, full_path):
+    """
+    Envia o arquivo pelo próprio Django (sem offload), com If-Modified-Since e um
+    único intervalo de `Range: bytes=...`. Pedidos com vários intervalos recebem o
+    arquivo inteiro, como o RFC 9110 permite.
+    """
+    if not os.path.isfile(full_path):
+        raise Http404
+    stat = os.stat(full_path)
+    if not static.was_modified_since(request.headers.get("If-Modified-Since"), stat.st_mtime):
+        return HttpResponseNotModified()
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or "application/octet-stream"
+    last_modified = http_date(stat.st_mtime)
+    size = stat.st_size
+
+    match = RANGE_RE.match(request.headers.get("Range", "").strip())
+    if_range = request.headers.get("If-Range")
+    if match and any(match.groups()) and (if_range is None or if_range == last_modified):
+        first, last = match.groups()
+        if first:
+            start, end = int(first), min(int(last), size - 1) if last else size - 1
+        else:
+            start, end = max(size - int(last), 0), size - 1
+        if start >= size or start > end:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+        response = StreamingHttpResponse(
+            _read_range(full_path, start, end - start + 1), status=206, content_type=content_type
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(end - start + 1)
+    else:
+        response = FileResponse(open(full_path, "rb"), content_type=content_type)
+        if encoding:
+            response["Content-Encoding"] = encoding
+
+    response["Accept-Ranges"] = "bytes"
+    response["Last-Modified"] = last_modified
+    return response
+
+
+def _media_response(request, path):
+    """
+    Resposta para `path` dentro de MEDIA_ROOT sem que o worker Python leia os bytes: com
+    MEDIA_OFFLOAD configurado, a resposta é vazia e o proxy (nginx/Apache) envia o
+    arquivo, inclusive atendendo Range. Sem offload (desenvolvimento), o Django envia.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    relative_path = os.path.relpath(full_path, settings.MEDIA_ROOT).replace(os.sep, "/")
+
+    if settings.MEDIA_OFFLOAD == "nginx":
+        header, value = "X-Accel-Redirect", quote(settings.MEDIA_ACCEL_REDIRECT_PREFIX + relative_path)
+    elif settings.MEDIA_OFFLOAD == "sendfile":
+        header, value = "X-Sendfile", full_path
+    else:
+        return _file_response(request, full_path)
+
+    content_type, _ = mimetypes.guess_type(full_path)
+    response = HttpResponse(content_type=content_type or "application/octet-stream")
+    response[header] = value
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Mídia pública (ex.: imagens dos projetos). Só os caminhos em PUBLIC_MEDIA_PREFIXES
+    são entregues aqui; documentos exigem URL assinada (`serve_signed_media`).
+    """
+    if not path.startswith(settings.PUBLIC_MEDIA_PREFIXES) or ".." in path.split("/"):
+        raise Http404
+    response = _media_response(request, path)
+    if response.status_code in (200, 206):
+        patch_cache_control(response, public=True, max_age=settings.MEDIA_CACHE_MAX_AGE)
+    return response
+
+
+@require_safe
+def serve_signed_media(request, expires, signature, path):
+    """
+    Documentos via URL assinada (core.signed_media). A verificação é só um HMAC, sem
+    acesso ao banco; o arquivo segue o mesmo caminho de `serve_media` (offload no proxy).
+    O cache é privado e dura até a URL expirar.
+    """
+    if not signed_media.verify(path, expires, signature):
+        return HttpResponseForbidden()
+    response = _media_response(request, path)
+    if response.status_code in (200, 206):
+        patch_cache_control(response, private=True, max_age=max(expires - int(time.time()), 0))
+    return response
@@ -0,0 +1,66 @@
+"""
+Configuração do Gunicorn para produção.
+
+Dois modos de execução, escolhidos pela variável SERVER_MODE:
+
+- `wsgi` (padrão): workers `gthread` servindo `core.wsgi`. É o modo indicado para as
+  views síncronas do DRF, pois cada worker atende várias requisições em threads.
+- `asgi`: workers do Uvicorn servindo `core.asgi`. Necessário para as rotas assíncronas
+  e de streaming; as views síncronas continuam funcionando, mas cada requisição
+  delas paga a troca do event loop para uma thread.
+
+Todos os valores podem ser sobrescritos por variáveis de ambiente GUNICORN_*.
+"""
+import os
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def available_cpus():
+    """Respeita o limite de CPUs do contêiner (affinity) quando disponível."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+SERVER_MODE = os.environ.get("SERVER_MODE", "wsgi").lower()
+CPUS = available_cpus()
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+if SERVER_MODE == "asgi":
+    wsgi_app = "core.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+    # Cada worker tem seu próprio event loop: um por CPU é suficiente.
+    workers = env_int("GUNICORN_WORKERS", CPUS)
+    threads = 1
+else:
+    wsgi_app = "core.wsgi:application"
+    worker_class = "gthread"
+    # A maior parte do tempo das views é espera por I/O (banco), então usamos
+    # mais workers que CPUs e algumas threads por worker.
+    workers = env_int("GUNICORN_WORKERS", CPUS * 2 + 1)
+    threads = env_int("GUNICORN_THREADS", 4)
+
+# Carrega a aplicação antes do fork: workers sobem mais rápido e compartilham memória.
+preload_app = True
+
+# Recicla workers periodicamente para conter vazamentos de memória.
+# O jitter evita que todos reiniciem ao mesmo tempo.
+max_requests = env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+
+timeout = env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = env_int("GUNICORN_KEEPALIVE", 5)
+
+# Em contêineres, /tmp pode estar em disco; o heartbeat dos workers fica em memória.
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
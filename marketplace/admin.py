@@ -1,15 +1,20 @@
 from django.contrib import admin
+
+from core.admin_tools import AutocompleteFilter, ScalableAdminMixin
 from .models import Transaction
 
 @admin.register(Transaction)
-class TransactionAdmin(admin.ModelAdmin):
+class TransactionAdmin(ScalableAdminMixin, admin.ModelAdmin):
     """
     Configuração do Admin para o modelo Transaction.
     """
     list_display = ('id', 'buyer', 'project', 'quantity', 'total_price', 'timestamp')
-    list_filter = ('timestamp', 'project')
+    # `buyer` e `project` (e o `__str__` da transação) vêm no mesmo SELECT.
+    list_select_related = ('buyer', 'project')
+    list_filter = ('timestamp', 'status', ('project', AutocompleteFilter), ('buyer', AutocompleteFilter))
     search_fields = ('id__iexact', 'buyer__email', 'project__name')
-    ordering = ('-timestamp',)
+    # Usa o índice tx_timestamp_idx; a pk desempata o cursor.
+    cursor_ordering = ('-timestamp', '-id')
     
     # Torna todos os campos somente leitura no painel de detalhes,
     # pois uma transação não deve ser alterada após a criação.
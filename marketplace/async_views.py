@@ -0,0 +1,87 @@
+"""
+Views assíncronas (ASGI nativas) do marketplace.
+
+- `public_transaction_list`: mesmo conteúdo e paginação de `PublicTransactionViewSet`,
+  usando o ORM assíncrono.
+- `live_feed`: Server-Sent Events com novas transações e mudanças de créditos
+  disponíveis (veja marketplace/live.py).
+"""
+import asyncio
+import json
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+
+from core.fast_serializers import FastListSerializer
+from projects.async_views import error_response, json_response
+from projects.pagination import AsyncEstimatedCountPagination
+from .live import broadcaster, live_feed_enabled
+from .models import Transaction
+from .serializers import PublicTransactionSerializer
+from .views import PublicTransactionViewSet
+
+
+async def public_transaction_list(request):
+    """Lista paginada de transações públicas (equivalente a GET /api/marketplace/public-transactions/)."""
+    fast = FastListSerializer.for_serializer(PublicTransactionSerializer)
+    queryset = fast.values(Transaction.objects.recent(settings.PUBLIC_TRANSACTION_FEED_DAYS))
+    try:
+        paginator = AsyncEstimatedCountPagination()
+        page = await paginator.apaginate_queryset(queryset, Request(request), public_transaction_list)
+    except APIException as exc:
+        return error_response(exc)
+
+    return json_response(paginator.get_paginated_data(fast.to_representation(page)))
+
+
+public_transaction_list.use_read_replica = True
+public_transaction_list.count_cache_key = PublicTransactionViewSet.count_cache_key
+
+
+def format_sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def live_feed(request):
+    """
+    Stream SSE do marketplace. Eventos:
+
+    - `transaction`: nova transação (mesmos campos do feed público + `project_id`).
+    - `credits`: `project_id` e `carbon_credits_available` atualizados.
+
+    `?project=<id>` limita o stream aos eventos de um projeto. Só roda sob ASGI: num
+    worker WSGI, cada conexão aberta prenderia uma thread até o cliente desconectar.
+    """
+    if not live_feed_enabled() or not isinstance(request, ASGIRequest):
+        return json_response({"detail": "Feed ao vivo indisponível."}, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    project_id = request.GET.get("project")
+
+    async def stream():
+        queue = broadcaster.subscribe()
+        try:
+            # Reconexão automática do EventSource após 5s em caso de queda.
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=settings.LIVE_FEED_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comentário SSE: mantém proxies e load balancers com a conexão aberta.
+                    yield ": keepalive\n\n"
+                    continue
+                data = message.get("data", {})
+                if project_id and data.get("project_id") != project_id:
+                    continue
+                yield format_sse(message.get("event", "message"), data)
+        finally:
+            broadcaster.unsubscribe(queue)
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Desliga o buffer do Nginx para que os eventos cheguem imediatamente.
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,125 @@
+"""
+Saldos de créditos por comprador e projeto (`CreditHolding`).
+
+Só transações APPROVED contam. `apply_status_change` ajusta o saldo na mesma
+transação da mudança de status (aprovação/rejeição pelo auditor), então a carteira
+do comprador é uma leitura indexada em vez de somar o histórico a cada requisição.
+`rebuild_holdings` recalcula tudo a partir das transações, em lotes de compradores;
+depois que partições de transações são arquivadas, ele se recusa a rodar.
+
+Os saldos são do histórico inteiro; o progresso da meta anual (`carbon_progress`)
+conta só as aprovações do período da meta.
+"""
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from users.models import CompradorRequirements
+from .models import CreditHolding, Transaction
+from .partitions import has_archived_transactions
+
+
+class ArchivedTransactionsError(Exception):
+    """As transações no banco não são mais o histórico completo (partições arquivadas)."""
+
+
+def apply_status_change(tx, previous_status):
+    """Soma (ou desfaz) a transação no saldo quando ela entra (ou sai) de APPROVED."""
+    sign = (tx.status == Transaction.Status.APPROVED) - (previous_status == Transaction.Status.APPROVED)
+    if not sign:
+        return
+    holding, _ = CreditHolding.objects.get_or_create(buyer_id=tx.buyer_id, project_id=tx.project_id)
+    # Incremento no banco: aprovações concorrentes do mesmo par não se sobrescrevem.
+    CreditHolding.objects.filter(pk=holding.pk).update(
+        credits=F("credits") + sign * tx.quantity,
+        total_spent=F("total_spent") + sign * tx.total_price,
+        updated_at=timezone.now(),
+    )
+
+
+def holdings_from_transactions(transactions):
+    rows = (
+        transactions.filter(status=Transaction.Status.APPROVED)
+        .order_by()
+        .values("buyer_id", "project_id")
+        .annotate(credits=Sum("quantity"), total_spent=Sum("total_price"))
+    )
+    return [CreditHolding(**row) for row in rows]
+
+
+def create_holdings(buyer_ids):
+    """Saldos de compradores que ainda não têm nenhum (ex.: criados em massa), sem apagar nada."""
+    return CreditHolding.objects.bulk_create(
+        holdings_from_transactions(Transaction.objects.filter(buyer_id__in=buyer_ids))
+    )
+
+
+def rebuild_holdings(batch_size=1000):
+    """
+    Recalcula os saldos a partir das transações aprovadas, `batch_size` compradores
+    por vez (cada lote é uma transação curta). Retorna o total de saldos gravados.
+
+    Aprovações que acontecem durante o lote de um comprador podem ficar de fora;
+    rode fora do horário de pico ou repita para os compradores afetados. Com partições
+    arquivadas, levanta ArchivedTransactionsError: recalcular apagaria os créditos das
+    compras arquivadas.
+    """
+    if has_archived_transactions():
+        raise ArchivedTransactionsError(
+            "Há partições de transações arquivadas: os saldos não podem ser recalculados a partir do banco."
+        )
+    total = 0
+    buyers = get_user_model().objects.order_by("pk").values_list("pk", flat=True)
+    last_pk = None
+    while True:
+        page = buyers if last_pk is None else buyers.filter(pk__gt=last_pk)
+        ids = list(page[:batch_size])
+        if not ids:
+            return total
+        last_pk = ids[-1]
+        with transaction.atomic():
+            CreditHolding.objects.filter(buyer_id__in=ids).delete()
+            holdings = create_holdings(ids)
+        total += len(holdings)
+
+
+def compensation_period(deadline):
+    """
+    Período da meta anual: os 12 meses que terminam no prazo de compensação
+    (inclusive). Retorna (início, fim) como datetimes, com o fim exclusivo.
+    """
+    try:
+        start = deadline.replace(year=deadline.year - 1)
+    except ValueError:  # 29 de fevereiro
+        start = deadline.replace(year=deadline.year - 1, day=28)
+    start += timedelta(days=1)
+    return (
+        timezone.make_aware(datetime.combine(start, time.min)),
+        timezone.make_aware(datetime.combine(deadline + timedelta(days=1), time.min)),
+    )
+
+
+def carbon_progress(user):
+    """
+    Meta anual de compensação do comprador e créditos aprovados no período da meta
+    (`compensation_period`). A soma percorre só as compras do comprador no período
+    (índice `buyer, -timestamp`, partições do período). Retorna None se o comprador
+    não cadastrou requisitos.
+    """
+    data = (
+        CompradorRequirements.objects.filter(user=user)
+        .values("annual_carbon_target", "compensation_deadline")
+        .first()
+    )
+    if data is None:
+        return None
+    start, end = compensation_period(data["compensation_deadline"])
+    credits_held = Transaction.objects.filter(
+        buyer=user, status=Transaction.Status.APPROVED, timestamp__gte=start, timestamp__lt=end,
+    ).aggregate(total=Sum("quantity"))["total"]
+    data["period_start"] = timezone.localdate(start)
+    data["credits_held"] = credits_held or 0
+    return data
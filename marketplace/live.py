@@ -0,0 +1,119 @@
+"""
+Feed ao vivo do marketplace (novas transações e créditos disponíveis).
+
+Cada mudança é publicada uma única vez num canal Redis pub/sub. Em cada processo
+ASGI, um único `LiveFeedBroadcaster` assina esse canal e repassa as mensagens para
+as filas em memória das conexões SSE abertas. Assim, milhares de clientes conectados
+custam uma publicação e uma assinatura por processo, e nenhuma consulta ao banco.
+
+Sem REDIS_URL configurada, a publicação é ignorada e o feed fica indisponível.
+"""
+import asyncio
+import json
+import logging
+
+from django.conf import settings
+from django.db import transaction
+
+from .serializers import PublicTransactionSerializer
+
+logger = logging.getLogger(__name__)
+
+_redis_client = None
+
+
+def live_feed_enabled():
+    return bool(settings.REDIS_URL)
+
+
+def _get_redis():
+    global _redis_client
+    if _redis_client is None:
+        import redis
+
+        _redis_client = redis.Redis.from_url(settings.REDIS_URL)
+    return _redis_client
+
+
+def publish_event(event, data):
+    """Publica um evento no canal do feed. Falhas do Redis não quebram a requisição."""
+    if not live_feed_enabled():
+        return
+    message = json.dumps({"event": event, "data": data}, default=str)
+    try:
+        _get_redis().publish(settings.LIVE_FEED_CHANNEL, message)
+    except Exception:
+        logger.warning("Falha ao publicar evento '%s' no feed ao vivo.", event, exc_info=True)
+
+
+def publish_transaction_created(tx):
+    """Agenda, para depois do commit, a publicação de uma nova transação e dos créditos restantes."""
+    transaction_data = dict(PublicTransactionSerializer(tx).data, project_id=str(tx.project_id))
+    credits_data = {
+        "project_id": str(tx.project_id),
+        "carbon_credits_available": tx.project.carbon_credits_available,
+    }
+
+    def publish():
+        publish_event("transaction", transaction_data)
+        publish_event("credits", credits_data)
+
+    transaction.on_commit(publish)
+
+
+def publish_credits_changed(project):
+    """Agenda a publicação da nova disponibilidade de créditos de um projeto."""
+    data = {"project_id": str(project.pk), "carbon_credits_available": project.carbon_credits_available}
+    transaction.on_commit(lambda: publish_event("credits", data))
+
+
+class LiveFeedBroadcaster:
+    """Uma assinatura Redis por processo, repassada para as filas de cada conexão SSE."""
+
+    # Mensagens acumuladas por conexão lenta antes de começarmos a descartar as antigas.
+    QUEUE_SIZE = 100
+
+    def __init__(self):
+        self.queues = set()
+        self.task = None
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self.queues.add(queue)
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self._listen())
+        return queue
+
+    def unsubscribe(self, queue):
+        self.queues.discard(queue)
+
+    def _dispatch(self, message):
+        for queue in self.queues:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+    async def _listen(self):
+        import redis.asyncio as aioredis
+
+        while self.queues:
+            client = aioredis.from_url(settings.REDIS_URL)
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(settings.LIVE_FEED_CHANNEL)
+                async for raw in pubsub.listen():
+                    if not self.queues:
+                        break
+                    try:
+                        self._dispatch(json.loads(raw["data"]))
+                    except (TypeError, ValueError):
+                        logger.warning("Mensagem inválida no feed ao vivo: %r", raw)
+            except Exception:
+                logger.warning("Conexão com o Redis do feed ao vivo caiu; reconectando.", exc_info=True)
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+                await client.aclose()
+
+
+broadcaster = LiveFeedBroadcaster()
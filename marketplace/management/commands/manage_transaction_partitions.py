@@ -0,0 +1,78 @@
+import os
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from marketplace import partitions
+
+
+class Command(BaseCommand):
+    """
+    Manutenção das partições mensais da tabela de transações (somente Postgres).
+
+    Como usar (ex.: diariamente via cron):
+    - Criar partições futuras: `python manage.py manage_transaction_partitions`
+    - Arquivar e remover meses antigos:
+      `python manage.py manage_transaction_partitions --archive-older-than 24 --archive-dir /backups/transactions`
+
+    Uma partição só é removida depois que o arquivo exportado for lido de volta e tiver
+    o mesmo número de linhas da partição. Cada remoção fica registrada em
+    `ArchivedTransactionPartition`, que as reconstruções do catálogo e dos saldos
+    consultam antes de recalcular a partir das transações.
+    """
+    help = "Cria partições mensais futuras de transações e arquiva as antigas."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=settings.TRANSACTION_PARTITIONS_AHEAD,
+            help="Quantos meses à frente devem ter partição criada.",
+        )
+        parser.add_argument(
+            "--archive-older-than",
+            type=int,
+            default=None,
+            help="Arquiva (exporta e remove) partições de meses anteriores a N meses atrás.",
+        )
+        parser.add_argument("--archive-dir", default="archive/transactions", help="Diretório dos arquivos exportados.")
+        parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="Formato do arquivo exportado.")
+        parser.add_argument("--dry-run", action="store_true", help="Só lista as partições que seriam arquivadas.")
+
+    def handle(self, *args, **options):
+        if not partitions.is_partitioned():
+            raise CommandError("A tabela de transações não está particionada (requer Postgres e a migração 0005).")
+
+        created = partitions.ensure_future_partitions(options["months_ahead"])
+        for name in created:
+            self.stdout.write(f"  -> partição criada: {name}")
+        self.stdout.write(self.style.SUCCESS(f"{len(created)} partições criadas."))
+
+        if options["archive_older_than"] is not None:
+            self.archive(options)
+
+    def archive(self, options):
+        cutoff = partitions.add_months(partitions.month_start(date.today()), -options["archive_older_than"])
+        old_partitions = [(name, month) for name, month in partitions.list_partitions() if month < cutoff]
+        if not old_partitions:
+            self.stdout.write("Nenhuma partição para arquivar.")
+            return
+
+        extension = "parquet" if options["format"] == "parquet" else "csv.gz"
+        for name, month in old_partitions:
+            expected = partitions.partition_row_count(name)
+            if options["dry_run"]:
+                self.stdout.write(f"  -> {name}: {expected} linhas seriam arquivadas.")
+                continue
+
+            path = os.path.join(options["archive_dir"], f"{name}.{extension}")
+            exported = partitions.export_partition(name, path, file_format=options["format"])
+            if exported != expected:
+                raise CommandError(
+                    f"Exportação de {name} incompleta ({exported} de {expected} linhas); partição mantida."
+                )
+            partitions.drop_partition(name, month, exported, path)
+            self.stdout.write(f"  -> {name}: {exported} linhas arquivadas em {path}.")
+
+        self.stdout.write(self.style.SUCCESS("Arquivamento concluído."))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from marketplace.holdings import ArchivedTransactionsError, rebuild_holdings
+
+
+class Command(BaseCommand):
+    """
+    Recalcula os saldos de créditos (CreditHolding) a partir das transações aprovadas.
+
+    Como usar: `python manage.py rebuild_credit_holdings --batch-size 1000`
+
+    Necessário após cargas em massa ou correções diretas de transações, que não passam
+    pela aprovação/rejeição (veja marketplace/holdings.py).
+    Recusa-se a rodar depois que partições de transações foram arquivadas.
+    """
+    help = "Reconstrói os saldos de créditos por comprador e projeto."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Compradores recalculados por transação.")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] <= 0:
+            raise CommandError("--batch-size deve ser positivo.")
+        try:
+            total = rebuild_holdings(batch_size=options["batch_size"])
+        except ArchivedTransactionsError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(f"Saldos reconstruídos: {total} registros."))
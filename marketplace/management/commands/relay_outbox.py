@@ -0,0 +1,56 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from marketplace.models import OutboxEvent
+from marketplace.outbox import PUBLISHERS, relay_batch
+
+
+class Command(BaseCommand):
+    """
+    Drena o outbox transacional para o Redis Streams ou o Celery.
+
+    Como usar:
+    - Rodar continuamente (worker): `python manage.py relay_outbox --backend redis`
+    - Drenar o que estiver pendente e sair: `python manage.py relay_outbox --once`
+    """
+    help = "Publica em lotes os eventos pendentes do outbox transacional."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backend", choices=sorted(PUBLISHERS), default="redis", help="Destino dos eventos.")
+        parser.add_argument("--batch-size", type=int, default=200, help="Eventos por lote.")
+        parser.add_argument("--interval", type=float, default=1.0, help="Espera (s) quando não há eventos pendentes.")
+        parser.add_argument("--once", action="store_true", help="Drena os eventos pendentes e encerra.")
+        parser.add_argument(
+            "--purge-published-days",
+            type=int,
+            default=None,
+            help="Apaga eventos já publicados há mais de N dias antes de começar.",
+        )
+
+    def handle(self, *args, **options):
+        if options["purge_published_days"] is not None:
+            cutoff = timezone.now() - timedelta(days=options["purge_published_days"])
+            count, _ = OutboxEvent.objects.filter(published_at__lt=cutoff).delete()
+            self.stdout.write(self.style.SUCCESS(f"{count} eventos publicados removidos."))
+
+        publisher = PUBLISHERS[options["backend"]]()
+        self.stdout.write(self.style.SUCCESS(f"Relay do outbox iniciado (backend: {options['backend']})."))
+
+        total = 0
+        try:
+            while True:
+                published = relay_batch(publisher, batch_size=options["batch_size"])
+                total += published
+                if published:
+                    self.stdout.write(f"  -> {published} eventos publicados (total: {total}).")
+                if published < options["batch_size"]:
+                    if options["once"]:
+                        break
+                    time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f"Relay encerrado. {total} eventos publicados."))
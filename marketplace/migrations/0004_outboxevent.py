@@ -0,0 +1,72 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:26
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("marketplace", "0003_transaction_status_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEvent",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "aggregate_type",
+                    models.CharField(max_length=100, verbose_name="Tipo do agregado"),
+                ),
+                (
+                    "aggregate_id",
+                    models.CharField(max_length=64, verbose_name="ID do agregado"),
+                ),
+                (
+                    "event_type",
+                    models.CharField(max_length=100, verbose_name="Tipo do evento"),
+                ),
+                (
+                    "payload",
+                    models.JSONField(
+                        default=dict,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        verbose_name="Dados do evento",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Criado em"),
+                ),
+                (
+                    "published_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Publicado em"
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Tentativas de publicação"
+                    ),
+                ),
+                (
+                    "last_error",
+                    models.TextField(blank=True, verbose_name="Último erro"),
+                ),
+            ],
+            options={
+                "verbose_name": "Evento (outbox)",
+                "verbose_name_plural": "Eventos (outbox)",
+                "ordering": ["id"],
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("published_at__isnull", True)),
+                        fields=["id"],
+                        name="outbox_pending_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,112 @@
+"""
+Converte `marketplace_transaction` numa tabela particionada por mês em `timestamp`.
+
+Só age no Postgres; nos demais bancos (ex.: SQLite em testes) é um no-op.
+Tabelas particionadas exigem que a chave primária inclua a coluna de partição, então
+a PK física passa a ser (id, timestamp). Para o Django, `id` continua sendo a PK: os
+UUIDs são gerados pela aplicação e seguem únicos na prática.
+
+Em bases grandes, rode esta migração numa janela de manutenção: os dados são copiados
+para a nova tabela dentro de uma única transação.
+"""
+from datetime import date
+
+from django.db import migrations
+
+TABLE = "marketplace_transaction"
+LEGACY = f"{TABLE}_legacy"
+DEFAULT_PARTITION = f"{TABLE}_default"
+MONTHS_AHEAD = 3
+
+
+def add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_partitions(cursor, source_table):
+    cursor.execute(f'SELECT min("timestamp") FROM {source_table}')
+    oldest = cursor.fetchone()[0]
+    today = date.today()
+    first = date(oldest.year, oldest.month, 1) if oldest else date(today.year, today.month, 1)
+    last = add_months(date(today.year, today.month, 1), MONTHS_AHEAD)
+    month = first
+    while month <= last:
+        yield month
+        month = add_months(month, 1)
+
+
+def saved_indexes_and_fks(cursor, table):
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname NOT LIKE %s",
+        [table, "%_pkey"],
+    )
+    indexes = [row[0] for row in cursor.fetchall()]
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+        [table],
+    )
+    fks = cursor.fetchall()
+    return indexes, fks
+
+
+def partition_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        indexes, fks = saved_indexes_and_fks(cursor, TABLE)
+
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY}")
+        cursor.execute(
+            f"CREATE TABLE {TABLE} (LIKE {LEGACY} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            'PARTITION BY RANGE ("timestamp")'
+        )
+        cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey_ts PRIMARY KEY (id, "timestamp")')
+        cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT")
+        for month in month_partitions(cursor, LEGACY):
+            cursor.execute(
+                f"CREATE TABLE {TABLE}_p{month:%Y%m} PARTITION OF {TABLE} FOR VALUES FROM (%s) TO (%s)",
+                [month.isoformat(), add_months(month, 1).isoformat()],
+            )
+
+        cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {LEGACY}")
+        cursor.execute(f"DROP TABLE {LEGACY}")
+
+        # Recria índices e FKs com os mesmos nomes, para que migrações futuras os encontrem.
+        for indexdef in indexes:
+            cursor.execute(indexdef)
+        for name, definition in fks:
+            cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}")
+
+
+def unpartition_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        indexes, fks = saved_indexes_and_fks(cursor, TABLE)
+
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY}")
+        cursor.execute(f"CREATE TABLE {TABLE} (LIKE {LEGACY} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id)")
+        cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {LEGACY}")
+        cursor.execute(f"DROP TABLE {LEGACY} CASCADE")
+
+        for indexdef in indexes:
+            cursor.execute(indexdef.replace(" ON ONLY ", " ON "))
+        for name, definition in fks:
+            cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}")
+
+
+class Migration(migrations.Migration):
+    # Cada passo precisa ver o anterior (rename, create, copy); tudo numa transação.
+    atomic = True
+
+    dependencies = [
+        ("marketplace", "0004_outboxevent"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_table, unpartition_table),
+    ]
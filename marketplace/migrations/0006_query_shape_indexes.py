@@ -0,0 +1,46 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("marketplace", "0005_partition_transaction_by_month"),
+        ("projects", "0006_query_shape_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="transaction",
+            name="marketplace_buyer_i_e20c48_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="transaction",
+            name="marketplace_project_02ea65_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="transaction",
+            name="marketplace_status_75e8b7_idx",
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["buyer", "-timestamp"], name="tx_buyer_timestamp_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(fields=["-timestamp"], name="tx_timestamp_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                condition=models.Q(("status", "PENDING")),
+                fields=["-timestamp"],
+                name="tx_pending_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.0.6 on 2026-10-19 12:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_holdings(apps, schema_editor):
+    Transaction = apps.get_model("marketplace", "Transaction")
+    CreditHolding = apps.get_model("marketplace", "CreditHolding")
+    rows = (
+        Transaction.objects.filter(status="APPROVED")
+        .order_by()
+        .values("buyer_id", "project_id")
+        .annotate(credits=Sum("quantity"), total_spent=Sum("total_price"))
+    )
+    CreditHolding.objects.bulk_create((CreditHolding(**row) for row in rows.iterator()), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("marketplace", "0006_query_shape_indexes"),
+        ("projects", "0008_project_deleted_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CreditHolding",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "credits",
+                    models.PositiveIntegerField(default=0, verbose_name="Créditos"),
+                ),
+                (
+                    "total_spent",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Total investido",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Atualizado em"),
+                ),
+                (
+                    "buyer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="credit_holdings",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Comprador",
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="credit_holdings",
+                        to="projects.project",
+                        verbose_name="Projeto",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Saldo de créditos",
+                "verbose_name_plural": "Saldos de créditos",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="creditholding",
+            constraint=models.UniqueConstraint(
+                fields=("buyer", "project"), name="holding_buyer_project_uniq"
+            ),
+        ),
+        migrations.RunPython(backfill_holdings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.0.6 on 2026-10-19 12:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("marketplace", "0007_credit_holding"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedTransactionPartition",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        max_length=100, unique=True, verbose_name="Partição"
+                    ),
+                ),
+                ("month", models.DateField(verbose_name="Mês")),
+                (
+                    "row_count",
+                    models.PositiveIntegerField(verbose_name="Linhas arquivadas"),
+                ),
+                (
+                    "path",
+                    models.CharField(max_length=500, verbose_name="Arquivo exportado"),
+                ),
+                (
+                    "archived_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Arquivada em"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Partição arquivada",
+                "verbose_name_plural": "Partições arquivadas",
+                "ordering": ["month"],
+            },
+        ),
+    ]
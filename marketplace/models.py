@@ -1,6 +1,19 @@
 import uuid
+from datetime import timedelta
 from django.db import models
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+
+class TransactionQuerySet(models.QuerySet):
+    def recent(self, days):
+        """
+        Transações dos últimos `days` dias. No Postgres a tabela é particionada por mês
+        em `timestamp`, então o filtro faz o planner ler só as partições recentes.
+        """
+        return self.filter(timestamp__gte=timezone.now() - timedelta(days=days))
+
 
 class Transaction(models.Model):
     class Status(models.TextChoices):
@@ -17,16 +30,111 @@ class Transaction(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True, verbose_name="Data da Transação")
     status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING, verbose_name="Status da Transação")
 
+    objects = TransactionQuerySet.as_manager()
+
+    # Status lido do banco (ou gravado por último). Os sinais do catálogo comparam com
+    # ele para aplicar só a diferença de uma mudança de status (projects/catalog.py).
+    _loaded_status = None
 
     class Meta:
         verbose_name = "Transação"
         verbose_name_plural = "Transações"
         ordering = ["-timestamp"]
         indexes = [
-            models.Index(fields=['buyer']),
-            models.Index(fields=['project']),
-            models.Index(fields=['status']),
+            # "Minhas transações" (`buyer=? ORDER BY -timestamp`) e feed público (`ORDER BY -timestamp`).
+            models.Index(fields=['buyer', '-timestamp'], name='tx_buyer_timestamp_idx'),
+            models.Index(fields=['-timestamp'], name='tx_timestamp_idx'),
+            # Fila de auditoria: só as pendentes, uma fração pequena da tabela.
+            models.Index(fields=['-timestamp'], condition=models.Q(status='PENDING'), name='tx_pending_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_status = self.status
+
+    def __str__(self):
+        return f"Transação {self.id} - {self.buyer.email} comprou {self.quantity} créditos de {self.project.name} por {self.total_price} em {self.timestamp.strftime('%Y-%m-%d %H:%M:%S')}"
+
+
+class CreditHolding(models.Model):
+    """
+    Créditos aprovados de um comprador em um projeto (modelo de leitura).
+
+    Atualizado na aprovação/rejeição de transações (veja marketplace/holdings.py);
+    cargas em massa devem ser seguidas de `rebuild_credit_holdings`.
+    """
+    buyer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="credit_holdings", verbose_name="Comprador")
+    project = models.ForeignKey("projects.Project", on_delete=models.CASCADE, related_name="credit_holdings", verbose_name="Projeto")
+    credits = models.PositiveIntegerField(default=0, verbose_name="Créditos")
+    total_spent = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name="Total investido")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
+
+    class Meta:
+        verbose_name = "Saldo de créditos"
+        verbose_name_plural = "Saldos de créditos"
+        constraints = [
+            # Também é o índice das leituras por comprador (`buyer` é a primeira coluna).
+            models.UniqueConstraint(fields=["buyer", "project"], name="holding_buyer_project_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.buyer_id} - {self.project_id}: {self.credits} créditos"
+
+
+class OutboxEvent(models.Model):
+    """
+    Evento de domínio gravado na mesma transação da mudança que o originou.
+
+    O comando `relay_outbox` drena os eventos pendentes (em ordem de `id`) para o
+    Redis Streams ou o Celery e marca `published_at`. A entrega é "pelo menos uma vez":
+    consumidores devem usar o `id` do evento como chave de idempotência.
+    """
+    id = models.BigAutoField(primary_key=True)
+    aggregate_type = models.CharField(max_length=100, verbose_name="Tipo do agregado")
+    aggregate_id = models.CharField(max_length=64, verbose_name="ID do agregado")
+    event_type = models.CharField(max_length=100, verbose_name="Tipo do evento")
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder, verbose_name="Dados do evento")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
+    published_at = models.DateTimeField(null=True, blank=True, verbose_name="Publicado em")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Tentativas de publicação")
+    last_error = models.TextField(blank=True, verbose_name="Último erro")
+
+    class Meta:
+        verbose_name = "Evento (outbox)"
+        verbose_name_plural = "Eventos (outbox)"
+        ordering = ["id"]
+        indexes = [
+            # O relay só lê eventos pendentes; o índice parcial fica pequeno mesmo com histórico grande.
+            models.Index(fields=["id"], condition=models.Q(published_at__isnull=True), name="outbox_pending_idx"),
         ]
 
     def __str__(self):
-        return f"Transação {self.id} - {self.buyer.email} comprou {self.quantity} créditos de {self.project.name} por {self.total_price} em {self.timestamp.strftime('%Y-%m-%d %H:%M:%S')}"
\ No newline at end of file
+        return f"{self.event_type} ({self.aggregate_type} {self.aggregate_id})"
+
+
+class ArchivedTransactionPartition(models.Model):
+    """
+    Partição mensal de transações exportada e removida por `manage_transaction_partitions`.
+
+    As linhas arquivadas não estão mais no banco: reconstruções a partir das
+    transações (catálogo, saldos) consultam esta tabela para não subcontar.
+    """
+    name = models.CharField(max_length=100, unique=True, verbose_name="Partição")
+    month = models.DateField(verbose_name="Mês")
+    row_count = models.PositiveIntegerField(verbose_name="Linhas arquivadas")
+    path = models.CharField(max_length=500, verbose_name="Arquivo exportado")
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="Arquivada em")
+
+    class Meta:
+        verbose_name = "Partição arquivada"
+        verbose_name_plural = "Partições arquivadas"
+        ordering = ["month"]
+
+    def __str__(self):
+        return f"{self.name} ({self.row_count} linhas)"
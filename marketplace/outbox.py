@@ -0,0 +1,152 @@
+"""
+Outbox transacional dos eventos de domínio.
+
+`record_event` grava o evento na mesma transação da mudança de estado: se a
+transação for desfeita, o evento some junto; se for confirmada, o evento será
+publicado em algum momento pelo relay (`python manage.py relay_outbox`), fora do
+caminho da requisição.
+"""
+import json
+import logging
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+
+def record_event(event_type, instance, payload=None):
+    """Registra um evento para `instance`. Deve ser chamado dentro de `transaction.atomic`."""
+    return OutboxEvent.objects.create(
+        aggregate_type=instance._meta.label,
+        aggregate_id=str(instance.pk),
+        event_type=event_type,
+        payload=payload or {},
+    )
+
+
+def record_events(event_type, instances, payload_func):
+    """Versão em lote de `record_event` (um INSERT para todos os eventos)."""
+    return OutboxEvent.objects.bulk_create([
+        OutboxEvent(
+            aggregate_type=instance._meta.label,
+            aggregate_id=str(instance.pk),
+            event_type=event_type,
+            payload=payload_func(instance),
+        )
+        for instance in instances
+    ])
+
+
+def transaction_payload(tx):
+    return {
+        "id": tx.pk,
+        "buyer_id": tx.buyer_id,
+        "project_id": tx.project_id,
+        "quantity": tx.quantity,
+        "price_per_credit_at_purchase": tx.price_per_credit_at_purchase,
+        "total_price": tx.total_price,
+        "status": tx.status,
+    }
+
+
+def project_payload(project):
+    return {
+        "id": project.pk,
+        "ofertante_id": project.ofertante_id,
+        "status": project.status,
+        "carbon_credits_available": project.carbon_credits_available,
+        "price_per_credit": project.price_per_credit,
+    }
+
+
+def event_message(event):
+    return {
+        "event_id": event.pk,
+        "event_type": event.event_type,
+        "aggregate_type": event.aggregate_type,
+        "aggregate_id": event.aggregate_id,
+        "created_at": event.created_at.isoformat(),
+        "payload": event.payload,
+    }
+
+
+# ----------------------------------------------------------------------
+# Publicadores usados pelo relay
+# ----------------------------------------------------------------------
+class RedisStreamPublisher:
+    """Adiciona cada evento ao stream OUTBOX_REDIS_STREAM (XADD)."""
+
+    def __init__(self):
+        import redis
+
+        self.client = redis.Redis.from_url(settings.REDIS_URL)
+        self.stream = settings.OUTBOX_REDIS_STREAM
+
+    def publish(self, events):
+        pipe = self.client.pipeline(transaction=False)
+        for event in events:
+            fields = {"event_id": event.pk, "event_type": event.event_type,
+                      "data": json.dumps(event_message(event), cls=DjangoJSONEncoder)}
+            pipe.xadd(self.stream, fields, maxlen=settings.OUTBOX_REDIS_STREAM_MAXLEN, approximate=True)
+        pipe.execute()
+
+
+class CeleryPublisher:
+    """Envia cada evento como uma task Celery (OUTBOX_CELERY_TASK)."""
+
+    def __init__(self):
+        from celery import Celery
+
+        self.app = Celery(broker=settings.OUTBOX_CELERY_BROKER_URL)
+        self.task_name = settings.OUTBOX_CELERY_TASK
+
+    def publish(self, events):
+        for event in events:
+            message = json.loads(json.dumps(event_message(event), cls=DjangoJSONEncoder))
+            self.app.send_task(self.task_name, args=[message], task_id=f"outbox-{event.pk}")
+
+
+PUBLISHERS = {
+    "redis": RedisStreamPublisher,
+    "celery": CeleryPublisher,
+}
+
+
+def relay_batch(publisher, batch_size=100):
+    """
+    Publica o próximo lote de eventos pendentes e retorna quantos foram publicados.
+
+    As linhas ficam travadas (`FOR UPDATE SKIP LOCKED`) enquanto o lote é publicado,
+    então vários relays podem rodar em paralelo sem publicar o mesmo evento. Se a
+    publicação falhar, os eventos continuam pendentes (com a falha registrada) e o
+    lote será tentado de novo.
+    """
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(published_at__isnull=True)
+            .order_by("id")[:batch_size]
+        )
+        if not events:
+            return 0
+
+        event_ids = [event.pk for event in events]
+        try:
+            publisher.publish(events)
+        except Exception as exc:
+            logger.warning("Falha ao publicar %d eventos do outbox.", len(events), exc_info=True)
+            OutboxEvent.objects.filter(pk__in=event_ids).update(
+                attempts=F("attempts") + 1, last_error=str(exc)[:2000]
+            )
+            return 0
+
+        OutboxEvent.objects.filter(pk__in=event_ids).update(
+            published_at=timezone.now(), attempts=F("attempts") + 1, last_error=""
+        )
+    return len(events)
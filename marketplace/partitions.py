@@ -0,0 +1,161 @@
+"""
+Particionamento mensal da tabela de transações (somente Postgres).
+
+A tabela `marketplace_transaction` é particionada por faixa (RANGE) em `timestamp`,
+com uma partição por mês (`marketplace_transaction_pAAAAMM`) e uma partição
+`_default` para linhas fora das faixas criadas. A migração 0005 converte a tabela;
+o comando `manage_transaction_partitions` cria partições futuras e arquiva as antigas.
+"""
+import csv
+import gzip
+import io
+import os
+from datetime import date
+
+from django.db import connection, transaction
+
+from .models import ArchivedTransactionPartition, Transaction
+
+TABLE = Transaction._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"{TABLE}_p{month:%Y%m}"
+
+
+def is_partitioned():
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass", [TABLE])
+        return cursor.fetchone() is not None
+
+
+def list_partitions():
+    """Retorna [(nome, mês inicial)] das partições mensais existentes, em ordem."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            ORDER BY child.relname
+            """,
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    prefix = f"{TABLE}_p"
+    partitions = []
+    for name in names:
+        if name.startswith(prefix):
+            suffix = name[len(prefix):]
+            partitions.append((name, date(int(suffix[:4]), int(suffix[4:6]), 1)))
+    return partitions
+
+
+@transaction.atomic
+def create_month_partition(month):
+    """
+    Cria a partição do mês (se não existir). Linhas desse mês que tenham caído na
+    partição default são movidas para a nova partição.
+    """
+    name = partition_name(month)
+    start, end = month, add_months(month, 1)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s)", [name])
+        if cursor.fetchone()[0] is not None:
+            return False
+
+        cursor.execute(
+            f'SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE "timestamp" >= %s AND "timestamp" < %s)',
+            [start, end],
+        )
+        has_stray_rows = cursor.fetchone()[0]
+
+        if has_stray_rows:
+            # O Postgres não permite criar a partição enquanto a default tiver linhas
+            # da mesma faixa: desanexa a default, move as linhas e a reanexa.
+            cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT_PARTITION}")
+        cursor.execute(
+            f"CREATE TABLE {name} PARTITION OF {TABLE} FOR VALUES FROM (%s) TO (%s)",
+            [start.isoformat(), end.isoformat()],
+        )
+        if has_stray_rows:
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE "timestamp" >= %s AND "timestamp" < %s '
+                f"RETURNING *) INSERT INTO {TABLE} SELECT * FROM moved",
+                [start, end],
+            )
+            cursor.execute(f"ALTER TABLE {TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT")
+    return True
+
+
+def ensure_future_partitions(months_ahead, today=None):
+    """Garante partições do mês atual até `months_ahead` meses à frente. Retorna as criadas."""
+    current = month_start(today or date.today())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if create_month_partition(month):
+            created.append(partition_name(month))
+    return created
+
+
+def export_partition(name, path, file_format="csv"):
+    """
+    Exporta uma partição para `path` (CSV gzip ou Parquet) e retorna o número de
+    linhas gravadas, lido de volta do arquivo para conferência.
+
+    Os dados saem com `COPY ... TO STDOUT`, sem passar as linhas pelo ORM.
+    """
+    sql = f'COPY (SELECT * FROM {name} ORDER BY "timestamp") TO STDOUT WITH (FORMAT csv, HEADER)'
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    if file_format == "parquet":
+        import pyarrow.csv as pa_csv
+        import pyarrow.parquet as pq
+
+        buffer = io.BytesIO()
+        with connection.cursor() as cursor:
+            cursor.copy_expert(sql, buffer)
+        buffer.seek(0)
+        pq.write_table(pa_csv.read_csv(buffer), path, compression="zstd")
+        return pq.ParquetFile(path).metadata.num_rows
+
+    with gzip.open(path, "wt", newline="") as target, connection.cursor() as cursor:
+        cursor.copy_expert(sql, target)
+    with gzip.open(path, "rt", newline="") as source:
+        return sum(1 for _ in csv.reader(source)) - 1
+
+
+@transaction.atomic
+def drop_partition(name, month, row_count, path):
+    """Remove a partição e registra o arquivamento (veja `has_archived_transactions`)."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {name}")
+        cursor.execute(f"DROP TABLE {name}")
+    ArchivedTransactionPartition.objects.create(name=name, month=month, row_count=row_count, path=path)
+
+
+def has_archived_transactions():
+    """Se alguma partição já foi arquivada: as transações no banco não são mais o histórico completo."""
+    return ArchivedTransactionPartition.objects.exists()
+
+
+def partition_row_count(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) FROM {name}")
+        return cursor.fetchone()[0]
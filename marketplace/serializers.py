@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Transaction
+from .models import CreditHolding, Transaction
 
 class TransactionSerializer(serializers.ModelSerializer):
     """
@@ -64,3 +64,23 @@ class PublicTransactionSerializer(serializers.ModelSerializer):
             'total_price',
             'timestamp'
         ]
+
+
+class CreditHoldingSerializer(serializers.ModelSerializer):
+    """Créditos aprovados do comprador em um projeto."""
+    project_name = serializers.CharField(source='project.name', read_only=True)
+
+    class Meta:
+        model = CreditHolding
+        fields = ['project', 'project_name', 'credits', 'total_spent', 'updated_at']
+
+
+class CarbonProgressSerializer(serializers.Serializer):
+    """Progresso do comprador em relação à meta anual de compensação."""
+    annual_carbon_target = serializers.IntegerField()
+    compensation_deadline = serializers.DateField()
+    period_start = serializers.DateField(help_text="Início do período da meta (12 meses até o prazo).")
+    credits_held = serializers.IntegerField(help_text="Créditos aprovados no período da meta.")
+    credits_remaining = serializers.IntegerField()
+    progress = serializers.FloatField(help_text="Percentual da meta já coberto (pode passar de 100).")
+    days_remaining = serializers.IntegerField()
@@ -1,3 +1,347 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from projects.models import Project
+from users.models import BaseUser, CompradorRequirements
+from .models import ArchivedTransactionPartition, CreditHolding, OutboxEvent, Transaction
+from .outbox import record_event, relay_batch
+from .views import TransactionAuditViewSet
+
+
+class MarketplaceTestCase(TestCase):
+    def setUp(self):
+        self.ofertante = BaseUser.objects.create_user(
+            email="ofertante@example.com", password="Test#123", user_type=BaseUser.UserType.OFERTANTE,
+        )
+        self.buyer = BaseUser.objects.create_user(
+            email="comprador@example.com", password="Test#123", user_type=BaseUser.UserType.COMPRADOR,
+        )
+        self.project = Project.objects.create(
+            ofertante=self.ofertante,
+            name="Projeto Ativo",
+            project_type=Project.ProjectType.REFLORESTAMENTO,
+            status=Project.Status.ACTIVE,
+            carbon_credits_available=100,
+            price_per_credit=10,
+        )
+
+    def create_transaction(self, quantity=5, **extra):
+        return Transaction.objects.create(
+            buyer=self.buyer,
+            project=self.project,
+            quantity=quantity,
+            price_per_credit_at_purchase=self.project.price_per_credit,
+            total_price=self.project.price_per_credit * quantity,
+            **extra,
+        )
+
+
+class AsyncPublicTransactionFeedTests(MarketplaceTestCase):
+    def test_async_feed_matches_sync_feed(self):
+        self.create_transaction(quantity=3)
+        self.create_transaction(quantity=7)
+
+        sync_res = self.client.get(reverse("marketplace:public-transaction-list"))
+        async_res = self.client.get(reverse("marketplace:public-transaction-async-list"))
+        self.assertEqual(async_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_res.json(), sync_res.json())
+        self.assertEqual(async_res.json()["count"], 2)
+
+    def test_feeds_only_show_recent_window(self):
+        recent = self.create_transaction()
+        old = self.create_transaction()
+        Transaction.objects.filter(pk=old.pk).update(timestamp=timezone.now() - timedelta(days=120))
+
+        with self.settings(PUBLIC_TRANSACTION_FEED_DAYS=90):
+            for name in ("marketplace:public-transaction-list", "marketplace:public-transaction-async-list"):
+                res = self.client.get(reverse(name))
+                self.assertEqual([item["id"] for item in res.json()["results"]], [str(recent.pk)])
+
+            res = self.client.get(reverse("marketplace:public-transaction-detail", kwargs={"pk": old.pk}))
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class LiveFeedTests(MarketplaceTestCase):
+    def test_purchase_publishes_transaction_and_credits_after_commit(self):
+        self.client.force_login(self.buyer)
+        with mock.patch("marketplace.live.publish_event") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                res = self.client.post(
+                    reverse("marketplace:transaction-list"),
+                    {"project": str(self.project.id), "quantity": 4},
+                )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        events = {call.args[0]: call.args[1] for call in publish.call_args_list}
+        self.assertEqual(events["transaction"]["quantity"], 4)
+        self.assertEqual(events["credits"], {"project_id": str(self.project.id), "carbon_credits_available": 96})
+
+    def test_live_feed_unavailable_without_redis(self):
+        with self.settings(REDIS_URL=""):
+            res = self.client.get(reverse("marketplace:live-feed"))
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    def test_live_feed_unavailable_under_wsgi(self):
+        # O Client de testes gera WSGIRequests, como um worker gthread.
+        with self.settings(REDIS_URL="redis://localhost:6379/0"):
+            res = self.client.get(reverse("marketplace:live-feed"))
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+class OutboxTests(MarketplaceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.auditor = BaseUser.objects.create_user(
+            email="auditor@example.com", password="Test#123", user_type=BaseUser.UserType.AUDITOR, is_staff=True,
+        )
+
+    def test_approve_records_event_in_same_transaction(self):
+        tx = self.create_transaction()
+        self.client.force_login(self.auditor)
+        res = self.client.post(reverse("marketplace:transaction-audit-approve", kwargs={"pk": tx.pk}))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        event = OutboxEvent.objects.get(event_type="transaction.approved")
+        self.assertEqual(event.aggregate_id, str(tx.pk))
+        self.assertEqual(event.payload["status"], Transaction.Status.APPROVED)
+        self.assertIsNone(event.published_at)
+
+    def test_relay_marks_events_published(self):
+        record_event("transaction.created", self.create_transaction(), {})
+        publisher = mock.Mock()
+
+        self.assertEqual(relay_batch(publisher), 1)
+        self.assertEqual(relay_batch(publisher), 0)
+        publisher.publish.assert_called_once()
+        self.assertFalse(OutboxEvent.objects.filter(published_at__isnull=True).exists())
+
+    def test_failed_publish_keeps_events_pending(self):
+        record_event("transaction.created", self.create_transaction(), {})
+        publisher = mock.Mock()
+        publisher.publish.side_effect = ConnectionError("redis fora do ar")
+
+        self.assertEqual(relay_batch(publisher), 0)
+        event = OutboxEvent.objects.get()
+        self.assertIsNone(event.published_at)
+        self.assertEqual(event.attempts, 1)
+        self.assertIn("redis fora do ar", event.last_error)
+
+
+class EstimatedCountPaginationTests(MarketplaceTestCase):
+    url = reverse_lazy("marketplace:public-transaction-list")
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        for _ in range(5):
+            self.create_transaction(quantity=1)
+
+    def test_small_lists_get_exact_count(self):
+        res = self.client.get(self.url)
+        self.assertEqual(res.json()["count"], 5)
+        self.assertFalse(res.json()["count_is_estimate"])
+
+    @override_settings(PAGINATION_EXACT_COUNT_LIMIT=3)
+    def test_large_lists_use_planner_estimate(self):
+        with mock.patch("core.db.estimated_count", return_value=120_000) as estimate:
+            res = self.client.get(self.url, {"page_size": 2})
+        estimate.assert_called_once()
+        self.assertEqual(res.json()["count"], 120_000)
+        self.assertTrue(res.json()["count_is_estimate"])
+        self.assertEqual(len(res.json()["results"]), 2)
+
+    @override_settings(PAGINATION_EXACT_COUNT_LIMIT=3)
+    def test_pages_beyond_a_low_count_are_reachable(self):
+        for _ in range(20):
+            self.create_transaction(quantity=1)
+
+        first = self.client.get(self.url, {"page_size": 5}).json()
+        # A contagem parou no limite: total aproximado, mas nunca abaixo do já visto.
+        self.assertEqual(first["count"], 6)
+        self.assertTrue(first["count_is_estimate"])
+
+        res = self.client.get(self.url, {"page_size": 5, "page": 3})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(res.json()["results"]), 5)
+        self.assertIn("page=4", res.json()["next"])
+
+        last = self.client.get(self.url, {"page_size": 5, "page": 5}).json()
+        self.assertIsNone(last["next"])
+        self.assertEqual(last["count"], 25)
+        self.assertFalse(last["count_is_estimate"])
+        self.assertEqual(self.client.get(self.url, {"page_size": 5, "page": 6}).status_code, 404)
+
+    def test_unfiltered_list_uses_cached_exact_count(self):
+        call_command("refresh_list_counts", stdout=StringIO())
+        self.create_transaction(quantity=1)
+
+        self.assertEqual(self.client.get(self.url, {"page_size": 2}).json()["count"], 5)
+        async_res = self.client.get(reverse("marketplace:public-transaction-async-list"), {"page_size": 2})
+        self.assertEqual(async_res.json()["count"], 5)
+        # Com filtro ou busca, o total em cache não vale.
+        self.assertEqual(self.client.get(self.url, {"page_size": 2, "search": "x"}).json()["count"], 6)
+        # Na última página o total é exato, qualquer que seja o cache.
+        self.assertEqual(self.client.get(self.url).json()["count"], 6)
+
+
+class CreditHoldingTests(MarketplaceTestCase):
+    client_class = APIClient
+
+    def setUp(self):
+        super().setUp()
+        self.auditor = BaseUser.objects.create_superuser(email="auditor@example.com", password="Test#123")
+
+    def review(self, tx, decision):
+        self.client.force_login(self.auditor)
+        res = self.client.post(reverse(f"marketplace:transaction-audit-{decision}", kwargs={"pk": tx.pk}))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_approvals_accumulate_and_rejections_are_ignored(self):
+        self.review(self.create_transaction(quantity=5), "approve")
+        self.review(self.create_transaction(quantity=3), "approve")
+        self.review(self.create_transaction(quantity=7), "reject")
+
+        holding = CreditHolding.objects.get(buyer=self.buyer, project=self.project)
+        self.assertEqual(holding.credits, 8)
+        self.assertEqual(holding.total_spent, 80)
+
+        self.client.force_login(self.buyer)
+        res = self.client.get(reverse("marketplace:credit-holding-list"))
+        self.assertEqual(res.json()["results"], [{
+            "project": str(self.project.pk), "project_name": "Projeto Ativo", "credits": 8,
+            "total_spent": "80.00", "updated_at": res.json()["results"][0]["updated_at"],
+        }])
+
+    def test_review_locks_the_transaction(self):
+        self.assertTrue(TransactionAuditViewSet(action="approve").get_queryset().query.select_for_update)
+        self.assertTrue(TransactionAuditViewSet(action="reject").get_queryset().query.select_for_update)
+
+        tx = self.create_transaction(quantity=5)
+        self.client.force_login(self.auditor)
+        url = reverse("marketplace:transaction-audit-approve", kwargs={"pk": tx.pk})
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_200_OK)
+
+        # Uma segunda aprovação não soma os créditos de novo.
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(CreditHolding.objects.get(buyer=self.buyer).credits, 5)
+
+    def test_progress_counts_only_the_target_period(self):
+        deadline = timezone.localdate() + timedelta(days=30)
+        CompradorRequirements.objects.create(user=self.buyer, annual_carbon_target=40, compensation_deadline=deadline)
+        self.review(self.create_transaction(quantity=10), "approve")
+        # Compra aprovada do período anterior: continua na carteira, mas não na meta.
+        old = self.create_transaction(quantity=7)
+        self.review(old, "approve")
+        Transaction.objects.filter(pk=old.pk).update(timestamp=timezone.now() - timedelta(days=400))
+
+        self.client.force_authenticate(self.buyer)
+        with self.assertNumQueries(2):
+            res = self.client.get(reverse("marketplace:credit-holding-progress"))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["period_start"], str(deadline.replace(year=deadline.year - 1) + timedelta(days=1)))
+        self.assertEqual(res.json()["credits_held"], 10)
+        self.assertEqual(CreditHolding.objects.get(buyer=self.buyer).credits, 17)
+        self.assertEqual(res.json()["credits_remaining"], 30)
+        self.assertEqual(res.json()["progress"], 25.0)
+        self.assertEqual(res.json()["days_remaining"], 30)
+
+    def test_progress_without_requirements(self):
+        self.client.force_authenticate(self.buyer)
+        res = self.client.get(reverse("marketplace:credit-holding-progress"))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_rebuild_recomputes_from_transactions(self):
+        self.create_transaction(quantity=4, status=Transaction.Status.APPROVED)
+        self.create_transaction(quantity=6, status=Transaction.Status.APPROVED)
+        self.create_transaction(quantity=9, status=Transaction.Status.PENDING)
+        CreditHolding.objects.create(buyer=self.ofertante, project=self.project, credits=99)
+
+        call_command("rebuild_credit_holdings", "--batch-size", "1", stdout=StringIO())
+
+        self.assertEqual(
+            list(CreditHolding.objects.values_list("buyer_id", "credits")), [(self.buyer.pk, 10)],
+        )
+
+    def test_rebuild_refuses_after_archival(self):
+        holding = CreditHolding.objects.create(buyer=self.buyer, project=self.project, credits=12)
+        ArchivedTransactionPartition.objects.create(
+            name="marketplace_transaction_p202401", month="2024-01-01", row_count=3, path="/tmp/p202401.csv.gz",
+        )
+        with self.assertRaises(CommandError):
+            call_command("rebuild_credit_holdings", stdout=StringIO())
+        holding.refresh_from_db()
+        self.assertEqual(holding.credits, 12)
+
+
+# Os templates do admin usam {% static %}; o manifesto só existe após o collectstatic.
+@override_settings(STORAGES={
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+})
+class TransactionAdminTests(MarketplaceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = BaseUser.objects.create_superuser(email="admin@example.com", password="Test#123")
+        self.client.force_login(self.admin)
+        self.url = reverse("admin:marketplace_transaction_changelist")
+
+    def test_cursor_pagination_walks_every_row_once(self):
+        transactions = [self.create_transaction(quantity=1) for _ in range(5)]
+        # Timestamps empatados: a pk desempata o cursor.
+        Transaction.objects.update(timestamp=timezone.now())
+        expected = [str(pk) for pk in Transaction.objects.order_by("-timestamp", "-id").values_list("pk", flat=True)]
+
+        seen, params = [], {}
+        with mock.patch("marketplace.admin.TransactionAdmin.list_per_page", 2):
+            for _ in range(len(transactions)):
+                res = self.client.get(self.url, params)
+                self.assertEqual(res.status_code, 200)
+                cl = res.context["cl"]
+                seen += [str(t.pk) for t in cl.result_list]
+                self.assertEqual(cl.result_count, 5)
+                if not cl.next_cursor:
+                    break
+                params = {"cursor": cl.next_cursor}
+        self.assertEqual(seen, expected)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        def changelist_queries():
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(self.url).status_code, 200)
+            return len(queries)
+
+        self.create_transaction()
+        few = changelist_queries()
+        for _ in range(5):
+            self.create_transaction()
+        self.assertEqual(changelist_queries(), few)
+
+    def test_autocomplete_filter(self):
+        other = Project.objects.create(
+            ofertante=self.ofertante, name="Outro", project_type=Project.ProjectType.OUTRO,
+            status=Project.Status.ACTIVE, carbon_credits_available=10, price_per_credit=10,
+        )
+        self.create_transaction()
+        Transaction.objects.create(
+            buyer=self.buyer, project=other, quantity=1, price_per_credit_at_purchase=10, total_price=10,
+        )
+        res = self.client.get(self.url, {"project__id__exact": str(other.pk)})
+        self.assertEqual([t.project_id for t in res.context["cl"].result_list], [other.pk])
+        self.assertContains(res, "admin-autocomplete")
+        self.assertContains(res, "Outro")
+
+    def test_invalid_cursor_is_rejected(self):
+        res = self.client.get(self.url, {"cursor": "lixo"})
+        self.assertRedirects(res, f"{self.url}?e=1", fetch_redirect_response=False)
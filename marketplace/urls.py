@@ -1,5 +1,7 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import TransactionViewSet, PublicTransactionViewSet, TransactionAuditViewSet
+from .views import CreditHoldingViewSet, TransactionViewSet, PublicTransactionViewSet, TransactionAuditViewSet
+from .async_views import live_feed, public_transaction_list
 
 # Define o namespace para estas URLs, útil para referenciá-las em outras partes do projeto.
 app_name = 'marketplace'
@@ -18,5 +20,12 @@ router.register(r'public-transactions', PublicTransactionViewSet, basename='publ
 # Registra o TransactionAuditViewSet na rota 'transaction-audit'.
 router.register(r'transaction-audit', TransactionAuditViewSet, basename='transaction-audit')
 
-# As urlpatterns do app são as URLs geradas pelo router.
-urlpatterns = router.urls
+# Registra o CreditHoldingViewSet na rota 'holdings' (carteira e progresso da meta).
+router.register(r'holdings', CreditHoldingViewSet, basename='credit-holding')
+
+# As urlpatterns do app são as URLs geradas pelo router, mais as rotas
+# assíncronas (ASGI): feed público de transações e stream SSE ao vivo.
+urlpatterns = router.urls + [
+    path('async/public-transactions/', public_transaction_list, name='public-transaction-async-list'),
+    path('live/', live_feed, name='live-feed'),
+]
@@ -1,14 +1,26 @@
 from rest_framework import viewsets, permissions, status, mixins, serializers
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from django.conf import settings
 from django.db import transaction
-
-from .models import Transaction
-from .serializers import TransactionSerializer, PublicTransactionSerializer
+from django.utils import timezone
+from drf_spectacular.utils import extend_schema
+
+from .models import CreditHolding, Transaction
+from .serializers import (
+    CarbonProgressSerializer, CreditHoldingSerializer, PublicTransactionSerializer, TransactionSerializer,
+)
+from .holdings import apply_status_change, carbon_progress
+from .live import publish_transaction_created
+from .outbox import record_event, transaction_payload
+from core.fast_serializers import FastListMixin
+from core.throttling import PurchaseRateThrottle
 from projects.models import Project # Precisamos do modelo Project para pegar o preço
+from projects.pagination import EstimatedCountPagination
 from users.permissions import IsAuditor
 
-class TransactionViewSet(mixins.CreateModelMixin,
+class TransactionViewSet(FastListMixin,
+                         mixins.CreateModelMixin,
                          mixins.ListModelMixin,
                          viewsets.GenericViewSet):
     """
@@ -26,6 +38,12 @@ class TransactionViewSet(mixins.CreateModelMixin,
         """
         return Transaction.objects.filter(buyer=self.request.user).select_related('project', 'buyer')
 
+    def get_throttles(self):
+        # Só a compra disputa o lock do projeto; a listagem não é limitada.
+        if self.action == 'create':
+            return [PurchaseRateThrottle()]
+        return super().get_throttles()
+
     @transaction.atomic
     def perform_create(self, serializer):
         """
@@ -78,17 +96,35 @@ class TransactionViewSet(mixins.CreateModelMixin,
         project.carbon_credits_available = available - quantity
         project.save(update_fields=["carbon_credits_available", "updated_at"])
 
-        # 9. TODO: Adicionar lógica para creditar os créditos ao projeto/vendedor (se aplicável).
+        # 9. Registra o evento de domínio no outbox (mesma transação) e publica a
+        #    transação e os créditos restantes no feed ao vivo (após o commit).
+        record_event("transaction.created", serializer.instance, transaction_payload(serializer.instance))
+        publish_transaction_created(serializer.instance)
+
+        # 10. TODO: Adicionar lógica para creditar os créditos ao projeto/vendedor (se aplicável).
 
 
-class PublicTransactionViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicTransactionViewSet(FastListMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet para a visualização pública de transações.
     - GET: Lista todas as transações de forma anônima.
     """
-    queryset = Transaction.objects.all().select_related('project')
     serializer_class = PublicTransactionSerializer
     permission_classes = [permissions.AllowAny]
+    # Leituras (GET) podem ser atendidas por uma réplica; veja core/db_routers.py.
+    use_read_replica = True
+    # Total estimado em feeds grandes; sem filtros, o exato de `refresh_list_counts`.
+    pagination_class = EstimatedCountPagination
+    count_cache_key = "public-transactions"
+
+    def get_queryset(self):
+        queryset = Transaction.objects.select_related('project')
+        if self.action == 'list':
+            # A listagem mostra só a janela recente (PUBLIC_TRANSACTION_FEED_DAYS), o que
+            # a limita às partições mensais mais novas. O detalhe continua achando
+            # transações antigas pelo id (enquanto a partição não for arquivada).
+            queryset = queryset.recent(settings.PUBLIC_TRANSACTION_FEED_DAYS)
+        return queryset
 
 class TransactionAuditViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -99,29 +135,77 @@ class TransactionAuditViewSet(viewsets.ReadOnlyModelViewSet):
     """
     serializer_class = TransactionSerializer
     permission_classes = [permissions.IsAuthenticated, IsAuditor]
+    # A fila muda a cada compra e aprovação: sem contagem em cache, só a estimativa.
+    pagination_class = EstimatedCountPagination
 
     def get_queryset(self):
-        return Transaction.objects.filter(status=Transaction.Status.PENDING)
+        queryset = Transaction.objects.filter(status=Transaction.Status.PENDING)
+        if self.action in ("approve", "reject"):
+            # Trava a linha até o fim da transação: revisões simultâneas da mesma
+            # transação esperam uma pela outra, e a segunda já não a vê como pendente.
+            queryset = queryset.select_for_update()
+        return queryset
 
     @action(detail=True, methods=["post"])
+    @transaction.atomic
     def approve(self, request, pk=None):
         """Aprova uma transação pendente."""
         transaction = self.get_object()
-        if transaction.status != Transaction.Status.PENDING:
+        previous_status = transaction.status
+        if previous_status != Transaction.Status.PENDING:
             return Response({"detail": "Apenas transações pendentes podem ser aprovadas."}, status=status.HTTP_400_BAD_REQUEST)
         
         transaction.status = Transaction.Status.APPROVED
         transaction.save(update_fields=["status"])
+        apply_status_change(transaction, previous_status)
+        record_event("transaction.approved", transaction, transaction_payload(transaction))
         return Response(TransactionSerializer(transaction).data)
 
     @action(detail=True, methods=["post"])
+    @transaction.atomic
     def reject(self, request, pk=None):
         """Rejeita uma transação pendente."""
         transaction = self.get_object()
-        if transaction.status != Transaction.Status.PENDING:
+        previous_status = transaction.status
+        if previous_status != Transaction.Status.PENDING:
             return Response({"detail": "Apenas transações pendentes podem ser rejeitadas."}, status=status.HTTP_400_BAD_REQUEST)
 
         transaction.status = Transaction.Status.REJECTED
         transaction.save(update_fields=["status"])
+        apply_status_change(transaction, previous_status)
+        record_event("transaction.rejected", transaction, transaction_payload(transaction))
         # Opcional: Adicionar lógica para reverter a dedução de créditos do projeto
         return Response(TransactionSerializer(transaction).data)
+
+
+class CreditHoldingViewSet(FastListMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    Carteira de créditos do usuário logado.
+    - `list`: créditos aprovados por projeto (maiores saldos primeiro).
+    - `progress`: progresso em relação à meta anual de compensação (CompradorRequirements).
+    """
+    serializer_class = CreditHoldingSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return (
+            CreditHolding.objects.filter(buyer=self.request.user, credits__gt=0)
+            .select_related('project')
+            .order_by('-credits', 'project_id')
+        )
+
+    @extend_schema(responses=CarbonProgressSerializer)
+    @action(detail=False, methods=["get"])
+    def progress(self, request):
+        """Créditos aprovados no período da meta x meta anual."""
+        data = carbon_progress(request.user)
+        if data is None:
+            return Response(
+                {"detail": "Cadastre seus requisitos de compensação para acompanhar a meta."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        target = data["annual_carbon_target"]
+        data["credits_remaining"] = max(target - data["credits_held"], 0)
+        data["progress"] = round(100 * data["credits_held"] / target, 2) if target else 100.0
+        data["days_remaining"] = max((data["compensation_deadline"] - timezone.localdate()).days, 0)
+        return Response(CarbonProgressSerializer(data).data)
@@ -1,17 +1,28 @@
 from django.contrib import admin
+
+from core.admin_tools import AutocompleteFilter, ScalableAdminMixin
 from .models import Project, Document
 
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ("id", "name", "project_type", "status", "ofertante", "carbon_credits_available", "price_per_credit", "validated_by", "validated_at", "created_at")
-    list_filter = ("status", "project_type", "ofertante")
+    list_select_related = ("ofertante", "validated_by")
+    list_filter = ("status", "project_type", "is_deleted", ("ofertante", AutocompleteFilter))
     search_fields = ("name", "description", "location", "ofertante__email") # Permite buscar pelo email do ofertante
     autocomplete_fields = ("ofertante",)
+    cursor_ordering = ("-created_at", "-id")
+
+    def get_queryset(self, request):
+        # O admin também mostra os projetos deletados (soft delete).
+        return Project.all_objects.all()
 
 
 @admin.register(Document)
-class DocumentAdmin(admin.ModelAdmin):
+class DocumentAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ("id", "name", "project", "uploaded_at")
+    list_select_related = ("project",)
+    list_filter = (("project", AutocompleteFilter),)
     search_fields = ("name",)
-    autocomplete_fields = ("project",)
\ No newline at end of file
+    autocomplete_fields = ("project",)
+    cursor_ordering = ("-uploaded_at", "-id")
\ No newline at end of file
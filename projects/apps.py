@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ProjectsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "projects"
+
+    def ready(self):
+        # Registra os sinais que mantêm o catálogo (ProjectCatalogEntry) sincronizado.
+        from . import catalog  # noqa: F401
@@ -0,0 +1,110 @@
+"""
+Versões assíncronas (ASGI nativas) das rotas de leitura de projetos.
+
+Servem o mesmo conteúdo público de `ProjectViewSet` (projetos ativos), com os mesmos
+filtros, busca, ordenação e paginação, mas sem ocupar uma thread enquanto esperam o
+banco. Só fazem sentido rodando sob ASGI (SERVER_MODE=asgi); sob WSGI funcionam,
+mas sem ganho. Como não passam pela autenticação do DRF, expõem apenas projetos ativos.
+"""
+from django.db.models import Count, Max, Min
+from django.http import HttpResponse
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from core.fast_serializers import FastListSerializer
+from .models import Project
+from .pagination import AsyncResultsSetPagination
+from .serializers import ProjectCatalogSerializer, ProjectDetailSerializer
+from .views import ProjectViewSet
+
+
+def json_response(data, status_code=status.HTTP_200_OK):
+    # Mesmo renderer JSON das views síncronas (USE_ORJSON), para respostas idênticas.
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return HttpResponse(renderer.render(data), status=status_code, content_type="application/json")
+
+
+def error_response(exc):
+    return json_response(exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}, exc.status_code)
+
+
+def active_projects():
+    return (
+        Project.objects.filter(status=Project.Status.ACTIVE)
+        .select_related("ofertante__ofertante_profile")
+    )
+
+
+def filtered_projects(request):
+    """
+    Catálogo de projetos ativos com os mesmos filtros, busca e ordenação da listagem
+    síncrona (sem tocar no banco).
+    """
+    view = ProjectViewSet(request=Request(request), action="list", format_kwarg=None, args=(), kwargs={})
+    return view.filter_queryset(view.get_queryset()), view.request
+
+
+async def project_list(request):
+    """Lista paginada de projetos ativos (equivalente a GET /api/projects/)."""
+    try:
+        queryset, drf_request = filtered_projects(request)
+        fast = FastListSerializer.for_serializer(ProjectCatalogSerializer)
+        paginator = AsyncResultsSetPagination()
+        page = await paginator.apaginate_queryset(fast.values(queryset), drf_request)
+    except APIException as exc:
+        return error_response(exc)
+
+    data = fast.to_representation(page, {"request": request})
+    return json_response(paginator.get_paginated_data(data))
+
+
+async def project_detail(request, pk):
+    """Detalhes de um projeto ativo, com seus documentos."""
+    try:
+        project = await active_projects().prefetch_related("documents").aget(pk=pk)
+    except Project.DoesNotExist:
+        return json_response({"detail": "Não encontrado."}, status.HTTP_404_NOT_FOUND)
+
+    serializer = ProjectDetailSerializer(project, context={"request": request})
+    return json_response(serializer.data)
+
+
+async def project_facets(request):
+    """
+    Contagens por tipo de projeto e faixa de preço dos projetos ativos.
+
+    Respeita os mesmos filtros e busca da listagem, para que a interface mostre
+    quantos resultados cada opção de filtro traria.
+    """
+    try:
+        queryset, _ = filtered_projects(request)
+    except APIException as exc:
+        return error_response(exc)
+
+    labels = dict(Project.ProjectType.choices)
+    by_type = queryset.order_by().values("project_type").annotate(count=Count("pk"))
+    project_types = [
+        {"value": row["project_type"], "label": labels.get(row["project_type"], row["project_type"]), "count": row["count"]}
+        async for row in by_type.order_by("project_type")
+    ]
+    price = await queryset.order_by().aaggregate(
+        min=Min("price_per_credit"), max=Max("price_per_credit"), total=Count("pk")
+    )
+
+    # Decimais saem como string, no mesmo formato dos serializers.
+    price_field = serializers.DecimalField(max_digits=12, decimal_places=2)
+    return json_response({
+        "count": price.pop("total"),
+        "project_type": project_types,
+        "price_per_credit": {
+            key: price_field.to_representation(value) if value is not None else None
+            for key, value in price.items()
+        },
+    })
+
+
+# Leituras públicas: podem ir para uma réplica (veja core/db_routers.py).
+for _view in (project_list, project_detail, project_facets):
+    _view.use_read_replica = True
@@ -0,0 +1,137 @@
+"""
+Importação em lote de projetos de um Ofertante (CSV ou JSON, com imagens num zip).
+
+A posse é verificada uma vez para o lote inteiro (o usuário da requisição é o
+Ofertante dono de todos os projetos), em vez do `full_clean()` de `Project.save`, que
+busca o ofertante de novo a cada projeto. Cada linha passa pelas mesmas validações
+do `ProjectDetailSerializer` (uma única instância do serializer para o lote) e as
+válidas são inseridas com `bulk_create` em lotes de BATCH_SIZE, junto com as entradas
+do catálogo e os eventos do outbox, numa única transação. As linhas inválidas voltam
+no relatório sem interromper o lote.
+
+A coluna `image` referencia um arquivo dentro do zip enviado em `images`; URLs
+externas não são baixadas.
+"""
+import csv
+import io
+import json
+import zipfile
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from rest_framework import serializers
+
+from marketplace.outbox import project_payload, record_events
+from .catalog import sync_created_projects
+from .models import Project
+from .serializers import ProjectDetailSerializer
+
+BATCH_SIZE = 500
+
+
+@dataclass
+class ImportResult:
+    total_rows: int = 0
+    created: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+
+    def as_dict(self):
+        return {"total_rows": self.total_rows, "created": len(self.created), "ids": self.created, "errors": self.errors}
+
+
+def read_rows(uploaded_file):
+    """
+    Linhas de um CSV (`,` ou `;`) ou JSON (lista ou `{"projects": [...]}`), com valores
+    vazios omitidos. Retorna (linhas, número da primeira linha no arquivo): no CSV o
+    cabeçalho é a linha 1.
+    """
+    name = (getattr(uploaded_file, "name", "") or "").lower()
+    if name.endswith(".json"):
+        try:
+            data = json.load(uploaded_file)
+        except ValueError:
+            raise ValidationError("JSON inválido.")
+        return parse_rows(data), 1
+
+    text = io.TextIOWrapper(uploaded_file, encoding="utf-8-sig", newline="")
+    sample = text.read(4096)
+    text.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;")
+    except csv.Error:
+        dialect = csv.excel
+    rows = [
+        {key.strip().lower(): value.strip() for key, value in row.items() if key and value and value.strip()}
+        for row in csv.DictReader(text, dialect=dialect)
+    ]
+    return rows, 2
+
+
+def parse_rows(data):
+    if isinstance(data, dict):
+        data = data.get("projects")
+    if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+        raise ValidationError("Envie uma lista de projetos (ou um objeto com a chave 'projects').")
+    return [{key: value for key, value in row.items() if value not in ("", None)} for row in data]
+
+
+def attach_images(rows, archive):
+    """Troca o nome em `image` pelo arquivo correspondente do zip. Retorna erros por índice."""
+    errors = {}
+    if archive is None:
+        for index, row in enumerate(rows):
+            if "image" in row:
+                errors[index] = {"image": ["Envie o zip de imagens no campo 'images'."]}
+        return errors
+
+    try:
+        zip_file = zipfile.ZipFile(archive)
+    except zipfile.BadZipFile:
+        raise ValidationError("O campo 'images' deve ser um arquivo zip.")
+    with zip_file:
+        entries = {info.filename: info for info in zip_file.infolist() if not info.is_dir()}
+        for index, row in enumerate(rows):
+            image_name = row.get("image")
+            if not image_name:
+                continue
+            info = entries.get(image_name)
+            if info is None:
+                errors[index] = {"image": [f"'{image_name}' não está no zip."]}
+            elif info.file_size > settings.PROJECT_IMPORT_MAX_IMAGE_SIZE:
+                errors[index] = {"image": [f"'{image_name}' excede o tamanho máximo."]}
+            else:
+                row["image"] = SimpleUploadedFile(image_name.rsplit("/", 1)[-1], zip_file.read(info))
+    return errors
+
+
+def import_projects(user, rows, archive=None, request=None, first_row=1):
+    if len(rows) > settings.PROJECT_IMPORT_MAX_ROWS:
+        raise ValidationError(f"No máximo {settings.PROJECT_IMPORT_MAX_ROWS} projetos por importação.")
+
+    result = ImportResult(total_rows=len(rows))
+    row_errors = attach_images(rows, archive)
+    serializer = ProjectDetailSerializer(context={"request": request})
+    projects = []
+    for index, row in enumerate(rows):
+        if index in row_errors:
+            continue
+        try:
+            validated = serializer.run_validation(row)
+        except serializers.ValidationError as exc:
+            row_errors[index] = exc.detail
+            continue
+        projects.append(Project(ofertante=user, **validated))
+
+    result.errors = [{"row": index + first_row, "errors": errors} for index, errors in sorted(row_errors.items())]
+    if not projects:
+        return result
+
+    with transaction.atomic():
+        Project.objects.bulk_create(projects, batch_size=BATCH_SIZE)
+        sync_created_projects(projects)
+        record_events("project.created", projects, project_payload)
+    result.created = [str(project.pk) for project in projects]
+    return result
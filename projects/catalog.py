@@ -0,0 +1,192 @@
+"""
+Sincronização do modelo de leitura `ProjectCatalogEntry`.
+
+Os sinais abaixo atualizam a entrada do catálogo na mesma transação da mudança de
+origem (projeto, transação ou perfil do ofertante), então a vitrine nunca mostra um
+estado que foi desfeito. Operações em massa que não disparam sinais (`bulk_create`,
+`QuerySet.update`) e exclusões de transações devem ser seguidas de `rebuild_catalog`
+(ou do comando `rebuild_project_catalog`). Não há receptor de `post_delete` para
+transações de propósito: ele impediria o Django de apagá-las em massa.
+
+`credits_sold` e `transaction_count` mudam por incremento (F()), nunca reagregando as
+transações do projeto: na compra, e quando uma mudança de status entra ou sai de
+REJECTED. Depois que partições de transações são arquivadas, o banco não tem mais o
+histórico completo, então `rebuild_catalog` mantém esses contadores nas entradas
+existentes em vez de recalculá-los.
+"""
+from django.db.models import Count, F, Q, Sum
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from marketplace.models import Transaction
+from marketplace.partitions import has_archived_transactions
+from users.models import OfertanteProfile
+from .models import Project, ProjectCatalogEntry
+
+PROJECT_FIELDS = [
+    "name", "description", "image", "project_type", "status", "location",
+    "carbon_credits_available", "price_per_credit", "ofertante_id", "created_at",
+]
+
+# Transações que contam como venda no catálogo.
+SOLD = ~Q(status=Transaction.Status.REJECTED)
+
+
+def project_fields(project):
+    return {field: getattr(project, field) for field in PROJECT_FIELDS}
+
+
+def organization_name(user_id):
+    return (
+        OfertanteProfile.objects.filter(user_id=user_id).values_list("organization_name", flat=True).first()
+    )
+
+
+def sales_totals(project_id):
+    totals = Transaction.objects.filter(SOLD, project_id=project_id).aggregate(
+        credits_sold=Sum("quantity"), transaction_count=Count("pk")
+    )
+    return {"credits_sold": totals["credits_sold"] or 0, "transaction_count": totals["transaction_count"]}
+
+
+def sync_project(project):
+    """Cria, atualiza ou remove a entrada do catálogo de um projeto."""
+    if project.is_deleted:
+        ProjectCatalogEntry.objects.filter(project_id=project.pk).delete()
+        return
+
+    fields = project_fields(project)
+    if ProjectCatalogEntry.objects.filter(project_id=project.pk).update(**fields, updated_at=timezone.now()):
+        return
+    ProjectCatalogEntry.objects.create(
+        project_id=project.pk,
+        organization_name=organization_name(project.ofertante_id),
+        **fields,
+        **sales_totals(project.pk),
+    )
+
+
+def sync_created_projects(projects):
+    """Entradas de projetos recém-criados com `bulk_create` (sem sinais), em lote."""
+    organizations = dict(
+        OfertanteProfile.objects.filter(user_id__in={project.ofertante_id for project in projects})
+        .values_list("user_id", "organization_name")
+    )
+    now = timezone.now()
+    return _upsert_entries([
+        ProjectCatalogEntry(
+            project_id=project.pk,
+            organization_name=organizations.get(project.ofertante_id),
+            updated_at=now,
+            **project_fields(project),
+        )
+        for project in projects
+    ])
+
+
+def sync_sales(project_id):
+    ProjectCatalogEntry.objects.filter(project_id=project_id).update(
+        **sales_totals(project_id), updated_at=timezone.now()
+    )
+
+
+def add_sales(project_id, sign, quantity):
+    """Soma (`sign=1`) ou desconta (`sign=-1`) uma transação nos contadores de vendas."""
+    ProjectCatalogEntry.objects.filter(project_id=project_id).update(
+        credits_sold=F("credits_sold") + sign * quantity,
+        transaction_count=F("transaction_count") + sign,
+        updated_at=timezone.now(),
+    )
+
+
+def rebuild_catalog(batch_size=1000):
+    """
+    Reconstrói todas as entradas a partir das tabelas de origem. Retorna quantas existem.
+
+    Com partições de transações arquivadas, entradas existentes mantêm os contadores de
+    vendas (as transações arquivadas já não estão no banco); entradas novas os recebem
+    das transações que restam.
+    """
+    projects = (
+        Project.objects.all()
+        .annotate(
+            sold=Sum("transactions__quantity", filter=~Q(transactions__status=Transaction.Status.REJECTED)),
+            sales=Count("transactions", filter=~Q(transactions__status=Transaction.Status.REJECTED)),
+            organization=F("ofertante__ofertante_profile__organization_name"),
+        )
+        .order_by()
+    )
+    ProjectCatalogEntry.objects.exclude(project__in=Project.objects.all()).delete()
+
+    keep_sales = has_archived_transactions()
+    now = timezone.now()
+    total = 0
+    batch = []
+    for project in projects.iterator(chunk_size=batch_size):
+        batch.append(ProjectCatalogEntry(
+            project_id=project.pk,
+            organization_name=project.organization,
+            credits_sold=project.sold or 0,
+            transaction_count=project.sales,
+            updated_at=now,
+            **project_fields(project),
+        ))
+        if len(batch) >= batch_size:
+            total += _upsert_entries(batch, keep_sales)
+            batch = []
+    if batch:
+        total += _upsert_entries(batch, keep_sales)
+    return total
+
+
+def _upsert_entries(entries, keep_sales=False):
+    update_fields = PROJECT_FIELDS + ["organization_name", "updated_at"]
+    if not keep_sales:
+        update_fields += ["credits_sold", "transaction_count"]
+    ProjectCatalogEntry.objects.bulk_create(
+        entries, update_conflicts=True, unique_fields=["project"], update_fields=update_fields,
+    )
+    return len(entries)
+
+
+# ----------------------------------------------------------------------
+# Sinais
+# ----------------------------------------------------------------------
+@receiver(post_save, sender=Project, dispatch_uid="catalog_project_saved")
+def project_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_project(instance)
+
+
+@receiver(post_save, sender=Transaction, dispatch_uid="catalog_transaction_saved")
+def transaction_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    sold = instance.status != Transaction.Status.REJECTED
+    if created:
+        if sold:
+            add_sales(instance.project_id, 1, instance.quantity)
+    elif instance._loaded_status is None:
+        # Instância montada à mão (status anterior desconhecido): reagrega o projeto.
+        sync_sales(instance.project_id)
+    else:
+        # PENDING e APPROVED contam como venda: só entrar ou sair de REJECTED muda algo.
+        sign = sold - (instance._loaded_status != Transaction.Status.REJECTED)
+        if sign:
+            add_sales(instance.project_id, sign, instance.quantity)
+
+
+@receiver(post_save, sender=OfertanteProfile, dispatch_uid="catalog_profile_saved")
+def profile_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        ProjectCatalogEntry.objects.filter(ofertante_id=instance.user_id).update(
+            organization_name=instance.organization_name, updated_at=timezone.now()
+        )
+
+
+@receiver(post_delete, sender=OfertanteProfile, dispatch_uid="catalog_profile_deleted")
+def profile_deleted(sender, instance, **kwargs):
+    ProjectCatalogEntry.objects.filter(ofertante_id=instance.user_id).update(
+        organization_name=None, updated_at=timezone.now()
+    )
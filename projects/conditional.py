@@ -0,0 +1,65 @@
+"""
+Validadores HTTP (ETag/Last-Modified) para as respostas de projetos.
+
+As ETags são calculadas a partir de `updated_at` (e, nas listagens, de um carimbo
+barato `MAX(updated_at)` + `COUNT`), sem serializar nada. Assim um cliente com a
+versão atual recebe `304 Not Modified` antes de qualquer trabalho de serialização.
+"""
+import hashlib
+from datetime import datetime, timezone
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from core import signed_media
+
+
+def _etag(*parts):
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return quote_etag(digest)
+
+
+def project_validators(request, project):
+    """
+    ETag e Last-Modified de um projeto. A representação também depende do formato aceito
+    e das URLs assinadas dos documentos, que mudam a cada janela de SIGNED_MEDIA_BUCKET:
+    o prazo delas entra na ETag e o início da janela conta como modificação. Assim uma
+    revalidação nunca devolve 304 para uma cópia com URLs já expiradas.
+    """
+    expires = signed_media.expires_at()
+    etag = _etag(project.pk, project.updated_at.isoformat(), request.accepted_renderer.format, expires)
+    window_start = datetime.fromtimestamp(signed_media.window_start(), tz=timezone.utc)
+    return etag, max(project.updated_at, window_start)
+
+
+def queryset_validators(request, queryset):
+    """
+    ETag e Last-Modified de uma listagem.
+
+    O carimbo combina o maior `updated_at` e a quantidade de linhas do queryset já
+    filtrado: qualquer criação, edição ou saída de um item da listagem muda um dos dois.
+    A URL completa entra na ETag porque página, filtros e ordenação mudam o conteúdo.
+    """
+    stamp = queryset.order_by().aggregate(last_modified=Max("updated_at"), total=Count("pk"))
+    last_modified = stamp["last_modified"]
+    etag = _etag(
+        request.get_full_path(),
+        request.accepted_renderer.format,
+        last_modified.isoformat() if last_modified else "",
+        stamp["total"],
+    )
+    return etag, last_modified
+
+
+def not_modified_response(request, etag, last_modified):
+    """Retorna a resposta 304 quando o cliente já tem a versão atual; senão, None."""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(request._request, etag=etag, last_modified=timestamp)
+
+
+def set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
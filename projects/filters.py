@@ -1,6 +1,6 @@
 
 import django_filters
-from .models import Project
+from .models import Project, ProjectCatalogEntry
 
 
 class ProjectFilter(django_filters.FilterSet):
@@ -11,3 +11,14 @@ class ProjectFilter(django_filters.FilterSet):
     class Meta:
         model = Project
         fields = ["status", "project_type", "owner"]
+
+
+class ProjectCatalogFilter(django_filters.FilterSet):
+    """Mesmos parâmetros de `ProjectFilter`, aplicados ao catálogo (`ProjectCatalogEntry`)."""
+    status = django_filters.CharFilter(field_name="status", lookup_expr="iexact")
+    project_type = django_filters.CharFilter(field_name="project_type", lookup_expr="iexact")
+    owner = django_filters.UUIDFilter(field_name="ofertante_id")
+
+    class Meta:
+        model = ProjectCatalogEntry
+        fields = ["status", "project_type", "owner"]
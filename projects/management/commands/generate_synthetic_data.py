@@ -0,0 +1,324 @@
+import csv
+import io
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from marketplace.holdings import create_holdings
+from marketplace.models import Transaction
+from projects.catalog import rebuild_catalog
+from projects.models import Project
+from users.models import (
+    BaseUser, OfertanteProfile, CompradorProfile, CompradorOrganization, cnpj_check_digits
+)
+
+# Todos os usuários sintéticos compartilham este prefixo de e-mail, o que permite
+# limpá-los sem tocar nos dados criados pelos outros seeders.
+EMAIL_PREFIX = "synthetic."
+DEFAULT_PASSWORD = "Teste#123"
+
+# Raiz de CNPJ reservada aos compradores sintéticos (evita colisão com os seeders manuais).
+CNPJ_ROOT_OFFSET = 90_000_000
+
+PROJECT_STATUS_WEIGHTS = [
+    (Project.Status.ACTIVE, 70),
+    (Project.Status.VALIDATED, 15),
+    (Project.Status.DRAFT, 10),
+    (Project.Status.COMPLETED, 5),
+]
+TRANSACTION_STATUS_WEIGHTS = [
+    (Transaction.Status.APPROVED, 70),
+    (Transaction.Status.PENDING, 20),
+    (Transaction.Status.REJECTED, 10),
+]
+LOCATIONS = [
+    "Belém, Pará", "Paragominas, Pará", "Altamira, Pará", "Tomé-Açu, Pará",
+    "Tucuruí, Pará", "Manaus, Amazonas", "Cuiabá, Mato Grosso", "Porto Velho, Rondônia",
+]
+
+
+def synthetic_cnpj(index: int) -> str:
+    """Gera um CNPJ formatado e válido, determinístico para o índice informado."""
+    base12 = f"{CNPJ_ROOT_OFFSET + index:08d}0001"
+    digits = base12 + cnpj_check_digits(base12)
+    return f"{digits[:2]}.{digits[2:5]}.{digits[5:8]}/{digits[8:12]}-{digits[12:]}"
+
+
+@contextmanager
+def preserve_auto_now_add(model, field_name):
+    """
+    Desliga temporariamente o `auto_now_add` de um campo para que o `bulk_create`
+    mantenha as datas geradas (senão todas as linhas teriam o horário atual).
+    """
+    field = model._meta.get_field(field_name)
+    original = field.auto_now_add
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = original
+
+
+class Command(BaseCommand):
+    """
+    Gera volumes configuráveis de dados sintéticos para benchmarks.
+
+    Diferente dos seeders `seed_database`, `seed_projects` e `seed_transactions`, que
+    criam um registro por vez, este comando insere em lotes com `bulk_create` (ou `COPY`
+    no Postgres para as transações), calcula o hash da senha uma única vez e usa um
+    gerador aleatório com semente fixa, de modo que duas execuções com a mesma
+    `--seed` produzem exatamente os mesmos dados.
+
+    Exemplo:
+    `python manage.py generate_synthetic_data --compradores 100000 --projects 50000 --transactions 10000000 --copy`
+    """
+    help = "Gera usuários, projetos e transações sintéticos em lote, de forma determinística."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ofertantes", type=int, default=100, help="Quantidade de ofertantes.")
+        parser.add_argument("--compradores", type=int, default=1000, help="Quantidade de compradores.")
+        parser.add_argument("--projects", type=int, default=500, help="Quantidade de projetos.")
+        parser.add_argument("--transactions", type=int, default=10000, help="Quantidade de transações.")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Tamanho de cada lote de inserção.")
+        parser.add_argument("--seed", type=int, default=42, help="Semente do gerador aleatório.")
+        parser.add_argument("--history-days", type=int, default=730, help="Janela (em dias) das datas geradas.")
+        parser.add_argument(
+            "--copy",
+            action="store_true",
+            help="Usa COPY para inserir as transações (somente Postgres).",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Remove os dados sintéticos gerados anteriormente antes de gerar novos.",
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.now = timezone.now()
+        self.history = timedelta(days=options["history_days"])
+
+        if options["batch_size"] <= 0:
+            raise CommandError("--batch-size deve ser positivo.")
+        if options["copy"] and connection.vendor != "postgresql":
+            raise CommandError("--copy só é suportado com Postgres.")
+        if options["projects"] and not options["ofertantes"]:
+            raise CommandError("É preciso ao menos um ofertante para gerar projetos.")
+        if options["transactions"] and not (options["compradores"] and options["projects"]):
+            raise CommandError("É preciso ao menos um comprador e um projeto para gerar transações.")
+
+        if options["clear"]:
+            self.clear()
+        elif BaseUser.objects.filter(email__startswith=EMAIL_PREFIX).exists():
+            raise CommandError("Já existem dados sintéticos no banco. Use --clear para regerá-los.")
+
+        # O hash da senha é calculado uma única vez e reaproveitado por todos os usuários.
+        # O salt derivado da semente mantém o resultado determinístico.
+        password = make_password(DEFAULT_PASSWORD, salt=f"synthetic{options['seed']}")
+
+        ofertante_ids = self.create_ofertantes(options["ofertantes"], password)
+        comprador_ids = self.create_compradores(options["compradores"], password)
+        projects = self.create_projects(options["projects"], ofertante_ids)
+        self.create_transactions(options["transactions"], comprador_ids, projects, use_copy=options["copy"])
+
+        # Os inserts em massa não disparam os sinais do catálogo da vitrine nem
+        # atualizam os saldos de créditos. Os saldos são criados só para os compradores
+        # novos: um recálculo geral apagaria os créditos de partições já arquivadas.
+        rebuild_catalog(batch_size=self.batch_size)
+        for start, end in self.batches(len(comprador_ids)):
+            create_holdings(comprador_ids[start:end])
+
+        self.stdout.write(self.style.SUCCESS("Dados sintéticos gerados com sucesso!"))
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def past_datetime(self):
+        return self.now - self.history * self.rng.random()
+
+    def batches(self, total):
+        for start in range(0, total, self.batch_size):
+            yield start, min(start + self.batch_size, total)
+
+    def report(self, label, done, total):
+        self.stdout.write(f"  -> {label}: {done}/{total}")
+
+    def clear(self):
+        self.stdout.write(self.style.WARNING("Removendo dados sintéticos existentes..."))
+        synthetic_users = BaseUser.objects.filter(email__startswith=EMAIL_PREFIX)
+        with transaction.atomic():
+            Transaction.objects.filter(buyer__in=synthetic_users).delete()
+            Transaction.objects.filter(project__ofertante__in=synthetic_users).delete()
+            Project.all_objects.filter(ofertante__in=synthetic_users).delete()
+            count, _ = synthetic_users.delete()
+        self.stdout.write(self.style.SUCCESS(f"{count} registros sintéticos removidos."))
+
+    # ------------------------------------------------------------------
+    # Geradores
+    # ------------------------------------------------------------------
+    def build_users(self, user_type, start, end, password):
+        label = user_type.lower()
+        return [
+            BaseUser(
+                id=self.uuid(),
+                email=f"{EMAIL_PREFIX}{label}.{i}@example.com",
+                password=password,
+                password_hash=password,
+                user_type=user_type,
+                is_verified=True,
+                verification_status=BaseUser.VerificationStatus.APPROVED,
+                wallet_balance=Decimal(self.rng.randint(10_000, 5_000_000)),
+                created_at=self.past_datetime(),
+            )
+            for i in range(start, end)
+        ]
+
+    def create_ofertantes(self, total, password):
+        self.stdout.write(f"Criando {total} ofertantes...")
+        ids = []
+        organization_types = OfertanteProfile.OrganizationType.values
+        for start, end in self.batches(total):
+            users = self.build_users(BaseUser.UserType.OFERTANTE, start, end, password)
+            profiles = [
+                OfertanteProfile(
+                    id=self.uuid(),
+                    user=user,
+                    contact_name=f"Contato Ofertante {start + offset}",
+                    contact_position="Diretor(a)",
+                    phone=f"9198{start + offset:07d}",
+                    organization_type=self.rng.choice(organization_types),
+                    organization_name=f"Organização Sintética {start + offset}",
+                )
+                for offset, user in enumerate(users)
+            ]
+            with transaction.atomic():
+                BaseUser.objects.bulk_create(users)
+                OfertanteProfile.objects.bulk_create(profiles)
+            ids.extend(user.id for user in users)
+            self.report("ofertantes", end, total)
+        return ids
+
+    def create_compradores(self, total, password):
+        self.stdout.write(f"Criando {total} compradores...")
+        ids = []
+        sectors = CompradorOrganization.IndustrySector.values
+        sizes = CompradorOrganization.CompanySize.values
+        for start, end in self.batches(total):
+            users = self.build_users(BaseUser.UserType.COMPRADOR, start, end, password)
+            profiles = []
+            organizations = []
+            for offset, user in enumerate(users):
+                index = start + offset
+                profiles.append(CompradorProfile(
+                    id=self.uuid(),
+                    user=user,
+                    contact_name=f"Contato Comprador {index}",
+                    phone=f"1199{index:07d}",
+                ))
+                organizations.append(CompradorOrganization(
+                    id=self.uuid(),
+                    user=user,
+                    company_name=f"Empresa Sintética {index}",
+                    cnpj=synthetic_cnpj(index),
+                    industry_sector=self.rng.choice(sectors),
+                    company_size=self.rng.choice(sizes),
+                    website=f"https://empresa-{index}.example.com",
+                ))
+            with transaction.atomic():
+                BaseUser.objects.bulk_create(users)
+                CompradorProfile.objects.bulk_create(profiles)
+                CompradorOrganization.objects.bulk_create(organizations)
+            ids.extend(user.id for user in users)
+            self.report("compradores", end, total)
+        return ids
+
+    def create_projects(self, total, ofertante_ids):
+        """Cria os projetos e devolve uma lista de tuplas (id, preço) usada pelas transações."""
+        self.stdout.write(f"Criando {total} projetos...")
+        statuses, status_weights = zip(*PROJECT_STATUS_WEIGHTS)
+        project_types = Project.ProjectType.values
+        created = []
+        for start, end in self.batches(total):
+            projects = []
+            for i in range(start, end):
+                project_type = self.rng.choice(project_types)
+                projects.append(Project(
+                    id=self.uuid(),
+                    ofertante_id=self.rng.choice(ofertante_ids),
+                    name=f"Projeto Sintético {i}",
+                    description=f"Projeto sintético de {project_type.lower()} gerado para benchmarks.",
+                    project_type=project_type,
+                    location=self.rng.choice(LOCATIONS),
+                    status=self.rng.choices(statuses, weights=status_weights)[0],
+                    carbon_credits_available=self.rng.randint(1_000, 200_000),
+                    price_per_credit=Decimal(self.rng.randint(4_000, 15_000)) / 100,
+                    created_at=self.past_datetime(),
+                ))
+            # `bulk_create` não passa por `Project.save`, evitando o `full_clean()` por linha.
+            # A validação de dono é garantida aqui: `ofertante_ids` só contém ofertantes.
+            Project.objects.bulk_create(projects)
+            created.extend((project.id, project.price_per_credit) for project in projects)
+            self.report("projetos", end, total)
+        return created
+
+    def build_transaction_rows(self, start, end, comprador_ids, projects):
+        statuses, status_weights = zip(*TRANSACTION_STATUS_WEIGHTS)
+        for _ in range(start, end):
+            project_id, price = self.rng.choice(projects)
+            quantity = self.rng.randint(1, 50)
+            yield (
+                self.uuid(),
+                self.rng.choice(comprador_ids),
+                project_id,
+                quantity,
+                price,
+                price * quantity,
+                self.past_datetime(),
+                self.rng.choices(statuses, weights=status_weights)[0],
+            )
+
+    def create_transactions(self, total, comprador_ids, projects, use_copy=False):
+        self.stdout.write(f"Criando {total} transações{' via COPY' if use_copy else ''}...")
+        for start, end in self.batches(total):
+            rows = self.build_transaction_rows(start, end, comprador_ids, projects)
+            if use_copy:
+                self.copy_transactions(rows)
+            else:
+                objs = [
+                    Transaction(
+                        id=tx_id, buyer_id=buyer_id, project_id=project_id, quantity=quantity,
+                        price_per_credit_at_purchase=price, total_price=total_price,
+                        timestamp=timestamp, status=tx_status,
+                    )
+                    for tx_id, buyer_id, project_id, quantity, price, total_price, timestamp, tx_status in rows
+                ]
+                with preserve_auto_now_add(Transaction, "timestamp"):
+                    Transaction.objects.bulk_create(objs)
+            self.report("transações", end, total)
+
+    def copy_transactions(self, rows):
+        """Envia um lote de transações ao Postgres com `COPY ... FROM STDIN`."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(value.isoformat() if hasattr(value, "isoformat") else value for value in row)
+        buffer.seek(0)
+
+        columns = [
+            "id", "buyer_id", "project_id", "quantity",
+            "price_per_credit_at_purchase", "total_price", "timestamp", "status",
+        ]
+        sql = f"COPY {Transaction._meta.db_table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.copy_expert(sql, buffer)
@@ -0,0 +1,96 @@
+import re
+import uuid
+
+from django.conf import settings
+from django.utils import timezone
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from marketplace.models import OutboxEvent, Transaction
+from projects.models import Project, ProjectCatalogEntry
+from projects.retention import purgeable_projects
+from users.models import BaseUser
+
+# Trechos de plano que indicam leitura da tabela inteira.
+SEQ_SCAN_PATTERNS = {
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+    # No SQLite, "SCAN <tabela>" sem índice é leitura completa; "SEARCH" usa índice.
+    "sqlite": re.compile(r"\bSCAN (\w+)\b(?! USING (?:COVERING )?INDEX)"),
+}
+
+
+def hot_querysets():
+    """
+    Consultas mais frequentes da API, no mesmo formato usado pelas views.
+    Os parâmetros (ofertante, comprador) são amostrados do banco quando existem.
+    """
+    ofertante_id = (
+        BaseUser.objects.filter(user_type=BaseUser.UserType.OFERTANTE).values_list("pk", flat=True).first() or 0
+    )
+    buyer_id = BaseUser.objects.filter(user_type=BaseUser.UserType.COMPRADOR).values_list("pk", flat=True).first() or 0
+    active = Project.objects.filter(status=Project.Status.ACTIVE)
+    catalog = ProjectCatalogEntry.objects.filter(status=Project.Status.ACTIVE)
+
+    return [
+        ("projects: vitrine (catálogo)", catalog.order_by("-created_at")[:20]),
+        ("projects: vitrine por tipo e preço (catálogo)", catalog.filter(project_type=Project.ProjectType.REFLORESTAMENTO).order_by("price_per_credit")[:20]),
+        ("projects: contagem por tipo (facetas)", active.values("project_type").order_by().distinct()),
+        ("projects: filtro por tipo", active.filter(project_type=Project.ProjectType.REFLORESTAMENTO).order_by("-created_at")[:20]),
+        ("projects: meus projetos", Project.objects.filter(ofertante_id=ofertante_id).order_by("-created_at")[:20]),
+        ("projects: detalhe", Project.objects.filter(pk=uuid.uuid4())),
+        ("projects: expurgo de deletados", purgeable_projects(timezone.now())[:100]),
+        ("marketplace: minhas transações", Transaction.objects.filter(buyer_id=buyer_id).order_by("-timestamp")[:20]),
+        ("marketplace: feed público", Transaction.objects.recent(settings.PUBLIC_TRANSACTION_FEED_DAYS).order_by("-timestamp")[:20]),
+        ("marketplace: fila de auditoria", Transaction.objects.filter(status=Transaction.Status.PENDING).order_by("-timestamp")[:20]),
+        ("marketplace: outbox pendente", OutboxEvent.objects.filter(published_at__isnull=True).order_by("id")[:200]),
+    ]
+
+
+class Command(BaseCommand):
+    """
+    Roda EXPLAIN nas consultas quentes da API e aponta as que leem a tabela inteira.
+
+    Como usar:
+    - Relatório: `python manage.py index_advisor`
+    - Com tempos reais (Postgres): `python manage.py index_advisor --analyze`
+    - Em CI, falhando se houver seq scan: `python manage.py index_advisor --fail-on-seq-scan`
+
+    Em tabelas pequenas o Postgres prefere seq scan mesmo com o índice certo; rode em
+    uma base com volume realista (veja `generate_synthetic_data`).
+    """
+    help = "Analisa os planos das consultas mais frequentes e sinaliza seq scans."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--analyze", action="store_true", help="Usa EXPLAIN ANALYZE (somente Postgres).")
+        parser.add_argument("--verbose-plans", action="store_true", help="Imprime o plano completo de cada consulta.")
+        parser.add_argument("--fail-on-seq-scan", action="store_true", help="Termina com erro se alguma consulta fizer seq scan.")
+
+    def handle(self, *args, **options):
+        pattern = SEQ_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f"Banco '{connection.vendor}' não suportado pelo index_advisor.")
+
+        explain_options = {}
+        if options["analyze"] and connection.vendor == "postgresql":
+            explain_options = {"analyze": True, "buffers": True}
+
+        flagged = []
+        for label, queryset in hot_querysets():
+            plan = queryset.explain(**explain_options)
+            scanned = sorted(set(pattern.findall(plan)))
+            if scanned:
+                flagged.append(label)
+                self.stdout.write(self.style.WARNING(f"[SEQ SCAN] {label}: {', '.join(scanned)}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"[ok] {label}"))
+            if options["verbose_plans"] or scanned:
+                for line in plan.splitlines():
+                    self.stdout.write(f"    {line}")
+
+        if flagged:
+            message = f"{len(flagged)} consulta(s) com leitura completa de tabela."
+            if options["fail_on_seq_scan"]:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS("Todas as consultas usam índices."))
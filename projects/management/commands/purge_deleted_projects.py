@@ -0,0 +1,53 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from projects.retention import purge_batch, purge_cutoff, purgeable_projects
+
+
+class Command(BaseCommand):
+    """
+    Apaga definitivamente projetos deletados há muito tempo, com seus documentos e
+    arquivos de mídia (veja projects/retention.py).
+
+    Como usar (ex.: diariamente via cron):
+    `python manage.py purge_deleted_projects --older-than-days 180 --batch-size 100`
+
+    Trabalha em lotes pequenos, cada um numa transação curta, com uma pausa entre
+    eles para não segurar locks nem competir com o tráfego.
+    """
+    help = "Expurga projetos deletados (soft delete) além do prazo de retenção."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=settings.PROJECT_RETENTION_DAYS,
+            help="Expurga projetos deletados há mais de N dias.",
+        )
+        parser.add_argument("--batch-size", type=int, default=100, help="Projetos apagados por transação.")
+        parser.add_argument("--pause", type=float, default=0.5, help="Segundos de pausa entre lotes.")
+        parser.add_argument("--max-batches", type=int, default=None, help="Para depois de N lotes.")
+        parser.add_argument("--dry-run", action="store_true", help="Só conta os projetos que seriam expurgados.")
+
+    def handle(self, *args, **options):
+        cutoff = purge_cutoff(options["older_than_days"])
+        if options["dry_run"]:
+            count = purgeable_projects(cutoff).count()
+            self.stdout.write(f"{count} projetos seriam expurgados.")
+            return
+
+        batches = projects = files = 0
+        while options["max_batches"] is None or batches < options["max_batches"]:
+            purged, removed = purge_batch(cutoff, options["batch_size"])
+            if not purged:
+                break
+            batches += 1
+            projects += purged
+            files += removed
+            self.stdout.write(f"  -> lote {batches}: {purged} projetos, {removed} arquivos.")
+            if purged == options["batch_size"] and options["pause"]:
+                time.sleep(options["pause"])
+
+        self.stdout.write(self.style.SUCCESS(f"{projects} projetos expurgados, {files} arquivos removidos."))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from projects.catalog import rebuild_catalog
+
+
+class Command(BaseCommand):
+    """
+    Reconstrói o catálogo da vitrine (ProjectCatalogEntry) a partir das tabelas de origem.
+
+    Como usar: `python manage.py rebuild_project_catalog`
+
+    Necessário após cargas em massa ou exclusões de transações, que não disparam os
+    sinais de sincronização (veja projects/catalog.py).
+    """
+    help = "Reconstrói o modelo de leitura do catálogo de projetos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Entradas gravadas por lote.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            total = rebuild_catalog(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Catálogo reconstruído: {total} projetos."))
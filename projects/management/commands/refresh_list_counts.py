@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from projects.pagination import refresh_list_count
+
+
+class Command(BaseCommand):
+    """
+    Guarda em cache a contagem exata das listagens sem filtros de LIST_COUNT_VIEWS,
+    usada pela EstimatedCountPagination no lugar da estimativa do planejador.
+
+    Como usar (ex.: a cada 5 minutos via cron, abaixo de LIST_COUNT_CACHE_TTL):
+    `python manage.py refresh_list_counts`
+    """
+    help = "Atualiza as contagens exatas em cache das listagens paginadas."
+
+    def handle(self, *args, **options):
+        for path in settings.LIST_COUNT_VIEWS:
+            count = refresh_list_count(import_string(path))
+            self.stdout.write(f"  -> {path}: {count}")
+        self.stdout.write(self.style.SUCCESS(f"{len(settings.LIST_COUNT_VIEWS)} contagens atualizadas."))
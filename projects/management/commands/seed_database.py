@@ -32,7 +32,7 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING("Limpando o banco de dados..."))
             Transaction.objects.all().delete()
             Document.objects.all().delete()
-            Project.objects.all().delete()
+            Project.all_objects.all().delete()
             OfertanteProfile.objects.all().delete()
             CompradorProfile.objects.all().delete()
             CompradorOrganization.objects.all().delete()
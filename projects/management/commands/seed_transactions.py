@@ -38,7 +38,7 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS(f"{count} transações foram deletadas."))
 
         # Buscar projetos e usuários necessários
-        projects_available = list(Project.objects.alive().filter(price_per_credit__gt=0, carbon_credits_available__gt=0))
+        projects_available = list(Project.objects.filter(price_per_credit__gt=0, carbon_credits_available__gt=0))
         compradores = BaseUser.objects.filter(user_type=BaseUser.UserType.COMPRADOR)
 
         if not projects_available:
@@ -0,0 +1,51 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0005_project_image"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="project",
+            name="projects_pr_status_f023cb_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="project",
+            name="projects_pr_project_573ce6_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="project",
+            name="projects_pr_ofertan_b6c6e8_idx",
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["status", "-created_at"],
+                name="project_alive_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False), ("status", "ACTIVE")),
+                fields=["project_type", "price_per_credit"],
+                name="project_active_type_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["ofertante", "-created_at"],
+                name="project_alive_owner_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,193 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:33
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Q, Sum
+
+
+def populate_catalog(apps, schema_editor):
+    Project = apps.get_model("projects", "Project")
+    ProjectCatalogEntry = apps.get_model("projects", "ProjectCatalogEntry")
+    sold = ~Q(transactions__status="REJECTED")
+    projects = (
+        Project.objects.filter(is_deleted=False)
+        .annotate(
+            sold=Sum("transactions__quantity", filter=sold),
+            sales=Count("transactions", filter=sold),
+            organization=F("ofertante__ofertante_profile__organization_name"),
+        )
+        .order_by()
+    )
+    ProjectCatalogEntry.objects.bulk_create(
+        [
+            ProjectCatalogEntry(
+                project_id=project.pk,
+                name=project.name,
+                description=project.description,
+                image=project.image,
+                project_type=project.project_type,
+                status=project.status,
+                location=project.location,
+                carbon_credits_available=project.carbon_credits_available,
+                price_per_credit=project.price_per_credit,
+                ofertante_id=project.ofertante_id,
+                organization_name=project.organization,
+                credits_sold=project.sold or 0,
+                transaction_count=project.sales,
+                created_at=project.created_at,
+            )
+            for project in projects.iterator(chunk_size=1000)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0006_query_shape_indexes"),
+        ("marketplace", "0006_query_shape_indexes"),
+        ("users", "0004_alter_baseuser_user_type_auditorprofile"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectCatalogEntry",
+            fields=[
+                (
+                    "project",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="catalog_entry",
+                        serialize=False,
+                        to="projects.project",
+                        verbose_name="Projeto",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(max_length=180, verbose_name="Nome do Projeto"),
+                ),
+                (
+                    "description",
+                    models.TextField(blank=True, verbose_name="Descrição Detalhada"),
+                ),
+                (
+                    "image",
+                    models.ImageField(
+                        blank=True,
+                        null=True,
+                        upload_to="projects/images/",
+                        verbose_name="Imagem do Projeto",
+                    ),
+                ),
+                (
+                    "project_type",
+                    models.CharField(
+                        choices=[
+                            ("REFLORESTAMENTO", "Reflorestamento e Conservação"),
+                            ("ENERGIA_RENOVAVEL", "Energia Renovável"),
+                            ("AGRICULTURA", "Agricultura de Baixo Carbono"),
+                            ("GESTAO_RESIDUOS", "Gestão de Resíduos"),
+                            ("OUTRO", "Outro"),
+                        ],
+                        max_length=20,
+                        verbose_name="Tipo de Projeto",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("DRAFT", "Rascunho"),
+                            ("ACTIVE", "Ativo"),
+                            ("VALIDATED", "Validado"),
+                            ("COMPLETED", "Concluído"),
+                        ],
+                        max_length=10,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "location",
+                    models.CharField(
+                        blank=True,
+                        max_length=180,
+                        verbose_name="Localização (Cidade/Estado)",
+                    ),
+                ),
+                (
+                    "carbon_credits_available",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Créditos de Carbono Disponíveis"
+                    ),
+                ),
+                (
+                    "price_per_credit",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=12,
+                        verbose_name="Preço por Crédito (R$)",
+                    ),
+                ),
+                (
+                    "organization_name",
+                    models.CharField(
+                        blank=True,
+                        max_length=255,
+                        null=True,
+                        verbose_name="Nome da Organização",
+                    ),
+                ),
+                (
+                    "credits_sold",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Créditos vendidos"
+                    ),
+                ),
+                (
+                    "transaction_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Quantidade de transações"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(verbose_name="Criado em")),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Atualizado em"
+                    ),
+                ),
+                (
+                    "ofertante",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Ofertante Responsável",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Projeto (catálogo)",
+                "verbose_name_plural": "Projetos (catálogo)",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "-created_at"],
+                        name="catalog_status_created_idx",
+                    ),
+                    models.Index(
+                        fields=["status", "project_type", "price_per_credit"],
+                        name="catalog_status_type_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(populate_catalog, migrations.RunPython.noop),
+    ]
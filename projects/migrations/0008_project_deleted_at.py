@@ -0,0 +1,38 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:58
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_deleted_at(apps, schema_editor):
+    # Projetos já deletados: a última alteração foi o soft delete.
+    Project = apps.get_model("projects", "Project")
+    Project.objects.filter(is_deleted=True, deleted_at__isnull=True).update(deleted_at=F("updated_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0007_project_catalog_entry"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="deleted_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Deletado em"
+            ),
+        ),
+        migrations.RunPython(backfill_deleted_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                condition=models.Q(("is_deleted", True)),
+                fields=["deleted_at"],
+                name="project_dead_idx",
+            ),
+        ),
+    ]
@@ -10,6 +10,16 @@ class ProjectQuerySet(models.QuerySet):
         """Retorna apenas os projetos que não foram deletados (soft delete).""" 
         return self.filter(is_deleted=False)
 
+    def dead(self):
+        return self.filter(is_deleted=True)
+
+
+class ProjectManager(models.Manager.from_queryset(ProjectQuerySet)):
+    """Manager padrão: já exclui os projetos deletados (use `Project.all_objects` para vê-los)."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
+
 def document_upload_to(instance, filename):
     return f"projects/{instance.project.id}/{filename}"
 
@@ -66,34 +76,60 @@ class Project(models.Model):
     )
 
     is_deleted = models.BooleanField(default=False, verbose_name="Deletado")
+    deleted_at = models.DateTimeField(null=True, blank=True, verbose_name="Deletado em")
 
     created_at = models.DateTimeField(default=timezone.now, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
-    objects = ProjectQuerySet.as_manager()
+    objects = ProjectManager()
+    all_objects = ProjectQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Projeto"
         verbose_name_plural = "Projetos"
         indexes = [
-            models.Index(fields=["status"]),
-            models.Index(fields=["project_type"]),
-            models.Index(fields=["ofertante"]),
+            # Índices parciais sobre os projetos não deletados, no formato das consultas
+            # reais: vitrine (`status=ACTIVE ORDER BY -created_at`), facetas por tipo e
+            # "meus projetos" (`ofertante=? ORDER BY -created_at`).
+            models.Index(fields=["status", "-created_at"], condition=models.Q(is_deleted=False), name="project_alive_status_idx"),
+            models.Index(fields=["project_type", "price_per_credit"], condition=models.Q(is_deleted=False, status="ACTIVE"), name="project_active_type_idx"),
+            models.Index(fields=["ofertante", "-created_at"], condition=models.Q(is_deleted=False), name="project_alive_owner_idx"),
+            # Só os deletados, para o expurgo (`purge_deleted_projects`) achar os mais antigos.
+            models.Index(fields=["deleted_at"], condition=models.Q(is_deleted=True), name="project_dead_idx"),
         ]
         ordering = ["-created_at"]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Dono carregado do banco: `clean()` só revalida o ofertante se ele mudar.
+        instance._loaded_ofertante_id = instance.__dict__.get("ofertante_id")
+        return instance
+
+    def ofertante_changed(self):
+        return self._state.adding or self.ofertante_id != getattr(self, "_loaded_ofertante_id", None)
+
     def clean(self):
-        """Garante que o dono do projeto é um Ofertante."""
-        if self.ofertante and self.ofertante.user_type != 'OFERTANTE':
+        """Garante que o dono do projeto é um Ofertante (só quando o dono é novo ou mudou)."""
+        if self.ofertante_id and self.ofertante_changed() and self.ofertante.user_type != 'OFERTANTE':
             raise ValidationError("O responsável pelo projeto deve ser um usuário do tipo 'Ofertante'.")
 
     def save(self, *args, **kwargs):
-        self.full_clean()  # Chama a validação do `clean()`
+        # Com `update_fields`, valida só os campos gravados; `clean()` roda sempre, mas
+        # não consulta o ofertante se ele não mudou.
+        update_fields = kwargs.get("update_fields")
+        exclude = None
+        if update_fields is not None:
+            written = set(update_fields)
+            exclude = [f.name for f in self._meta.concrete_fields if f.name not in written and f.attname not in written]
+        self.full_clean(exclude=exclude)
         super().save(*args, **kwargs)
+        self._loaded_ofertante_id = self.ofertante_id
 
     def soft_delete(self):
         self.is_deleted = True
-        self.save(update_fields=["is_deleted", "updated_at"])
+        self.deleted_at = timezone.now()
+        self.save(update_fields=["is_deleted", "deleted_at", "updated_at"])
 
     def __str__(self):
         return self.name
@@ -113,3 +149,50 @@ class Document(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class ProjectCatalogEntry(models.Model):
+    """
+    Modelo de leitura (desnormalizado) de um projeto para a vitrine.
+
+    Reúne numa única linha os campos do cartão do catálogo: dados do projeto, nome da
+    organização do ofertante e agregados das transações. É mantido pelos sinais em
+    `projects/catalog.py`, na mesma transação da mudança de origem; o comando
+    `rebuild_project_catalog` reconstrói tudo a partir das tabelas de origem.
+    Projetos deletados (soft delete) não têm entrada.
+    """
+    project = models.OneToOneField(
+        Project, on_delete=models.CASCADE, primary_key=True, related_name="catalog_entry", verbose_name="Projeto"
+    )
+    name = models.CharField(max_length=180, verbose_name="Nome do Projeto")
+    description = models.TextField(blank=True, verbose_name="Descrição Detalhada")
+    image = models.ImageField(upload_to="projects/images/", blank=True, null=True, verbose_name="Imagem do Projeto")
+    project_type = models.CharField(max_length=20, choices=Project.ProjectType.choices, verbose_name="Tipo de Projeto")
+    status = models.CharField(max_length=10, choices=Project.Status.choices, verbose_name="Status")
+    location = models.CharField(max_length=180, blank=True, verbose_name="Localização (Cidade/Estado)")
+    carbon_credits_available = models.PositiveIntegerField(default=0, verbose_name="Créditos de Carbono Disponíveis")
+    price_per_credit = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name="Preço por Crédito (R$)")
+
+    ofertante = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+", verbose_name="Ofertante Responsável"
+    )
+    organization_name = models.CharField(max_length=255, null=True, blank=True, verbose_name="Nome da Organização")
+
+    # Transações não rejeitadas.
+    credits_sold = models.PositiveIntegerField(default=0, verbose_name="Créditos vendidos")
+    transaction_count = models.PositiveIntegerField(default=0, verbose_name="Quantidade de transações")
+
+    created_at = models.DateTimeField(verbose_name="Criado em")
+    updated_at = models.DateTimeField(default=timezone.now, verbose_name="Atualizado em")
+
+    class Meta:
+        verbose_name = "Projeto (catálogo)"
+        verbose_name_plural = "Projetos (catálogo)"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "-created_at"], name="catalog_status_created_idx"),
+            models.Index(fields=["status", "project_type", "price_per_credit"], name="catalog_status_type_idx"),
+        ]
+
+    def __str__(self):
+        return self.name
@@ -1,8 +1,182 @@
-
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Page
+from django.utils.translation import gettext
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from core.db import EstimatedCountPaginator
+
+LIST_COUNT_KEY_PREFIX = "list-count:"
 
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
+
+
+def list_count_key(name):
+    return f"{LIST_COUNT_KEY_PREFIX}{name}"
+
+
+def refresh_list_count(view_class):
+    """
+    Conta exatamente a listagem sem filtros de `view_class` e guarda o total em cache
+    por LIST_COUNT_CACHE_TTL segundos. O `get_queryset()` da view não pode depender
+    da requisição (é chamado fora dela, pelo comando `refresh_list_counts`).
+    """
+    view = view_class(action="list", kwargs={}, request=None, format_kwarg=None)
+    count = view.get_queryset().count()
+    cache.set(list_count_key(view_class.count_cache_key), count, settings.LIST_COUNT_CACHE_TTL)
+    return count
+
+
+class EstimatedCountPagination(StandardResultsSetPagination):
+    """
+    Paginação sem `COUNT(*)` exato em listagens grandes (veja
+    `core.db.EstimatedCountPaginator`): acima de PAGINATION_EXACT_COUNT_LIMIT linhas, o
+    `count` é a estimativa do planejador e a resposta traz `count_is_estimate: true`.
+
+    Como o total pode ser aproximado, as páginas não são validadas contra ele: cada
+    página busca `page_size + 1` linhas, e a linha a mais decide se há `next`. Na
+    última página o total é exato (linhas anteriores + linhas da página), sem contar.
+
+    Sem filtros nem busca, views com `count_cache_key` usam a contagem exata guardada
+    pelo comando `refresh_list_counts`, quando houver.
+    """
+    # Parâmetros que não mudam o total da listagem.
+    count_neutral_params = {"page", "page_size", "ordering", "format"}
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.request = request
+        number = self.get_page_number_value(request)
+        bottom = (number - 1) * page_size
+        rows = list(queryset[bottom:bottom + page_size + 1])
+        total = self.estimated_total(queryset, request, view, page_size) if len(rows) > page_size else None
+        return self.set_page(rows, number, page_size, total)
+
+    def get_page_number_value(self, request):
+        value = request.query_params.get(self.page_query_param) or 1
+        try:
+            number = int(value)
+            if number < 1:
+                raise ValueError(value)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_page_message.format(
+                page_number=value, message=gettext("That page number is not an integer"),
+            ))
+        return number
+
+    def estimated_total(self, queryset, request, view, page_size):
+        paginator = EstimatedCountPaginator(queryset, page_size, known_count=self.cached_count(request, view))
+        return paginator.count, paginator.count_is_estimate
+
+    def set_page(self, rows, number, page_size, total):
+        if not rows and number > 1:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=number, message=gettext("That page contains no results"),
+            ))
+        objects = rows[:page_size]
+        seen = (number - 1) * page_size + len(objects)
+        self.page_number = number
+        self.has_next = len(rows) > page_size
+        if self.has_next:
+            count, is_estimate = total
+            # O total nunca fica abaixo das linhas que esta página já provou existir.
+            self.count = max(count, seen + 1)
+            self.count_is_estimate = is_estimate or count < seen + 1
+        else:
+            self.count, self.count_is_estimate = seen, False
+        return objects
+
+    def cached_count(self, request, view):
+        if getattr(view, "count_cache_key", None) is None or set(request.query_params) - self.count_neutral_params:
+            return None
+        return cache.get(list_count_key(view.count_cache_key))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "count": self.count,
+            "count_is_estimate": self.count_is_estimate,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_is_estimate"] = {"type": "boolean", "example": False}
+        return response_schema
+
+
+class AsyncResultsSetPagination(StandardResultsSetPagination):
+    """
+    Mesma paginação da StandardResultsSetPagination para views assíncronas.
+
+    O COUNT e a busca da página usam o ORM assíncrono (`acount` e `async for`);
+    o resto (tamanho da página, links next/previous e formato da resposta) é
+    reaproveitado da classe do DRF.
+    """
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        paginator = self.django_paginator_class(queryset, page_size)
+        # `count` é uma cached_property: preenchemos com o valor obtido de forma assíncrona.
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+
+        bottom = (number - 1) * page_size
+        objects = [obj async for obj in queryset[bottom:bottom + page_size]]
+        self.page = Page(objects, number, paginator)
+        return objects
+
+    def get_paginated_data(self, data):
+        return self.get_paginated_response(data).data
+
+
+class AsyncEstimatedCountPagination(EstimatedCountPagination):
+    """
+    EstimatedCountPagination para views assíncronas: a página vem do ORM assíncrono;
+    a estimativa (`EXPLAIN`) e a contagem limitada rodam numa thread.
+    """
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        number = self.get_page_number_value(request)
+        bottom = (number - 1) * page_size
+        rows = [obj async for obj in queryset[bottom:bottom + page_size + 1]]
+        total = None
+        if len(rows) > page_size:
+            total = await sync_to_async(self.estimated_total)(queryset, request, view, page_size)
+        return self.set_page(rows, number, page_size, total)
+
+    def get_paginated_data(self, data):
+        return self.get_paginated_response(data).data
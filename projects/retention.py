@@ -0,0 +1,68 @@
+"""
+Expurgo de projetos deletados (soft delete) há mais de PROJECT_RETENTION_DAYS dias.
+
+Cada lote é uma transação curta: seleciona até `batch_size` projetos (com
+`SKIP LOCKED` no Postgres, para não esperar por linhas em uso), apaga-os junto com
+documentos e entradas dependentes e, só depois do commit, remove do storage os
+arquivos dos documentos e as imagens. Se a transação for desfeita, nenhum arquivo é
+apagado; se a remoção de um arquivo falhar, ele fica órfão e o erro é registrado.
+
+Projetos com transações não são expurgados: as transações (histórico financeiro)
+apagariam em cascata.
+"""
+import logging
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from marketplace.models import Transaction
+from .models import Document, Project
+
+logger = logging.getLogger(__name__)
+
+
+def purge_cutoff(days):
+    return timezone.now() - timedelta(days=days)
+
+
+def purgeable_projects(cutoff):
+    return (
+        Project.all_objects.dead()
+        .filter(deleted_at__lt=cutoff)
+        .exclude(Exists(Transaction.objects.filter(project=OuterRef("pk"))))
+        .order_by("deleted_at")
+    )
+
+
+def delete_files(names):
+    for name in names:
+        try:
+            default_storage.delete(name)
+        except Exception:
+            logger.warning("Falha ao remover o arquivo '%s' de um projeto expurgado.", name, exc_info=True)
+
+
+def purge_batch(cutoff, batch_size):
+    """Expurga um lote. Retorna (projetos apagados, arquivos agendados para remoção)."""
+    with transaction.atomic():
+        ids = list(
+            purgeable_projects(cutoff).select_for_update(skip_locked=True).values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            return 0, 0
+
+        documents = list(Document.objects.filter(project_id__in=ids).exclude(file="").values_list("file", flat=True))
+        images = set(
+            Project.all_objects.filter(pk__in=ids).exclude(image="").exclude(image__isnull=True)
+            .values_list("image", flat=True)
+        )
+        # Imagens ainda usadas por outros projetos ficam no storage.
+        images -= set(Project.all_objects.filter(image__in=images).exclude(pk__in=ids).values_list("image", flat=True))
+
+        Project.all_objects.filter(pk__in=ids).delete()
+        files = documents + sorted(images)
+        transaction.on_commit(lambda: delete_files(files))
+    return len(ids), len(files)
@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import Project, Document
+from core.signed_media import SignedFileField
+from .models import Project, Document, ProjectCatalogEntry
 from users.models import BaseUser
 
 # Serializer auxiliar para mostrar informações públicas do Ofertante
@@ -13,6 +14,9 @@ class OfertanteInfoSerializer(serializers.ModelSerializer):
 
 # Serializer para os documentos do projeto
 class DocumentSerializer(serializers.ModelSerializer):
+    # URL assinada e com prazo: documentos não são servidos pela rota pública de mídia.
+    file = SignedFileField()
+
     class Meta:
         model = Document
         fields = ["id", "name", "file", "uploaded_at"]
@@ -37,6 +41,34 @@ class ProjectListSerializer(serializers.ModelSerializer):
             'created_at'
         ]
 
+# Ofertante do cartão do catálogo, a partir das colunas desnormalizadas
+class CatalogOfertanteSerializer(serializers.Serializer):
+    id = serializers.UUIDField(source='ofertante_id', read_only=True)
+    organization_name = serializers.CharField(read_only=True)
+
+# Serializer da listagem servida pelo catálogo: mesmo formato de ProjectListSerializer,
+# mais os agregados de vendas
+class ProjectCatalogSerializer(serializers.ModelSerializer):
+    id = serializers.UUIDField(source='project_id', read_only=True)
+    ofertante = CatalogOfertanteSerializer(source='*', read_only=True)
+
+    class Meta:
+        model = ProjectCatalogEntry
+        fields = [
+            'id',
+            'name',
+            'image',
+            'project_type',
+            'status',
+            'carbon_credits_available',
+            'price_per_credit',
+            'location',
+            'ofertante',
+            'created_at',
+            'credits_sold',
+            'transaction_count'
+        ]
+
 # Serializer para a visão detalhada de um projeto (todos os campos)
 class ProjectDetailSerializer(serializers.ModelSerializer):
     ofertante = OfertanteInfoSerializer(read_only=True)
@@ -1,11 +1,40 @@
-from django.test import TestCase
+import io
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import Group
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
+from PIL import Image
+
+from users.models import BaseUser, OfertanteProfile, validate_cnpj
+from marketplace.models import ArchivedTransactionPartition, OutboxEvent, Transaction
+from .models import Document, Project, ProjectCatalogEntry
+from .serializers import ProjectListSerializer
+
 
-from users.models import BaseUser
-from .models import Project
+def use_temp_media_root(test):
+	"""Aponta MEDIA_ROOT para um diretório temporário, removido ao fim do teste."""
+	media_root = tempfile.mkdtemp()
+	test.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+	media_settings = override_settings(MEDIA_ROOT=media_root)
+	media_settings.enable()
+	test.addCleanup(media_settings.disable)
 
 
 class ProjectApprovalFlowTests(TestCase):
@@ -64,3 +93,353 @@ class ProjectApprovalFlowTests(TestCase):
 		self.assertEqual(res_act.status_code, status.HTTP_200_OK)
 		self.project.refresh_from_db()
 		self.assertEqual(self.project.status, Project.Status.ACTIVE)
+
+
+class GenerateSyntheticDataTests(TestCase):
+	def run_generator(self, **options):
+		defaults = {"ofertantes": 3, "compradores": 5, "projects": 8, "transactions": 20, "batch_size": 4, "seed": 7}
+		defaults.update(options)
+		call_command("generate_synthetic_data", stdout=StringIO(), **defaults)
+
+	def test_generates_requested_volumes(self):
+		self.run_generator()
+		self.assertEqual(BaseUser.objects.filter(user_type=BaseUser.UserType.OFERTANTE).count(), 3)
+		self.assertEqual(BaseUser.objects.filter(user_type=BaseUser.UserType.COMPRADOR).count(), 5)
+		self.assertEqual(Project.objects.count(), 8)
+		self.assertEqual(Transaction.objects.count(), 20)
+
+		comprador = BaseUser.objects.filter(user_type=BaseUser.UserType.COMPRADOR).first()
+		self.assertTrue(comprador.check_password("Teste#123"))
+		validate_cnpj(comprador.comprador_organization.cnpj)
+
+	def test_same_seed_is_deterministic(self):
+		self.run_generator()
+		first = sorted(Transaction.objects.values_list("id", flat=True))
+		self.run_generator(clear=True)
+		second = sorted(Transaction.objects.values_list("id", flat=True))
+		self.assertEqual(first, second)
+
+
+class IndexAdvisorTests(TestCase):
+	def test_hot_queries_use_indexes(self):
+		out = StringIO()
+		call_command("index_advisor", "--fail-on-seq-scan", stdout=out)
+		self.assertIn("Todas as consultas usam índices.", out.getvalue())
+
+
+class AsyncProjectEndpointsTests(TestCase):
+	def setUp(self):
+		self.ofertante = BaseUser.objects.create_user(
+			email="ofertante@example.com", password="Test#123", user_type=BaseUser.UserType.OFERTANTE,
+		)
+		self.active = Project.objects.create(
+			ofertante=self.ofertante, name="Ativo", project_type=Project.ProjectType.AGRICULTURA,
+			status=Project.Status.ACTIVE, carbon_credits_available=10, price_per_credit=20,
+		)
+		self.draft = Project.objects.create(
+			ofertante=self.ofertante, name="Rascunho", project_type=Project.ProjectType.OUTRO,
+			status=Project.Status.DRAFT, carbon_credits_available=10, price_per_credit=30,
+		)
+
+	def test_async_list_matches_sync_list(self):
+		sync_res = self.client.get(reverse("project-list"))
+		async_res = self.client.get(reverse("project-async-list"))
+		self.assertEqual(async_res.status_code, status.HTTP_200_OK)
+		self.assertEqual(async_res.json(), sync_res.json())
+
+	def test_async_list_rejects_invalid_page(self):
+		res = self.client.get(reverse("project-async-list"), {"page": 5})
+		self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+	def test_async_detail_hides_non_active_projects(self):
+		ok = self.client.get(reverse("project-async-detail", kwargs={"pk": self.active.id}))
+		hidden = self.client.get(reverse("project-async-detail", kwargs={"pk": self.draft.id}))
+		self.assertEqual(ok.status_code, status.HTTP_200_OK)
+		self.assertEqual(ok.json()["name"], "Ativo")
+		self.assertEqual(hidden.status_code, status.HTTP_404_NOT_FOUND)
+
+	def test_facets_count_active_projects(self):
+		res = self.client.get(reverse("project-async-facets"))
+		self.assertEqual(res.json(), {
+			"count": 1,
+			"project_type": [{"value": "AGRICULTURA", "label": "Agricultura de Baixo Carbono", "count": 1}],
+			"price_per_credit": {"min": "20.00", "max": "20.00"},
+		})
+
+
+class ProjectConditionalGetTests(TestCase):
+	def setUp(self):
+		self.ofertante = BaseUser.objects.create_user(
+			email="ofertante@example.com", password="Test#123", user_type=BaseUser.UserType.OFERTANTE,
+		)
+		self.project = Project.objects.create(
+			ofertante=self.ofertante, name="Ativo", project_type=Project.ProjectType.AGRICULTURA,
+			status=Project.Status.ACTIVE, carbon_credits_available=10, price_per_credit=20,
+		)
+		self.detail_url = reverse("project-detail", kwargs={"pk": str(self.project.id)})
+
+	def test_retrieve_returns_304_for_current_etag(self):
+		res = self.client.get(self.detail_url)
+		self.assertEqual(res.status_code, status.HTTP_200_OK)
+		self.assertIn("ETag", res)
+		self.assertIn("Last-Modified", res)
+
+		cached = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=res["ETag"])
+		self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+	def test_retrieve_etag_changes_after_update(self):
+		etag = self.client.get(self.detail_url)["ETag"]
+		self.project.carbon_credits_available = 5
+		self.project.save()
+
+		res = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+		self.assertEqual(res.status_code, status.HTTP_200_OK)
+		self.assertNotEqual(res["ETag"], etag)
+
+	def test_retrieve_validators_change_with_signed_media_window(self):
+		now = time.time()
+		with mock.patch("core.signed_media.time.time", return_value=now):
+			res = self.client.get(self.detail_url)
+			self.assertEqual(
+				self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=res["ETag"]).status_code,
+				status.HTTP_304_NOT_MODIFIED,
+			)
+		# Na janela seguinte, as URLs assinadas da cópia em cache já não são as atuais.
+		with mock.patch("core.signed_media.time.time", return_value=now + settings.SIGNED_MEDIA_BUCKET):
+			by_etag = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=res["ETag"])
+			by_date = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=res["Last-Modified"])
+		self.assertEqual(by_etag.status_code, status.HTTP_200_OK)
+		self.assertEqual(by_date.status_code, status.HTTP_200_OK)
+
+	def test_list_returns_304_until_a_project_changes(self):
+		url = reverse("project-list")
+		etag = self.client.get(url)["ETag"]
+		self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+		Project.objects.create(
+			ofertante=self.ofertante, name="Novo", project_type=Project.ProjectType.OUTRO,
+			status=Project.Status.ACTIVE, carbon_credits_available=1, price_per_credit=1,
+		)
+		self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+
+class ProjectCatalogTests(TestCase):
+	def setUp(self):
+		self.ofertante = BaseUser.objects.create_user(
+			email="ofertante@example.com", password="Test#123", user_type=BaseUser.UserType.OFERTANTE,
+		)
+		self.buyer = BaseUser.objects.create_user(
+			email="comprador@example.com", password="Test#123", user_type=BaseUser.UserType.COMPRADOR,
+		)
+		self.profile = OfertanteProfile.objects.create(
+			user=self.ofertante, contact_name="Ana", contact_position="Diretora", phone="11999999999",
+			organization_type=OfertanteProfile.OrganizationType.ONG, organization_name="Verde Vivo",
+		)
+		self.project = Project.objects.create(
+			ofertante=self.ofertante, name="Ativo", project_type=Project.ProjectType.AGRICULTURA,
+			status=Project.Status.ACTIVE, carbon_credits_available=10, price_per_credit=20,
+		)
+
+	def test_list_keeps_list_serializer_shape(self):
+		item = self.client.get(reverse("project-list")).json()["results"][0]
+		expected = ProjectListSerializer(self.project, context={"request": None}).data
+		self.assertEqual({key: item[key] for key in expected}, expected)
+		self.assertEqual(item["ofertante"]["organization_name"], "Verde Vivo")
+		self.assertEqual((item["credits_sold"], item["transaction_count"]), (0, 0))
+
+	def test_entry_follows_purchases_and_profile_changes(self):
+		self.client.force_login(self.buyer)
+		res = self.client.post(reverse("marketplace:transaction-list"), {"project": str(self.project.id), "quantity": 4})
+		self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+		self.profile.organization_name = "Verde Vivo Ltda"
+		self.profile.save()
+
+		entry = ProjectCatalogEntry.objects.get(project=self.project)
+		self.assertEqual((entry.carbon_credits_available, entry.credits_sold, entry.transaction_count), (6, 4, 1))
+		self.assertEqual(entry.organization_name, "Verde Vivo Ltda")
+
+		Transaction.objects.filter(project=self.project).update(status=Transaction.Status.REJECTED)
+		call_command("rebuild_project_catalog", stdout=StringIO())
+		entry.refresh_from_db()
+		self.assertEqual((entry.credits_sold, entry.transaction_count), (0, 0))
+
+	def test_status_changes_apply_deltas_without_reaggregating(self):
+		tx = Transaction.objects.create(
+			buyer=self.buyer, project=self.project, quantity=4, price_per_credit_at_purchase=20, total_price=80,
+		)
+		entry = ProjectCatalogEntry.objects.get(project=self.project)
+		for new_status, expected in [
+			(Transaction.Status.APPROVED, (4, 1)),
+			(Transaction.Status.REJECTED, (0, 0)),
+			(Transaction.Status.PENDING, (4, 1)),
+		]:
+			tx = Transaction.objects.get(pk=tx.pk)
+			tx.status = new_status
+			with CaptureQueriesContext(connection) as queries:
+				tx.save()
+			self.assertFalse(any("SUM(" in query["sql"] for query in queries))
+			entry.refresh_from_db()
+			self.assertEqual((entry.credits_sold, entry.transaction_count), expected)
+
+	def test_rebuild_keeps_sales_after_archival(self):
+		Transaction.objects.create(
+			buyer=self.buyer, project=self.project, quantity=4, price_per_credit_at_purchase=20, total_price=80,
+		)
+		# Simula o arquivamento: as linhas saem do banco e a partição fica registrada.
+		Transaction.objects.all().delete()
+		ArchivedTransactionPartition.objects.create(
+			name="marketplace_transaction_p202401", month="2024-01-01", row_count=1, path="/tmp/p202401.csv.gz",
+		)
+		Project.objects.filter(pk=self.project.pk).update(name="Renomeado")
+		call_command("rebuild_project_catalog", stdout=StringIO())
+
+		entry = ProjectCatalogEntry.objects.get(project=self.project)
+		self.assertEqual(entry.name, "Renomeado")
+		self.assertEqual((entry.credits_sold, entry.transaction_count), (4, 1))
+
+	def test_soft_deleted_project_leaves_catalog(self):
+		self.project.soft_delete()
+		self.assertFalse(ProjectCatalogEntry.objects.filter(project=self.project).exists())
+		self.assertEqual(self.client.get(reverse("project-list")).json()["count"], 0)
+
+
+class ProjectBulkImportTests(TestCase):
+	def setUp(self):
+		use_temp_media_root(self)
+		self.client = APIClient()
+		self.ofertante = BaseUser.objects.create_user(
+			email="parceiro@example.com", password="Test#123", user_type=BaseUser.UserType.OFERTANTE,
+		)
+		OfertanteProfile.objects.create(user=self.ofertante, organization_name="Parceiro Multi", contact_name="Ana", phone="11999999999")
+		self.client.force_authenticate(self.ofertante)
+
+	def test_json_import_creates_projects_catalog_and_events(self):
+		projects = [
+			{"name": f"Projeto {i}", "project_type": "REFLORESTAMENTO", "carbon_credits_available": 100 + i, "price_per_credit": "25.50"}
+			for i in range(50)
+		]
+		projects.append({"name": "Sem tipo", "price_per_credit": "10"})
+		projects.append({"name": "Latitude ruim", "project_type": "OUTRO", "latitude": "95"})
+		with self.assertNumQueries(6):
+			res = self.client.post(reverse("project-bulk-import"), {"projects": projects}, format="json")
+		self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+		self.assertEqual(res.data["created"], 50)
+		self.assertEqual([error["row"] for error in res.data["errors"]], [51, 52])
+		self.assertEqual(Project.objects.filter(ofertante=self.ofertante).count(), 50)
+		entry = ProjectCatalogEntry.objects.get(name="Projeto 7")
+		self.assertEqual((entry.organization_name, entry.carbon_credits_available), ("Parceiro Multi", 107))
+		self.assertEqual(OutboxEvent.objects.filter(event_type="project.created").count(), 50)
+
+	def test_csv_import_with_images_from_zip(self):
+		image = io.BytesIO()
+		Image.new("RGB", (2, 2)).save(image, "PNG")
+		archive = io.BytesIO()
+		with zipfile.ZipFile(archive, "w") as zip_file:
+			zip_file.writestr("fotos/mata.png", image.getvalue())
+		csv_content = (
+			"name;project_type;carbon_credits_available;price_per_credit;image\n"
+			"Mata Atlântica;REFLORESTAMENTO;500;30.00;fotos/mata.png\n"
+			"Sem imagem;OUTRO;10;5;faltando.png\n"
+		).encode()
+		res = self.client.post(reverse("project-bulk-import"), {
+			"file": SimpleUploadedFile("projetos.csv", csv_content, content_type="text/csv"),
+			"images": SimpleUploadedFile("imagens.zip", archive.getvalue(), content_type="application/zip"),
+		}, format="multipart")
+		self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+		self.assertEqual(res.data["errors"], [{"row": 3, "errors": {"image": ["'faltando.png' não está no zip."]}}])
+		project = Project.objects.get(name="Mata Atlântica")
+		self.assertTrue(project.image.name.startswith("projects/images/mata"))
+
+	def test_only_ofertantes_can_import(self):
+		comprador = BaseUser.objects.create_user(email="c@example.com", password="x", user_type=BaseUser.UserType.COMPRADOR)
+		self.client.force_authenticate(comprador)
+		res = self.client.post(reverse("project-bulk-import"), {"projects": []}, format="json")
+		self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ProjectSaveValidationTests(TestCase):
+	def setUp(self):
+		self.ofertante = BaseUser.objects.create_user(
+			email="ofertante@example.com", password="Test#123", user_type=BaseUser.UserType.OFERTANTE,
+		)
+		self.comprador = BaseUser.objects.create_user(
+			email="comprador@example.com", password="Test#123", user_type=BaseUser.UserType.COMPRADOR,
+		)
+		project = Project.objects.create(
+			ofertante=self.ofertante, name="Projeto", project_type=Project.ProjectType.OUTRO,
+			status=Project.Status.ACTIVE, carbon_credits_available=10, price_per_credit=20,
+		)
+		self.project = Project.objects.get(pk=project.pk)
+
+	def test_update_fields_skips_owner_query(self):
+		self.project.carbon_credits_available = 5
+		# UPDATE do projeto + UPDATE da entrada do catálogo; nenhuma leitura do ofertante.
+		with self.assertNumQueries(2):
+			self.project.save(update_fields=["carbon_credits_available", "updated_at"])
+
+	def test_update_fields_validates_only_written_fields(self):
+		self.project.name = "x" * 500
+		self.project.carbon_credits_available = 5
+		self.project.save(update_fields=["carbon_credits_available", "updated_at"])
+		with self.assertRaises(ValidationError):
+			self.project.save(update_fields=["name", "updated_at"])
+
+	def test_owner_change_is_revalidated(self):
+		self.project.ofertante = self.comprador
+		with self.assertRaises(ValidationError):
+			self.project.save()
+
+
+class ProjectSoftDeleteTests(TestCase):
+	def setUp(self):
+		use_temp_media_root(self)
+		self.ofertante = BaseUser.objects.create_user(
+			email="ofertante@example.com", password="Test#123", user_type=BaseUser.UserType.OFERTANTE,
+		)
+
+	def create_project(self, name, deleted_days_ago=None):
+		project = Project.objects.create(
+			ofertante=self.ofertante, name=name, project_type=Project.ProjectType.OUTRO,
+			status=Project.Status.ACTIVE, carbon_credits_available=10, price_per_credit=20,
+		)
+		if deleted_days_ago is not None:
+			project.soft_delete()
+			Project.all_objects.filter(pk=project.pk).update(deleted_at=timezone.now() - timedelta(days=deleted_days_ago))
+		return project
+
+	def test_default_manager_hides_deleted_projects(self):
+		alive = self.create_project("Viva")
+		dead = self.create_project("Deletada")
+		dead.soft_delete()
+		self.assertIsNotNone(Project.all_objects.get(pk=dead.pk).deleted_at)
+		self.assertEqual(list(Project.objects.values_list("pk", flat=True)), [alive.pk])
+		self.assertEqual(Project.all_objects.count(), 2)
+		self.assertEqual(list(Project.all_objects.dead().values_list("pk", flat=True)), [dead.pk])
+
+	def test_purge_removes_old_deleted_projects_and_files(self):
+		old = self.create_project("Antiga", deleted_days_ago=400)
+		document = Document.objects.create(
+			project=old, name="Laudo", file=SimpleUploadedFile("laudo.pdf", b"%PDF-1.4", content_type="application/pdf"),
+		)
+		path = document.file.path
+		recent = self.create_project("Recente", deleted_days_ago=10)
+		sold = self.create_project("Vendida", deleted_days_ago=400)
+		buyer = BaseUser.objects.create_user(email="c@example.com", password="x", user_type=BaseUser.UserType.COMPRADOR)
+		Transaction.objects.create(buyer=buyer, project=sold, quantity=1, price_per_credit_at_purchase=20, total_price=20)
+
+		out = StringIO()
+		with self.captureOnCommitCallbacks(execute=True):
+			call_command("purge_deleted_projects", "--older-than-days", "180", "--batch-size", "1", "--pause", "0", stdout=out)
+
+		self.assertFalse(Project.all_objects.filter(pk=old.pk).exists())
+		self.assertFalse(Document.objects.filter(pk=document.pk).exists())
+		self.assertFalse(os.path.exists(path))
+		self.assertEqual(set(Project.all_objects.values_list("pk", flat=True)), {recent.pk, sold.pk})
+		self.assertIn("1 projetos expurgados, 1 arquivos removidos.", out.getvalue())
+
+	def test_dry_run_keeps_projects(self):
+		self.create_project("Antiga", deleted_days_ago=400)
+		out = StringIO()
+		call_command("purge_deleted_projects", "--dry-run", stdout=out)
+		self.assertIn("1 projetos seriam expurgados.", out.getvalue())
+		self.assertEqual(Project.all_objects.count(), 1)
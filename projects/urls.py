@@ -2,10 +2,16 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import ProjectViewSet
+from . import async_views
 
 router = DefaultRouter()
 router.register(r"", ProjectViewSet, basename="project")
 
 urlpatterns = [
+    # Rotas assíncronas de leitura; precisam vir antes do router, cujo detalhe
+    # (`<pk>/`) capturaria o prefixo "async/".
+    path("async/", async_views.project_list, name="project-async-list"),
+    path("async/facets/", async_views.project_facets, name="project-async-facets"),
+    path("async/<uuid:pk>/", async_views.project_detail, name="project-async-detail"),
     path("", include(router.urls)),
 ]
@@ -3,19 +3,28 @@ from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticate
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.settings import api_settings
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter, SearchFilter
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from django.utils import timezone
+from rest_framework.exceptions import ValidationError
 
-from .models import Project, Document
-from .serializers import ProjectListSerializer, ProjectDetailSerializer, DocumentSerializer
+from .models import Project, Document, ProjectCatalogEntry
+from .serializers import ProjectCatalogSerializer, ProjectListSerializer, ProjectDetailSerializer, DocumentSerializer
 from .permissions import IsProjectOwnerOrReadOnly
-from .filters import ProjectFilter
+from .filters import ProjectCatalogFilter, ProjectFilter
 from .pagination import StandardResultsSetPagination
+from .bulk_import import import_projects, parse_rows, read_rows
+from .conditional import not_modified_response, project_validators, queryset_validators, set_validators
+from core.fast_serializers import FastListMixin
 from users.permissions import IsAuditor
+from marketplace.live import publish_credits_changed
+from marketplace.outbox import project_payload, record_event
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciar Projetos.
 
@@ -28,39 +37,77 @@ class ProjectViewSet(viewsets.ModelViewSet):
     - `upload_document`: Adiciona um documento a um projeto.
     """
     permission_classes = [IsAuthenticatedOrReadOnly, IsProjectOwnerOrReadOnly]
+    # Leituras (GET) podem ser atendidas por uma réplica; veja core/db_routers.py.
+    use_read_replica = True
     pagination_class = StandardResultsSetPagination
     filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
-    filterset_class = ProjectFilter
     ordering_fields = ["created_at", "price_per_credit", "carbon_credits_available", "name"]
     search_fields = ["name", "description", "location", "project_type"]
     parser_classes = [MultiPartParser, FormParser]
 
     def get_queryset(self):
         user = self.request.user
-        # Para a ação 'list', mostramos apenas projetos ativos a todos.
+        # Para a ação 'list', mostramos apenas projetos ativos a todos, lidos do
+        # catálogo desnormalizado (uma tabela, sem joins nem agregações).
         if self.action == 'list':
-            return Project.objects.alive().filter(status=Project.Status.ACTIVE)
+            return ProjectCatalogEntry.objects.filter(status=Project.Status.ACTIVE)
         
         # Se o usuário não estiver autenticado, ele só pode ver projetos ativos.
         if not user.is_authenticated:
-            return Project.objects.alive().filter(status=Project.Status.ACTIVE)
+            return Project.objects.filter(status=Project.Status.ACTIVE)
 
         # Usuários autenticados (donos ou não) podem ver projetos em outros status
         # A permissão IsProjectOwnerOrReadOnly cuidará do acesso de escrita.
-        return Project.objects.alive()
+        return Project.objects.all()
+
+    @property
+    def filterset_class(self):
+        return ProjectCatalogFilter if self.action == 'list' else ProjectFilter
 
     def get_serializer_class(self):
-        if self.action == 'list' or self.action == 'my':
+        if self.action == 'list':
+            return ProjectCatalogSerializer
+        if self.action == 'my':
             return ProjectListSerializer
         return ProjectDetailSerializer
 
+    def list(self, request, *args, **kwargs):
+        # Responde 304 antes de paginar/serializar quando a listagem não mudou.
+        queryset = self.filter_queryset(self.get_queryset())
+        etag, last_modified = queryset_validators(request, queryset)
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        return set_validators(self.fast_list_response(queryset), etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = project_validators(request, instance)
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        serializer = self.get_serializer(instance)
+        return set_validators(Response(serializer.data), etag, last_modified)
+
+    @transaction.atomic
     def perform_create(self, serializer):
         # Associa o usuário logado como o ofertante do projeto.
-        serializer.save(ofertante=self.request.user)
-
+        project = serializer.save(ofertante=self.request.user)
+        record_event("project.created", project, project_payload(project))
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        previous_credits = serializer.instance.carbon_credits_available
+        project = serializer.save()
+        record_event("project.updated", project, project_payload(project))
+        if project.carbon_credits_available != previous_credits:
+            publish_credits_changed(project)
+
+    @transaction.atomic
     def perform_destroy(self, instance):
         # Usa soft delete em vez de apagar o registro do banco.
         instance.soft_delete()
+        record_event("project.deleted", instance, project_payload(instance))
 
     @action(detail=False, methods=["get"], url_path="my")
     def my(self, request):
@@ -68,13 +115,37 @@ class ProjectViewSet(viewsets.ModelViewSet):
         if not request.user.is_authenticated:
             return Response({"detail": "Autenticação requerida."}, status=status.HTTP_401_UNAUTHORIZED)
         
-        qs = Project.objects.alive().filter(ofertante=request.user)
-        page = self.paginate_queryset(qs)
-        ser = self.get_serializer(page or qs, many=True)
-        
-        if page is not None:
-            return self.get_paginated_response(ser.data)
-        return Response(ser.data)
+        qs = Project.objects.filter(ofertante=request.user)
+        return self.fast_list_response(qs)
+
+    @action(
+        detail=False, methods=["post"], url_path="import",
+        permission_classes=[IsAuthenticated], parser_classes=[api_settings.DEFAULT_PARSER_CLASSES[0], MultiPartParser, FormParser],
+    )
+    def bulk_import(self, request):
+        """
+        Importa projetos em lote para o Ofertante logado: JSON (`{"projects": [...]}`) ou
+        multipart com `file` (CSV/JSON) e, opcionalmente, `images` (zip referenciado pela
+        coluna `image`). Responde com os IDs criados e os erros por linha.
+        """
+        if request.user.user_type != "OFERTANTE":
+            return Response(
+                {"detail": "Apenas usuários do tipo 'Ofertante' podem criar projetos."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        try:
+            if "file" in request.FILES:
+                rows, first_row = read_rows(request.FILES["file"])
+            elif request.content_type.startswith("application/json"):
+                rows, first_row = parse_rows(request.data), 1
+            else:
+                return Response({"detail": "Envie um JSON ou um arquivo no campo 'file'."}, status=status.HTTP_400_BAD_REQUEST)
+            result = import_projects(
+                request.user, rows, archive=request.FILES.get("images"), request=request, first_row=first_row
+            )
+        except DjangoValidationError as exc:
+            raise ValidationError({"detail": exc.messages})
+        return Response(result.as_dict(), status=status.HTTP_201_CREATED if result.created else status.HTTP_400_BAD_REQUEST)
 
     @action(
         detail=True, methods=["post"], url_path="documents",
@@ -92,11 +163,15 @@ class ProjectViewSet(viewsets.ModelViewSet):
         
         doc_name = request.data.get("name") or file_obj.name
         document = Document.objects.create(project=project, name=doc_name, file=file_obj)
+        # Os documentos fazem parte do detalhe do projeto: atualiza `updated_at` para
+        # invalidar a ETag sem passar pelo `full_clean()` do save.
+        Project.objects.filter(pk=project.pk).update(updated_at=timezone.now())
         serializer = DocumentSerializer(document)
         
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=["post"], url_path="validate", permission_classes=[IsAuthenticated, IsAuditor])
+    @transaction.atomic
     def validate_project(self, request, pk=None):
         """Valida um projeto (ação reservada a usuários do grupo Auditor)."""
         project = self.get_object()
@@ -108,11 +183,13 @@ class ProjectViewSet(viewsets.ModelViewSet):
         project.validated_by = request.user
         project.validated_at = timezone.now()
         project.save(update_fields=["status", "validated_by", "validated_at", "updated_at"])
+        record_event("project.validated", project, dict(project_payload(project), validated_by=request.user.pk))
 
         serializer = ProjectDetailSerializer(project)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["post"], url_path="activate", permission_classes=[IsAuthenticated, IsProjectOwnerOrReadOnly])
+    @transaction.atomic
     def activate_project(self, request, pk=None):
         """Ativa um projeto já VALIDATED (ação reservada ao dono do projeto)."""
         project = self.get_object()
@@ -126,13 +203,14 @@ class ProjectViewSet(viewsets.ModelViewSet):
 
         project.status = Project.Status.ACTIVE
         project.save(update_fields=["status", "updated_at"])
+        record_event("project.activated", project, project_payload(project))
         serializer = ProjectDetailSerializer(project)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=["get"], url_path="pending-validation", permission_classes=[IsAuthenticated, IsAuditor])
     def pending_validation(self, request):
         """Lista projetos pendentes de validação para auditores."""
-        qs = Project.objects.alive().exclude(status__in=[Project.Status.ACTIVE, Project.Status.VALIDATED])
+        qs = Project.objects.exclude(status__in=[Project.Status.ACTIVE, Project.Status.VALIDATED])
         page = self.paginate_queryset(qs)
         ser = self.get_serializer(page or qs, many=True)
 
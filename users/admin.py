@@ -1,15 +1,18 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+
+from core.admin_tools import AutocompleteFilter, ScalableAdminMixin
 from .models import BaseUser, OfertanteProfile, OfertanteDocument
 
 
 @admin.register(BaseUser)
-class BaseUserAdmin(UserAdmin):
+class BaseUserAdmin(ScalableAdminMixin, UserAdmin):
     model = BaseUser
     list_display = ("email", "user_type", "is_active", "is_staff", "is_verified", "verification_status")
     list_filter = ("user_type", "is_active", "is_verified", "is_staff")
     search_fields = ("email",)
     ordering = ("email",)
+    cursor_ordering = ("email",)
     fieldsets = (
         (None, {"fields": ("email", "password")}),
         ("Info", {"fields": ("user_type", "is_verified", "verification_status")}),
@@ -24,14 +27,17 @@ class BaseUserAdmin(UserAdmin):
     )
 
 @admin.register(OfertanteProfile)
-class OfertanteProfileAdmin(admin.ModelAdmin):
+class OfertanteProfileAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ('organization_name', 'user', 'contact_name', 'organization_type')
+    list_select_related = ('user',)
     search_fields = ('organization_name', 'cnpj', 'user__email')
     autocomplete_fields = ('user',)
 
 @admin.register(OfertanteDocument)
-class OfertanteDocumentAdmin(admin.ModelAdmin):
+class OfertanteDocumentAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ('user', 'document_type', 'verified', 'uploaded_at')
+    list_select_related = ('user',)
     search_fields = ('user__email',)
-    list_filter = ('document_type', 'verified')
+    list_filter = ('document_type', 'verified', ('user', AutocompleteFilter))
     autocomplete_fields = ('user',)
+    cursor_ordering = ('-uploaded_at', '-id')
@@ -0,0 +1,50 @@
+"""
+BasicAuthentication com cache da verificação de senha.
+
+O `BasicAuthentication` do DRF roda o hash PBKDF2 da senha a cada requisição. Aqui,
+depois de uma verificação bem-sucedida, guardamos no cache (por BASIC_AUTH_CACHE_TTL
+segundos) o par (pk do usuário, impressão digital da conta):
+
+- a chave é um HMAC-SHA256 (com a SECRET_KEY) de usuário + senha, então nem o Redis
+  nem quem o lê vê a senha ou consegue testar senhas contra as chaves;
+- a impressão digital é um HMAC do hash de senha armazenado e do e-mail: trocar a
+  senha (ou o e-mail) muda o valor e a entrada deixa de valer na hora.
+
+Usuários inativos continuam sendo recusados mesmo com a entrada no cache.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils.crypto import constant_time_compare, salted_hmac
+from rest_framework.authentication import BasicAuthentication
+
+KEY_PREFIX = "basicauth:"
+SALT = "users.authentication.CachedBasicAuthentication"
+
+
+def _cache():
+    return caches[settings.BASIC_AUTH_CACHE]
+
+
+def credentials_key(userid, password):
+    return KEY_PREFIX + salted_hmac(SALT, f"{userid}\0{password}", algorithm="sha256").hexdigest()
+
+
+def account_fingerprint(user):
+    return salted_hmac(SALT, f"{user.get_username()}\0{user.password}", algorithm="sha256").hexdigest()
+
+
+class CachedBasicAuthentication(BasicAuthentication):
+    def authenticate_credentials(self, userid, password, request=None):
+        key = credentials_key(userid, password)
+        cached = _cache().get(key)
+        if cached is not None:
+            user_pk, fingerprint = cached
+            user = get_user_model()._default_manager.filter(pk=user_pk).first()
+            if user is not None and user.is_active and constant_time_compare(fingerprint, account_fingerprint(user)):
+                return (user, None)
+            _cache().delete(key)
+
+        user, auth = super().authenticate_credentials(userid, password, request)
+        _cache().set(key, (user.pk, account_fingerprint(user)), timeout=settings.BASIC_AUTH_CACHE_TTL)
+        return (user, auth)
@@ -0,0 +1,208 @@
+"""
+Importação em lote de compradores (usuário COMPRADOR + CompradorProfile +
+CompradorOrganization) a partir de CSV ou XLSX.
+
+O arquivo inteiro é validado numa passada: campos de cada linha, dígitos
+verificadores de todos os CNPJs, duplicidades dentro do arquivo e contra o banco
+(uma consulta para e-mails e uma para CNPJs). As linhas válidas são criadas com
+`bulk_create` numa única transação; as inválidas voltam no relatório com o número da
+linha no arquivo, sem interromper o lote.
+
+Colunas (cabeçalho na primeira linha; maiúsculas/espaços são ignorados):
+email, company_name, cnpj, website, phone (obrigatórias) e password, contact_name,
+contact_position, department, industry_sector, company_size (opcionais). Sem
+`password`, a conta é criada com senha inutilizável (definida depois pelo usuário).
+
+O arquivo tem no máximo COMPRADOR_IMPORT_MAX_ROWS linhas, e no máximo
+COMPRADOR_IMPORT_MAX_PASSWORDS delas com `password`: cada senha custa um hash PBKDF2
+na própria requisição. Os limites são conferidos antes de qualquer hash.
+"""
+import csv
+import io
+import re
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+
+from .models import BaseUser, CompradorOrganization, CompradorProfile, cnpj_check_digits
+
+REQUIRED_COLUMNS = ("email", "company_name", "cnpj", "website", "phone")
+PROFILE_FIELDS = ("phone", "contact_name", "contact_position", "department")
+ORGANIZATION_FIELDS = ("company_name", "website", "industry_sector", "company_size")
+BATCH_SIZE = 500
+
+
+@dataclass
+class ImportResult:
+    total_rows: int = 0
+    created: int = 0
+    errors: list = field(default_factory=list)
+
+    def as_dict(self):
+        return {"total_rows": self.total_rows, "created": self.created, "errors": self.errors}
+
+
+def read_rows(uploaded_file):
+    """Lê CSV (`,` ou `;`, UTF-8) ou XLSX e devolve uma lista de dicts com as colunas normalizadas."""
+    name = (getattr(uploaded_file, "name", "") or "").lower()
+    if name.endswith(".xlsx"):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ValidationError("Importação de XLSX requer o pacote openpyxl; envie um CSV.")
+        sheet = load_workbook(uploaded_file, read_only=True, data_only=True).active
+        rows = sheet.iter_rows(values_only=True)
+    else:
+        text = io.TextIOWrapper(uploaded_file, encoding="utf-8-sig", newline="")
+        sample = text.read(4096)
+        text.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;")
+        except csv.Error:
+            dialect = csv.excel
+        rows = csv.reader(text, dialect)
+
+    header = next(rows, None)
+    if not header:
+        raise ValidationError("Arquivo vazio.")
+    columns = [str(column or "").strip().lower() for column in header]
+    missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+    if missing:
+        raise ValidationError(f"Colunas obrigatórias ausentes: {', '.join(missing)}.")
+
+    return [
+        {column: "" if value is None else str(value).strip() for column, value in zip(columns, row)}
+        for row in rows
+        if any(value not in (None, "") for value in row)
+    ]
+
+
+def invalid_cnpjs(values):
+    """Conjunto dos CNPJs (só dígitos) com formato ou dígitos verificadores inválidos."""
+    return {
+        digits for digits in values
+        if len(digits) != 14 or digits == digits[0] * 14 or digits[-2:] != cnpj_check_digits(digits[:12])
+    }
+
+
+def format_cnpj(digits):
+    return f"{digits[:2]}.{digits[2:5]}.{digits[5:8]}/{digits[8:12]}-{digits[12:]}"
+
+
+def _field_errors(model, row, names):
+    errors = {}
+    for name in names:
+        model_field = model._meta.get_field(name)
+        value = row.get(name) or None
+        if value is None and model_field.has_default():
+            continue
+        try:
+            model_field.clean(value, None)
+        except ValidationError as exc:
+            errors[name] = exc.messages
+    return errors
+
+
+def validate_rows(rows):
+    """
+    Valida todas as linhas. Retorna (linhas válidas com campos normalizados, erros por
+    linha). Os números de linha contam o cabeçalho como linha 1.
+    """
+    errors = {}
+    for number, row in enumerate(rows, start=2):
+        row["_line"] = number
+        row["email"] = BaseUser.objects.normalize_email(row.get("email", ""))
+        row["cnpj"] = re.sub(r"\D", "", row.get("cnpj", ""))
+        row_errors = _field_errors(CompradorProfile, row, PROFILE_FIELDS)
+        row_errors.update(_field_errors(CompradorOrganization, row, ORGANIZATION_FIELDS))
+        try:
+            validate_email(row["email"])
+        except ValidationError as exc:
+            row_errors["email"] = exc.messages
+        if row_errors:
+            errors[number] = row_errors
+
+    bad_cnpjs = invalid_cnpjs({row["cnpj"] for row in rows})
+    emails = {row["email"].lower() for row in rows}
+    cnpjs = {row["cnpj"] for row in rows} - bad_cnpjs
+    existing_emails = set(
+        BaseUser.objects.annotate(email_lower=Lower("email"))
+        .filter(email_lower__in=emails).values_list("email_lower", flat=True)
+    )
+    # CNPJs já cadastrados podem estar com ou sem pontuação.
+    existing_cnpjs = {
+        re.sub(r"\D", "", value) for value in CompradorOrganization.objects.filter(
+            cnpj__in=[*cnpjs, *(format_cnpj(digits) for digits in cnpjs)]
+        ).values_list("cnpj", flat=True)
+    }
+
+    seen_emails, seen_cnpjs, valid = set(), set(), []
+    for row in rows:
+        row_errors = errors.setdefault(row["_line"], {})
+        email = row["email"].lower()
+        if row["cnpj"] in bad_cnpjs:
+            row_errors.setdefault("cnpj", []).append("CNPJ inválido.")
+        elif row["cnpj"] in existing_cnpjs:
+            row_errors.setdefault("cnpj", []).append("CNPJ já cadastrado.")
+        elif row["cnpj"] in seen_cnpjs:
+            row_errors.setdefault("cnpj", []).append("CNPJ repetido no arquivo.")
+        if email in existing_emails:
+            row_errors.setdefault("email", []).append("E-mail já cadastrado.")
+        elif email in seen_emails:
+            row_errors.setdefault("email", []).append("E-mail repetido no arquivo.")
+        seen_emails.add(email)
+        seen_cnpjs.add(row["cnpj"])
+        if not row_errors:
+            del errors[row["_line"]]
+            valid.append(row)
+
+    return valid, [{"row": line, "errors": row_errors} for line, row_errors in sorted(errors.items())]
+
+
+def check_limits(rows):
+    if len(rows) > settings.COMPRADOR_IMPORT_MAX_ROWS:
+        raise ValidationError(f"No máximo {settings.COMPRADOR_IMPORT_MAX_ROWS} compradores por importação.")
+    with_password = sum(1 for row in rows if row.get("password"))
+    if with_password > settings.COMPRADOR_IMPORT_MAX_PASSWORDS:
+        raise ValidationError(
+            f"No máximo {settings.COMPRADOR_IMPORT_MAX_PASSWORDS} linhas com senha por importação "
+            f"(o arquivo tem {with_password}); importe o restante sem a coluna password."
+        )
+
+
+def import_compradores(uploaded_file, dry_run=False):
+    rows = read_rows(uploaded_file)
+    check_limits(rows)
+    valid, errors = validate_rows(rows)
+    result = ImportResult(total_rows=len(rows), errors=errors)
+    if dry_run or not valid:
+        return result
+
+    users, profiles, organizations = [], [], []
+    for row in valid:
+        user = BaseUser(
+            email=row["email"],
+            user_type=BaseUser.UserType.COMPRADOR,
+            password=make_password(row.get("password") or None),
+        )
+        user.password_hash = user.password
+        users.append(user)
+        profiles.append(CompradorProfile(user=user, **{name: row.get(name) or None for name in PROFILE_FIELDS}))
+        organization_data = {name: row[name] for name in ORGANIZATION_FIELDS if row.get(name)}
+        organizations.append(CompradorOrganization(user=user, cnpj=format_cnpj(row["cnpj"]), **organization_data))
+
+    try:
+        with transaction.atomic():
+            BaseUser.objects.bulk_create(users, batch_size=BATCH_SIZE)
+            CompradorProfile.objects.bulk_create(profiles, batch_size=BATCH_SIZE)
+            CompradorOrganization.objects.bulk_create(organizations, batch_size=BATCH_SIZE)
+    except IntegrityError:
+        # Cadastro concorrente de um mesmo e-mail/CNPJ entre a validação e a gravação.
+        raise ValidationError("Conflito com cadastros feitos durante a importação; envie o arquivo novamente.")
+    result.created = len(users)
+    return result
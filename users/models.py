@@ -12,6 +12,24 @@ from django.contrib.auth.models import (
 # -------------------------
 # Validação de CNPJ (Helper function)
 # -------------------------
+CNPJ_MULTIPLIERS_DV1 = [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+CNPJ_MULTIPLIERS_DV2 = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+
+
+def cnpj_check_digits(base12: str) -> str:
+    """Calcula os dois dígitos verificadores para os 12 primeiros dígitos de um CNPJ."""
+    def calc_digit(digs, multipliers):
+        total = 0
+        for d, m in zip(digs, multipliers):
+            total += int(d) * m
+        rest = total % 11
+        return '0' if rest < 2 else str(11 - rest)
+
+    dv1 = calc_digit(base12, CNPJ_MULTIPLIERS_DV1)
+    dv2 = calc_digit(base12 + dv1, CNPJ_MULTIPLIERS_DV2)
+    return dv1 + dv2
+
+
 def validate_cnpj(value: str):
     """
     Validação completa de CNPJ (formato + dígitos verificadores).
@@ -26,21 +44,7 @@ def validate_cnpj(value: str):
     if digits == digits[0] * 14:
         raise ValidationError("CNPJ inválido.")
 
-    def calc_digit(digs, multipliers):
-        total = 0
-        for d, m in zip(digs, multipliers):
-            total += int(d) * m
-        rest = total % 11
-        return '0' if rest < 2 else str(11 - rest)
-
-    base12 = digits[:12]
-    mult1 = [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
-    dv1 = calc_digit(base12, mult1)
-    base13 = base12 + dv1
-    mult2 = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
-    dv2 = calc_digit(base13, mult2)
-
-    if digits[-2:] != dv1 + dv2:
+    if digits[-2:] != cnpj_check_digits(digits[:12]):
         raise ValidationError("CNPJ inválido (dígitos verificadores não conferem).")
 
 
@@ -1,8 +1,11 @@
 from rest_framework import serializers
+from rest_framework_simplejwt import serializers as jwt_serializers
+from core.signed_media import SignedFileField
 from .validators import validate_file_type_and_size
 from django.contrib.auth import get_user_model
 from django.db import transaction
 
+from .tokens import RefreshToken
 from .models import (
     OfertanteProfile, OfertanteDocument,
     CompradorProfile, CompradorOrganization,
@@ -24,12 +27,11 @@ class OfertanteProfileSerializer(serializers.ModelSerializer):
 
 class OfertanteDocumentSerializer(serializers.ModelSerializer):
     """Serializer para os documentos do Ofertante."""
+    file = SignedFileField(validators=[validate_file_type_and_size])
+
     class Meta:
         model = OfertanteDocument
         exclude = ['user']
-        extra_kwargs = {
-            'file': {'validators': [validate_file_type_and_size]}
-        }
 
 
 # --- Serializers para Comprador ---
@@ -50,12 +52,11 @@ class CompradorRequirementsSerializer(serializers.ModelSerializer):
         exclude = ['user']
 
 class CompradorDocumentsSerializer(serializers.ModelSerializer):
+    file = SignedFileField(validators=[validate_file_type_and_size])
+
     class Meta:
         model = CompradorDocuments
         exclude = ['user']
-        extra_kwargs = {
-            'file': {'validators': [validate_file_type_and_size]}
-        }
 
 
 # --- Serializers de Usuário (Base e Registro) ---
@@ -148,4 +149,16 @@ class UserMeSerializer(serializers.ModelSerializer):
         return list(obj.groups.values_list('name', flat=True))
 
     def get_is_auditor(self, obj):
-        return obj.groups.filter(name__iexact='auditor').exists()
\ No newline at end of file
+        return obj.groups.filter(name__iexact='auditor').exists()
+
+
+# --- Serializers de autenticação (denylist de refresh tokens no Redis) ---
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """Refresh com rotação: o token usado é revogado (ver users/tokens.py)."""
+    token_class = RefreshToken
+
+
+class TokenBlacklistSerializer(jwt_serializers.TokenBlacklistSerializer):
+    """Logout: revoga o refresh token informado."""
+    token_class = RefreshToken
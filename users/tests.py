@@ -1,3 +1,220 @@
-from django.test import TestCase
+import base64
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.hashers import check_password
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+from rest_framework.throttling import SimpleRateThrottle
+
+from core.throttling import take_token
+
+from .bulk_import import format_cnpj
+from .models import BaseUser, CompradorOrganization, cnpj_check_digits
+from .tokens import KEY_PREFIX, RefreshToken
+
+
+class RefreshTokenDenylistTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = BaseUser.objects.create_user(
+            email="comprador@example.com", password="senha-forte-123", user_type="COMPRADOR"
+        )
+        self.refresh = str(RefreshToken.for_user(self.user))
+
+    def test_rotation_revokes_used_token_without_queries(self):
+        with self.assertNumQueries(0):
+            res = self.client.post(reverse("token_refresh"), {"refresh": self.refresh}, format="json")
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("refresh", res.data)
+
+        res = self.client.post(reverse("token_refresh"), {"refresh": self.refresh}, format="json")
+        self.assertEqual(res.status_code, 401)
+
+    def test_denylist_entry_expires_with_token(self):
+        token = RefreshToken(self.refresh)
+        with mock.patch.object(cache, "add", wraps=cache.add) as add:
+            token.blacklist()
+        key, _ = add.call_args.args[:2]
+        self.assertEqual(key, KEY_PREFIX + token["jti"])
+        self.assertAlmostEqual(add.call_args.kwargs["timeout"], 7 * 24 * 60 * 60, delta=5)
+
+    def test_logout_revokes_refresh_token(self):
+        res = self.client.post(reverse("token_blacklist"), {"refresh": self.refresh}, format="json")
+        self.assertEqual(res.status_code, 200)
+        res = self.client.post(reverse("token_refresh"), {"refresh": self.refresh}, format="json")
+        self.assertEqual(res.status_code, 401)
+
+
+class CachedBasicAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = BaseUser.objects.create_user(
+            email="integracao@example.com", password="senha-forte-123", user_type="COMPRADOR"
+        )
+        self.client = APIClient()
+
+    def get_me(self, password="senha-forte-123"):
+        token = base64.b64encode(f"integracao@example.com:{password}".encode()).decode()
+        return self.client.get(reverse("user-me"), HTTP_AUTHORIZATION=f"Basic {token}")
+
+    def test_password_is_hashed_once_per_ttl(self):
+        with mock.patch("django.contrib.auth.base_user.check_password", wraps=check_password) as check:
+            self.assertEqual(self.get_me().status_code, 200)
+            self.assertEqual(self.get_me().status_code, 200)
+            self.assertEqual(self.get_me(password="errada").status_code, 401)
+        self.assertEqual(check.call_count, 2)
+
+    def test_password_change_invalidates_cache(self):
+        self.assertEqual(self.get_me().status_code, 200)
+        self.user.set_password("nova-senha-456")
+        self.user.save()
+        self.assertEqual(self.get_me().status_code, 401)
+        self.assertEqual(self.get_me(password="nova-senha-456").status_code, 200)
+
+    def test_inactive_user_is_rejected_from_cache(self):
+        self.assertEqual(self.get_me().status_code, 200)
+        BaseUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.get_me().status_code, 401)
+
+
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def login(self, email, ip="203.0.113.7"):
+        return self.client.post(
+            reverse("token_obtain_pair"), {"email": email, "password": "x"}, format="json", REMOTE_ADDR=ip
+        )
+
+    @mock.patch.object(SimpleRateThrottle, "THROTTLE_RATES", {"login": "3/min", "login_account": "100/min"})
+    def test_bucket_sheds_burst_per_ip(self):
+        for i in range(3):
+            self.assertEqual(self.login(f"user{i}@example.com").status_code, 401)
+        res = self.login("user9@example.com")
+        self.assertEqual(res.status_code, 429)
+        self.assertGreater(int(res["Retry-After"]), 0)
+        # Outro IP tem o próprio bucket.
+        self.assertEqual(self.login("user9@example.com", ip="203.0.113.8").status_code, 401)
+
+    @mock.patch.object(SimpleRateThrottle, "THROTTLE_RATES", {"login": "100/min", "login_account": "2/min"})
+    def test_bucket_per_account_across_ips(self):
+        self.assertEqual(self.login("alvo@example.com", ip="198.51.100.1").status_code, 401)
+        self.assertEqual(self.login("ALVO@example.com", ip="198.51.100.2").status_code, 401)
+        self.assertEqual(self.login("alvo@example.com", ip="198.51.100.3").status_code, 429)
+
+    @mock.patch.object(SimpleRateThrottle, "THROTTLE_RATES", {"login": "2/min", "login_account": "100/min"})
+    def test_spoofed_forwarded_for_does_not_reset_bucket(self):
+        for i in range(2):
+            res = self.client.post(
+                reverse("token_obtain_pair"), {"email": f"user{i}@example.com", "password": "x"}, format="json",
+                REMOTE_ADDR="203.0.113.7", HTTP_X_FORWARDED_FOR=f"10.0.0.{i}",
+            )
+            self.assertEqual(res.status_code, 401)
+        res = self.client.post(
+            reverse("token_obtain_pair"), {"email": "user9@example.com", "password": "x"}, format="json",
+            REMOTE_ADDR="203.0.113.7", HTTP_X_FORWARDED_FOR="10.0.0.99",
+        )
+        self.assertEqual(res.status_code, 429)
+
+    @mock.patch.object(SimpleRateThrottle, "THROTTLE_RATES", {"login": "2/min", "login_account": "100/min"})
+    def test_behind_proxy_uses_address_added_by_proxy(self):
+        def login(forwarded_for):
+            return self.client.post(
+                reverse("token_obtain_pair"), {"email": "user@example.com", "password": "x"}, format="json",
+                REMOTE_ADDR="172.18.0.5", HTTP_X_FORWARDED_FOR=forwarded_for,
+            )
+
+        with mock.patch.object(api_settings, "NUM_PROXIES", 1):
+            # O cliente forja o início do header; o nginx acrescenta o IP real no fim.
+            self.assertEqual(login("10.0.0.1, 203.0.113.7").status_code, 401)
+            self.assertEqual(login("10.0.0.2, 203.0.113.7").status_code, 401)
+            self.assertEqual(login("10.0.0.3, 203.0.113.7").status_code, 429)
+            self.assertEqual(login("10.0.0.3, 203.0.113.8").status_code, 401)
+
+    def test_bucket_refills_over_time(self):
+        with mock.patch("core.throttling.time.time", return_value=1000.0):
+            self.assertEqual(take_token("throttle:teste", 2, 1.0), (True, 0.0))
+            self.assertTrue(take_token("throttle:teste", 2, 1.0)[0])
+            self.assertEqual(take_token("throttle:teste", 2, 1.0), (False, 1.0))
+        with mock.patch("core.throttling.time.time", return_value=1001.5):
+            self.assertTrue(take_token("throttle:teste", 2, 1.0)[0])
+
+
+def make_cnpj(base12):
+    return base12 + cnpj_check_digits(base12)
+
+
+class CompradorImportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = BaseUser.objects.create_superuser(email="admin@example.com", password="x", user_type="COMPRADOR")
+        existing = BaseUser.objects.create_user(email="existente@example.com", password="x", user_type="COMPRADOR")
+        CompradorOrganization.objects.create(
+            user=existing, company_name="Existente", cnpj=format_cnpj(make_cnpj("111111110001")),
+            website="https://existente.example.com",
+        )
+        self.client.force_authenticate(self.admin)
+
+    def upload(self, lines, **data):
+        content = "\n".join(lines).encode()
+        return self.client.post(
+            reverse("comprador_import"),
+            {"file": SimpleUploadedFile("compradores.csv", content, content_type="text/csv"), **data},
+            format="multipart",
+        )
+
+    def test_imports_valid_rows_and_reports_the_rest(self):
+        rows = ["email;company_name;cnpj;website;phone;industry_sector"]
+        for i in range(20):
+            rows.append(f"comprador{i}@example.com;Empresa {i};{make_cnpj(f'{i + 20:08d}0001')};https://e{i}.example.com;1199999{i:04d};BANCARIO")
+        rows += [
+            f"comprador0@example.com;Repetida;{make_cnpj('990000000001')};https://r.example.com;1100000000;",
+            "invalido@example.com;CNPJ Ruim;11.222.333/0001-00;https://x.example.com;1100000000;",
+            f"outro@example.com;Já existe;{make_cnpj('111111110001')};https://y.example.com;1100000000;",
+            f"semfone@example.com;Sem fone;{make_cnpj('880000000001')};https://z.example.com;;",
+        ]
+        with self.assertNumQueries(7):
+            res = self.upload(rows)
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(res.data["total_rows"], 24)
+        self.assertEqual(res.data["created"], 20)
+        self.assertEqual(
+            [(error["row"], sorted(error["errors"])) for error in res.data["errors"]],
+            [(22, ["email"]), (23, ["cnpj"]), (24, ["cnpj"]), (25, ["phone"])],
+        )
+        organization = CompradorOrganization.objects.get(user__email="comprador3@example.com")
+        self.assertEqual(organization.industry_sector, "BANCARIO")
+        self.assertEqual(organization.user.comprador_profile.phone, "11999990003")
+        self.assertFalse(organization.user.has_usable_password())
+
+    @override_settings(COMPRADOR_IMPORT_MAX_PASSWORDS=1)
+    def test_rejects_too_many_passwords_before_hashing(self):
+        rows = ["email,company_name,cnpj,website,phone,password"]
+        for i in range(2):
+            rows.append(f"senha{i}@example.com,Empresa {i},{make_cnpj(f'{i + 60:08d}0001')},https://s{i}.example.com,11,Segredo#{i}")
+        with mock.patch("users.bulk_import.make_password") as make_password:
+            res = self.upload(rows)
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("password", res.data["file"][0])
+        make_password.assert_not_called()
+        self.assertFalse(BaseUser.objects.filter(email__startswith="senha").exists())
+
+    def test_dry_run_only_validates(self):
+        res = self.upload(
+            ["email,company_name,cnpj,website,phone", f"novo@example.com,Nova,{make_cnpj('770000000001')},https://n.example.com,11"],
+            dry_run="true",
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual((res.data["created"], res.data["errors"]), (0, []))
+        self.assertFalse(BaseUser.objects.filter(email="novo@example.com").exists())
+
+    def test_requires_staff_and_columns(self):
+        self.assertEqual(self.upload(["email,cnpj"]).status_code, 400)
+        self.client.force_authenticate(BaseUser.objects.get(email="existente@example.com"))
+        self.assertEqual(self.upload(["email,cnpj"]).status_code, 403)
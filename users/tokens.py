@@ -0,0 +1,49 @@
+"""
+Denylist de refresh tokens no cache (Redis em produção), no lugar do app
+`rest_framework_simplejwt.token_blacklist`.
+
+Cada token revogado vira uma chave `jwt:denied:<jti>` com expiração igual ao `exp`
+do próprio token: depois disso o token já seria recusado por estar vencido, então a
+entrada some sozinha e a denylist nunca cresce além dos tokens ainda válidos.
+Verificar e revogar são operações O(1) no Redis, sem tocar o Postgres.
+"""
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+KEY_PREFIX = "jwt:denied:"
+
+
+def _cache():
+    return caches[settings.JWT_DENYLIST_CACHE]
+
+
+class RefreshToken(BaseRefreshToken):
+    """Refresh token com a mesma interface do app token_blacklist (`check_blacklist`/`blacklist`)."""
+
+    @property
+    def denylist_key(self):
+        return KEY_PREFIX + str(self.payload[api_settings.JTI_CLAIM])
+
+    def verify(self, *args, **kwargs):
+        super().verify(*args, **kwargs)
+        self.check_blacklist()
+
+    def check_blacklist(self):
+        if _cache().get(self.denylist_key) is not None:
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        """
+        Revoga o token até o seu `exp`. Usa `add` (SET NX): se o token já foi revogado
+        (ex.: dois refresh concorrentes com o mesmo token), apenas o primeiro passa.
+        """
+        now = int(datetime.now(tz=timezone.utc).timestamp())
+        timeout = int(self.payload["exp"]) - now
+        if timeout > 0 and not _cache().add(self.denylist_key, 1, timeout=timeout):
+            raise TokenError(_("Token is blacklisted"))
@@ -9,9 +9,11 @@ from .views import (
     CompradorOrganizationViewSet,
     CompradorRequirementsViewSet,
     CompradorDocumentsViewSet,
+    CompradorImportView,
     # Views para Auth com tags do Swagger
     TokenObtainPairView,
     TokenRefreshView,
+    TokenBlacklistView,
 )
 
 # Cria um router para registrar os ViewSets
@@ -29,6 +31,8 @@ urlpatterns = [
     path('register/', UserRegistrationView.as_view(), name='user_register'),
     path('login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('login/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('logout/', TokenBlacklistView.as_view(), name='token_blacklist'),
+    path('import/compradores/', CompradorImportView.as_view(), name='comprador_import'),
     # Inclui as rotas geradas pelo router
     path('', include(router.urls)),
 ]
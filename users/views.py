@@ -1,12 +1,18 @@
 from rest_framework import viewsets, permissions, status, generics
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError as DjangoValidationError
 from drf_spectacular.utils import extend_schema
 from rest_framework_simplejwt.views import (
     TokenObtainPairView as BaseTokenObtainPairView,
     TokenRefreshView as BaseTokenRefreshView,
+    TokenBlacklistView as BaseTokenBlacklistView,
 )
+from core.throttling import LoginAccountRateThrottle, LoginRateThrottle, RegistrationRateThrottle
 from .serializers import (
     BaseUserSerializer,
     CompradorProfileSerializer, CompradorOrganizationSerializer,
@@ -20,6 +26,7 @@ from .models import (
     CompradorRequirements, CompradorDocuments,
     OfertanteProfile, OfertanteDocument
 )
+from .bulk_import import import_compradores
 from .permissions import IsOwnerOrAdmin
 
 User = get_user_model()
@@ -28,6 +35,29 @@ User = get_user_model()
 class UserRegistrationView(generics.CreateAPIView):
     serializer_class = UserRegistrationSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [RegistrationRateThrottle]
+
+
+@extend_schema(tags=['users'])
+class CompradorImportView(APIView):
+    """
+    Importa compradores em lote (CSV/XLSX no campo `file`) — ver users/bulk_import.py.
+    Com `dry_run=true` só valida. Linhas inválidas são listadas em `errors` e não
+    impedem a criação das demais.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        file_obj = request.FILES.get("file")
+        if not file_obj:
+            return Response({"detail": "Envie um arquivo no campo 'file'."}, status=status.HTTP_400_BAD_REQUEST)
+        dry_run = str(request.data.get("dry_run", "")).lower() in ("1", "true")
+        try:
+            result = import_compradores(file_obj, dry_run=dry_run)
+        except DjangoValidationError as exc:
+            raise ValidationError({"file": exc.messages})
+        return Response(result.as_dict(), status=status.HTTP_201_CREATED if result.created else status.HTTP_200_OK)
 
 
 @extend_schema(tags=['users'])
@@ -35,6 +65,8 @@ class BaseUserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = BaseUserSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
+    # Leituras (GET) podem ser atendidas por uma réplica; veja core/db_routers.py.
+    use_read_replica = True
 
     def get_queryset(self):
         # Admin vê todos, usuários normais só se veem.
@@ -69,6 +101,7 @@ class OfertanteProfileViewSet(viewsets.ModelViewSet):
     queryset = OfertanteProfile.objects.all()
     serializer_class = OfertanteProfileSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
+    use_read_replica = True
 
     def get_queryset(self):
         user = self.request.user
@@ -81,6 +114,7 @@ class OfertanteDocumentViewSet(viewsets.ModelViewSet):
     queryset = OfertanteDocument.objects.all()
     serializer_class = OfertanteDocumentSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
+    use_read_replica = True
 
     def get_queryset(self):
         user = self.request.user
@@ -95,6 +129,7 @@ class CompradorProfileViewSet(viewsets.ModelViewSet):
     queryset = CompradorProfile.objects.all()
     serializer_class = CompradorProfileSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
+    use_read_replica = True
 
     def get_queryset(self):
         user = self.request.user
@@ -107,6 +142,7 @@ class CompradorOrganizationViewSet(viewsets.ModelViewSet):
     queryset = CompradorOrganization.objects.all()
     serializer_class = CompradorOrganizationSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
+    use_read_replica = True
 
     def get_queryset(self):
         user = self.request.user
@@ -119,6 +155,7 @@ class CompradorRequirementsViewSet(viewsets.ModelViewSet):
     queryset = CompradorRequirements.objects.all()
     serializer_class = CompradorRequirementsSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
+    use_read_replica = True
 
     def get_queryset(self):
         user = self.request.user
@@ -131,6 +168,7 @@ class CompradorDocumentsViewSet(viewsets.ModelViewSet):
     queryset = CompradorDocuments.objects.all()
     serializer_class = CompradorDocumentsSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
+    use_read_replica = True
 
     def get_queryset(self):
         user = self.request.user
@@ -140,9 +178,13 @@ class CompradorDocumentsViewSet(viewsets.ModelViewSet):
     
 @extend_schema(tags=['Auth'])
 class TokenObtainPairView(BaseTokenObtainPairView):
+    # O hash da senha é caro: rajadas são barradas antes de chegar a ele.
+    throttle_classes = [LoginRateThrottle, LoginAccountRateThrottle]
 
+@extend_schema(tags=['Auth'])
+class TokenRefreshView(BaseTokenRefreshView):
     pass
 
 @extend_schema(tags=['Auth'])
-class TokenRefreshView(BaseTokenRefreshView):
-    pass
\ No newline at end of file
+class TokenBlacklistView(BaseTokenBlacklistView):
+    pass